@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+🧰 Utilitários compartilhados pelos agentes SPR
+Especificações somente leitura e serialização JSON (orjson opcional)
+"""
+
+import json
+from dataclasses import asdict, is_dataclass
+from types import MappingProxyType
+from typing import Any, Mapping
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+def freeze(obj: Any) -> Any:
+    """Converter recursivamente dict -> MappingProxyType e list -> tuple (somente leitura)"""
+    if isinstance(obj, dict):
+        return MappingProxyType({key: freeze(value) for key, value in obj.items()})
+    if isinstance(obj, list):
+        return tuple(freeze(item) for item in obj)
+    return obj
+
+def mutable_copy(obj: Any) -> Any:
+    """Cópia mutável (dict/list) de uma especificação congelada, para quem precisa alterá-la"""
+    if isinstance(obj, Mapping):
+        return {key: mutable_copy(value) for key, value in obj.items()}
+    if isinstance(obj, tuple):
+        return [mutable_copy(item) for item in obj]
+    return obj
+
+def json_default(obj: Any) -> Any:
+    """Converter tipos não nativos (MappingProxyType, dataclasses, numpy) para JSON"""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if is_dataclass(obj):
+        return asdict(obj)
+    if hasattr(obj, "tolist"):
+        # Escalares e arrays numpy (sem importar numpy aqui)
+        return obj.tolist()
+    return str(obj)
+
+if HAS_ORJSON:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serializar para JSON compacto (bytes UTF-8)"""
+        return orjson.dumps(obj, default=json_default, option=_ORJSON_OPTIONS)
+
+    def dumps_pretty(obj: Any) -> bytes:
+        """Serializar para JSON indentado com 2 espaços (bytes UTF-8)"""
+        return orjson.dumps(obj, default=json_default, option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2)
+else:
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serializar para JSON compacto (bytes UTF-8)"""
+        return json.dumps(obj, default=json_default, ensure_ascii=False).encode("utf-8")
+
+    def dumps_pretty(obj: Any) -> bytes:
+        """Serializar para JSON indentado com 2 espaços (bytes UTF-8)"""
+        return json.dumps(obj, default=json_default, ensure_ascii=False, indent=2).encode("utf-8")
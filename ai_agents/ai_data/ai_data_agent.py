@@ -4,25 +4,48 @@
 SPR Sistema Preditivo Royal
 """
 
-import json
 import logging
 import numpy as np
-import pandas as pd
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime
+from types import MappingProxyType
+from typing import ClassVar, Dict, List, Mapping, Optional, Any, Tuple, Union
 from dataclasses import dataclass
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.base import clone
 from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.model_selection import TimeSeriesSplit
 
-@dataclass
+from ai_agents._common import freeze
+
+# Intel Extension for Scikit-learn (opcional) - RandomForest sobre oneDAL
+try:
+    from sklearnex.ensemble import RandomForestRegressor
+    HAS_SKLEARNEX = True
+except ImportError:
+    from sklearn.ensemble import RandomForestRegressor
+    HAS_SKLEARNEX = False
+
+# Treelite (opcional) - inferência da floresta em C++ sobre arrays contíguos de nós
+try:
+    import treelite
+    import treelite.gtil
+    HAS_TREELITE = True
+except ImportError:
+    HAS_TREELITE = False
+
+@dataclass(slots=True, frozen=True)
 class MLModel:
-    """Modelo de Machine Learning"""
+    """Modelo de Machine Learning (registro imutável, compartilhado pelo cache)"""
     name: str
     algorithm: str
     accuracy: float
-    features: List[str]
+    features: Tuple[str, ...]
     last_trained: datetime
     version: str
+    
+    def __post_init__(self):
+        # Aceitar lista (API anterior) armazenando como tupla
+        if not isinstance(self.features, tuple):
+            object.__setattr__(self, "features", tuple(self.features))
 
 @dataclass
 class PredictionResult:
@@ -35,6 +58,240 @@ class PredictionResult:
     target_date: datetime
     factors: Dict[str, float]
 
+_logger = logging.getLogger("SPR")
+
+# Config padrão compartilhada (somente leitura) quando nenhuma é informada
+_EMPTY_CONFIG: Mapping[str, Any] = MappingProxyType({})
+
+# Ciclo sazonal anual (seno por dia do ano), indexado por i % 365
+_SEASONAL_LUT = np.sin(2 * np.pi * np.arange(365) / 365)
+
+def _make_rng(seed: Any = None) -> np.random.Generator:
+    """Gerador PCG64DXSM com estado próprio (sem o RandomState global legado)"""
+    return np.random.Generator(np.random.PCG64DXSM(np.random.SeedSequence(seed)))
+
+FACTOR_KEYS = ("weather_impact", "economic_indicators", "supply_demand", "seasonal_effect")
+
+PREDICTION_DTYPE = np.dtype([
+    ("predicted_price", "f8"),
+    ("confidence_score", "f8"),
+    ("ci_lower", "f8"),
+    ("ci_upper", "f8"),
+    ("target_date", "datetime64[us]"),
+    ("factors", "f4", (len(FACTOR_KEYS),))  # colunas na ordem de FACTOR_KEYS
+])
+
+@dataclass
+class PredictionBatch:
+    """Lote de predições em layout colunar (SoA) - um único ndarray estruturado"""
+    commodity: str
+    prediction_date: datetime
+    data: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.data)
+    
+    def to_dataclasses(self) -> List[PredictionResult]:
+        """Materializar o lote como lista de PredictionResult"""
+        d = self.data
+        return [
+            PredictionResult(
+                commodity=self.commodity,
+                predicted_price=price,
+                confidence_interval=(lower, upper),
+                confidence_score=conf,
+                prediction_date=self.prediction_date,
+                target_date=target,
+                factors=dict(zip(FACTOR_KEYS, factors))
+            )
+            for price, conf, lower, upper, target, factors in zip(
+                d["predicted_price"].tolist(), d["confidence_score"].tolist(),
+                d["ci_lower"].tolist(), d["ci_upper"].tolist(), d["target_date"].tolist(),
+                d["factors"].tolist()
+            )
+        ]
+
+@dataclass
+class TreeArrays:
+    """Estrutura de uma árvore da floresta em arrays contíguos (SoA)"""
+    children_left: np.ndarray
+    children_right: np.ndarray
+    feature: np.ndarray
+    threshold: np.ndarray
+    value: np.ndarray
+
+def _flatten_tree(estimator) -> TreeArrays:
+    """Extrair os arrays de nós de uma árvore sklearn treinada"""
+    tree = estimator.tree_
+    return TreeArrays(
+        children_left=np.ascontiguousarray(tree.children_left),
+        children_right=np.ascontiguousarray(tree.children_right),
+        feature=np.ascontiguousarray(tree.feature),
+        threshold=np.ascontiguousarray(tree.threshold),
+        value=np.ascontiguousarray(tree.value[:, 0, 0])
+    )
+
+# Especificações estáticas - construídas uma única vez no import e compartilhadas (somente leitura)
+_ML_PIPELINE = freeze({
+    "data_ingestion": {
+        "sources": [
+            "CEPEA API - preços diários",
+            "INMET API - dados climáticos",
+            "Bacen API - indicadores econômicos",
+            "USDA API - dados internacionais"
+        ],
+        "frequency": "daily",
+        "data_quality_checks": [
+            "missing_values < 5%",
+            "outlier_detection",
+            "data_freshness < 24h"
+        ]
+    },
+    "feature_engineering": {
+        "technical_indicators": [
+            "SMA_7, SMA_21, SMA_50",
+            "RSI, MACD, Bollinger Bands",
+            "Price momentum, Volatility"
+        ],
+        "fundamental_features": [
+            "Supply/demand ratios",
+            "Seasonal adjustments", 
+            "Economic indicators (USD/BRL, interest rates)",
+            "Weather indices (precipitation, temperature)"
+        ],
+        "derived_features": [
+            "Price ratios between commodities",
+            "Lag features (1-30 days)",
+            "Rolling statistics (mean, std, min, max)"
+        ]
+    },
+    "model_training": {
+        "primary_model": "Random Forest + LSTM Ensemble",
+        "baseline_models": ["Linear Regression", "ARIMA", "Prophet"],
+        "validation_strategy": "Time Series Cross Validation",
+        "hyperparameter_tuning": "Optuna",
+        "model_selection_metric": "MAPE (Mean Absolute Percentage Error)"
+    },
+    "model_evaluation": {
+        "metrics": {
+            "accuracy": "MAPE < 8%",
+            "precision": "Direction accuracy > 75%", 
+            "robustness": "Consistent across seasons",
+            "explainability": "SHAP values available"
+        },
+        "backtesting": {
+            "period": "3 years historical data",
+            "walk_forward_analysis": True,
+            "stress_testing": "Extreme market conditions"
+        }
+    },
+    "deployment": {
+        "serving_infrastructure": "FastAPI + Docker",
+        "prediction_frequency": "Daily batch + Real-time API",
+        "monitoring": "MLflow + Prometheus",
+        "model_versioning": "DVC + Git",
+        "rollback_strategy": "A/B testing + Champion/Challenger"
+    }
+})
+
+_ANALYTICS_DASHBOARD = freeze({
+    "overview_page": {
+        "kpis": [
+            {"name": "Model Accuracy", "value": "87.3%", "trend": "+2.1%"},
+            {"name": "Daily Predictions", "value": "1,247", "trend": "+15%"},
+            {"name": "API Calls", "value": "45,672", "trend": "+8%"},
+            {"name": "Active Users", "value": "892", "trend": "+12%"}
+        ],
+        "charts": [
+            {"type": "line", "title": "Prediction Accuracy Over Time"},
+            {"type": "bar", "title": "Predictions by Commodity"},
+            {"type": "heatmap", "title": "Model Performance Matrix"},
+            {"type": "gauge", "title": "System Health Score"}
+        ]
+    },
+    "model_performance": {
+        "metrics_tracking": [
+            "MAPE (Mean Absolute Percentage Error)",
+            "Direction Accuracy", 
+            "Prediction Interval Coverage",
+            "Feature Importance Stability"
+        ],
+        "visualizations": [
+            "Residual plots",
+            "Feature importance charts",
+            "SHAP value explanations",
+            "Prediction vs Actual scatter plots"
+        ]
+    },
+    "data_quality": {
+        "monitoring": [
+            "Data freshness alerts",
+            "Missing value tracking", 
+            "Outlier detection reports",
+            "Data source availability"
+        ],
+        "data_profiling": [
+            "Statistical summaries by source",
+            "Data drift detection",
+            "Feature correlation matrices", 
+            "Time series decomposition"
+        ]
+    },
+    "business_insights": {
+        "commodity_analysis": [
+            "Price trend analysis",
+            "Volatility patterns",
+            "Seasonal decomposition",
+            "Cross-commodity correlations"
+        ],
+        "market_intelligence": [
+            "Supply-demand indicators",
+            "Weather impact analysis",
+            "Economic factor influence", 
+            "Global market comparisons"
+        ]
+    }
+})
+
+_MLOPS_PIPELINE = freeze({
+    "model_development": {
+        "experiment_tracking": "MLflow",
+        "model_registry": "MLflow Model Registry",
+        "version_control": "DVC + Git",
+        "notebook_environment": "Jupyter Lab + Papermill"
+    },
+    "model_training": {
+        "compute_infrastructure": "Docker + Kubernetes",
+        "hyperparameter_optimization": "Optuna",
+        "distributed_training": "Ray Train",
+        "scheduled_retraining": "Apache Airflow"
+    },
+    "model_deployment": {
+        "serving_framework": "FastAPI + Uvicorn",
+        "containerization": "Docker",
+        "orchestration": "Kubernetes", 
+        "load_balancing": "NGINX + Kubernetes Ingress"
+    },
+    "monitoring_observability": {
+        "model_monitoring": "Evidently AI",
+        "application_monitoring": "Prometheus + Grafana",
+        "logging": "ELK Stack (Elasticsearch, Logstash, Kibana)",
+        "alerting": "PagerDuty + Slack"
+    },
+    "data_pipeline": {
+        "data_ingestion": "Apache Kafka",
+        "data_processing": "Apache Spark", 
+        "data_storage": "PostgreSQL + Apache Parquet",
+        "data_validation": "Great Expectations"
+    },
+    "ci_cd": {
+        "source_control": "Git + GitHub",
+        "ci_pipeline": "GitHub Actions",
+        "testing": "pytest + MLflow",
+        "deployment": "ArgoCD + Kubernetes"
+    }
+})
+
 class AIDataAgent:
     """
     AI & Data Science Expert Agent
@@ -43,339 +300,240 @@ class AIDataAgent:
     e construir dashboards para insights de negócio.
     """
     
-    def __init__(self, config: Dict[str, Any] = None):
-        self.config = config or {}
+    expertise: ClassVar[Tuple[str, ...]] = (
+        "Machine Learning",
+        "Deep Learning", 
+        "Time Series Forecasting",
+        "Feature Engineering",
+        "Model Deployment",
+        "MLOps",
+        "Data Visualization",
+        "Statistical Analysis"
+    )
+    
+    # Modelos disponíveis
+    available_models: ClassVar[Mapping[str, Mapping[str, Any]]] = freeze({
+        "commodity_price_predictor": {
+            "algorithm": "Random Forest + LSTM",
+            "accuracy": 0.87,
+            "features": ["historical_prices", "weather", "economic_indicators", "supply_demand"],
+            "prediction_horizon": "30 days"
+        },
+        "volatility_estimator": {
+            "algorithm": "GARCH + Neural Networks",
+            "accuracy": 0.82,
+            "features": ["price_returns", "trading_volume", "market_sentiment"],
+            "prediction_horizon": "7 days"
+        },
+        "trend_classifier": {
+            "algorithm": "XGBoost",
+            "accuracy": 0.91,
+            "features": ["technical_indicators", "fundamental_data", "seasonal_patterns"],
+            "prediction_horizon": "15 days"
+        }
+    })
+    
+    def __init__(self, config: Optional[Mapping[str, Any]] = None):
+        self.config = config if config is not None else _EMPTY_CONFIG
         self.agent_id = "ai-data-scientist"
         self.agent_name = "AI & Data Science Expert"
-        self.expertise = [
-            "Machine Learning",
-            "Deep Learning", 
-            "Time Series Forecasting",
-            "Feature Engineering",
-            "Model Deployment",
-            "MLOps",
-            "Data Visualization",
-            "Statistical Analysis"
-        ]
         
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(f"SPR.{self.agent_id}")
+        self.logger = _logger.getChild(self.agent_id)
         
-        # Modelos disponíveis
-        self.available_models = {
-            "commodity_price_predictor": {
-                "algorithm": "Random Forest + LSTM",
-                "accuracy": 0.87,
-                "features": ["historical_prices", "weather", "economic_indicators", "supply_demand"],
-                "prediction_horizon": "30 days"
-            },
-            "volatility_estimator": {
-                "algorithm": "GARCH + Neural Networks",
-                "accuracy": 0.82,
-                "features": ["price_returns", "trading_volume", "market_sentiment"],
-                "prediction_horizon": "7 days"
-            },
-            "trend_classifier": {
-                "algorithm": "XGBoost",
-                "accuracy": 0.91,
-                "features": ["technical_indicators", "fundamental_data", "seasonal_patterns"],
-                "prediction_horizon": "15 days"
-            }
-        }
+        # Modelo treinado (cacheado após o primeiro create_prediction_models)
+        self._soja_model: Optional[RandomForestRegressor] = None
+        self._soja_predictor = None
+        self._tree_arrays: Optional[List[TreeArrays]] = None
+        self._prediction_models: Optional[Mapping[str, MLModel]] = None
+        self._rng = _make_rng(42)
         
-    def design_ml_pipeline(self, commodity: str) -> Dict[str, Any]:
+    def design_ml_pipeline(self, commodity: str) -> Mapping[str, Any]:
         """Projetar pipeline de ML para commodity específica"""
         self.logger.info(f"🚀 Projetando pipeline ML para {commodity}...")
         
-        pipeline = {
-            "data_ingestion": {
-                "sources": [
-                    "CEPEA API - preços diários",
-                    "INMET API - dados climáticos",
-                    "Bacen API - indicadores econômicos",
-                    "USDA API - dados internacionais"
-                ],
-                "frequency": "daily",
-                "data_quality_checks": [
-                    "missing_values < 5%",
-                    "outlier_detection",
-                    "data_freshness < 24h"
-                ]
-            },
-            "feature_engineering": {
-                "technical_indicators": [
-                    "SMA_7, SMA_21, SMA_50",
-                    "RSI, MACD, Bollinger Bands",
-                    "Price momentum, Volatility"
-                ],
-                "fundamental_features": [
-                    "Supply/demand ratios",
-                    "Seasonal adjustments", 
-                    "Economic indicators (USD/BRL, interest rates)",
-                    "Weather indices (precipitation, temperature)"
-                ],
-                "derived_features": [
-                    "Price ratios between commodities",
-                    "Lag features (1-30 days)",
-                    "Rolling statistics (mean, std, min, max)"
-                ]
-            },
-            "model_training": {
-                "primary_model": "Random Forest + LSTM Ensemble",
-                "baseline_models": ["Linear Regression", "ARIMA", "Prophet"],
-                "validation_strategy": "Time Series Cross Validation",
-                "hyperparameter_tuning": "Optuna",
-                "model_selection_metric": "MAPE (Mean Absolute Percentage Error)"
-            },
-            "model_evaluation": {
-                "metrics": {
-                    "accuracy": "MAPE < 8%",
-                    "precision": "Direction accuracy > 75%", 
-                    "robustness": "Consistent across seasons",
-                    "explainability": "SHAP values available"
-                },
-                "backtesting": {
-                    "period": "3 years historical data",
-                    "walk_forward_analysis": True,
-                    "stress_testing": "Extreme market conditions"
-                }
-            },
-            "deployment": {
-                "serving_infrastructure": "FastAPI + Docker",
-                "prediction_frequency": "Daily batch + Real-time API",
-                "monitoring": "MLflow + Prometheus",
-                "model_versioning": "DVC + Git",
-                "rollback_strategy": "A/B testing + Champion/Challenger"
-            }
-        }
-        
-        return pipeline
+        return _ML_PIPELINE
     
-    def create_prediction_models(self) -> Dict[str, MLModel]:
-        """Criar modelos de predição para commodities"""
+    def create_prediction_models(self) -> Mapping[str, MLModel]:
+        """Criar modelos de predição para commodities (somente leitura, cacheados)"""
+        if self._prediction_models is not None:
+            return self._prediction_models
+        
         self.logger.info("🤖 Criando modelos de predição...")
         
         # Simular dados de treinamento
-        np.random.seed(42)
-        dates = pd.date_range('2020-01-01', '2024-08-01', freq='D')
-        n_samples = len(dates)
+        rng = self._rng
+        n_samples = (datetime(2024, 8, 1) - datetime(2020, 1, 1)).days + 1  # diário, 2020-01-01 a 2024-08-01
         
         # Gerar dados sintéticos para soja
         base_price = 95.0
         trend = np.linspace(0, 10, n_samples)
-        seasonal = 5 * np.sin(2 * np.pi * np.arange(n_samples) / 365)
-        noise = np.random.normal(0, 3, n_samples)
+        seasonal = 5 * _SEASONAL_LUT[np.arange(n_samples) % 365]
+        noise = rng.normal(0, 3, n_samples)
         soja_prices = base_price + trend + seasonal + noise
         
-        # Features simuladas
-        weather_index = np.random.uniform(0.7, 1.3, n_samples)
-        usd_brl = np.random.uniform(4.8, 6.2, n_samples)
-        supply_demand = np.random.uniform(0.9, 1.1, n_samples)
-        
-        # Treinar modelo simples
-        X = np.column_stack([weather_index, usd_brl, supply_demand])
+        # Features simuladas: weather_index, usd_brl, supply_demand
+        # Sorteio direto em float32 (row-major), escalado in-place para [low, high)
+        low = np.array([0.7, 4.8, 0.9], dtype=np.float32)
+        high = np.array([1.3, 6.2, 1.1], dtype=np.float32)
+        X = rng.random((n_samples, 3), dtype=np.float32)
+        X *= high - low
+        X += low
         y = soja_prices
         
-        model = RandomForestRegressor(n_estimators=100, random_state=42)
-        model.fit(X, y)
+        model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1)
         
-        # Avaliar modelo
-        predictions = model.predict(X)
-        mae = mean_absolute_error(y, predictions)
-        r2 = r2_score(y, predictions)
+        # Avaliar modelo - walk-forward (janela expansiva, previsão fora da amostra)
+        y_true, y_pred = [], []
+        for train_idx, test_idx in TimeSeriesSplit(n_splits=5).split(X):
+            fold_model = clone(model).fit(X[train_idx], y[train_idx])
+            fold_model.n_jobs = 1
+            y_true.append(y[test_idx])
+            y_pred.append(fold_model.predict(X[test_idx]))
+        y_true = np.concatenate(y_true)
+        y_pred = np.concatenate(y_pred)
+        mae = mean_absolute_error(y_true, y_pred)
+        r2 = r2_score(y_true, y_pred)
         
-        models = {
+        # Treinar modelo final com todo o histórico
+        model.fit(X, y)
+        # Fit paraleliza por árvore (n_jobs=-1); no predict de lotes pequenos o overhead
+        # do joblib supera o ganho. Para inferência em lotes grandes, reativar n_jobs=-1.
+        model.n_jobs = 1
+        self._soja_model = model
+        self._soja_predictor = self._compile_forest(model)
+        self._tree_arrays = [_flatten_tree(tree) for tree in model.estimators_]
+        
+        models = MappingProxyType({
             "soja_predictor": MLModel(
                 name="Soja Price Predictor",
                 algorithm="Random Forest",
                 accuracy=r2,
-                features=["weather_index", "usd_brl", "supply_demand_ratio"],
+                features=("weather_index", "usd_brl", "supply_demand_ratio"),
                 last_trained=datetime.now(),
                 version="1.0.0"
             )
-        }
+        })
         
-        self.logger.info(f"Modelo treinado - R²: {r2:.3f}, MAE: {mae:.2f}")
+        self.logger.info(f"Modelo treinado - R² (walk-forward): {r2:.3f}, MAE: {mae:.2f}")
+        self._prediction_models = models
         return models
     
-    def generate_predictions(self, commodity: str, horizon_days: int = 30) -> List[PredictionResult]:
-        """Gerar predições para commodity"""
+    def _compile_forest(self, model: RandomForestRegressor):
+        """Compilar floresta treinada para inferência via Treelite (se disponível)"""
+        if not HAS_TREELITE:
+            return None
+        try:
+            return treelite.sklearn.import_model(model)
+        except Exception as e:
+            self.logger.warning(f"Treelite indisponível para o modelo, usando sklearn: {e}")
+            return None
+    
+    def predict_soja(self, X: np.ndarray) -> np.ndarray:
+        """Inferência do modelo de soja (Treelite quando compilado, sklearn caso contrário)"""
+        if self._soja_model is None:
+            self.create_prediction_models()
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if self._soja_predictor is not None:
+            return np.asarray(treelite.gtil.predict(self._soja_predictor, X)).reshape(len(X))
+        return self._soja_model.predict(X)
+    
+    def get_tree_arrays(self) -> List[TreeArrays]:
+        """Arrays por árvore do modelo de soja, extraídos uma única vez após o treino"""
+        if self._tree_arrays is None:
+            self.create_prediction_models()
+        return self._tree_arrays
+    
+    def generate_prediction_batch(self, commodity: str, horizon_days: int = 30,
+                                  seed: Optional[int] = None) -> PredictionBatch:
+        """Gerar predições para commodity em layout colunar"""
         self.logger.info(f"🔮 Gerando predições para {commodity} ({horizon_days} dias)...")
         
-        predictions = []
         base_date = datetime.now()
+        rng = self._rng if seed is None else _make_rng(seed)
         
-        for i in range(horizon_days):
-            target_date = base_date + timedelta(days=i+1)
-            
-            # Simular predição (em produção, usaria modelo real)
-            base_price = 95.0
-            trend_factor = 1 + (i * 0.001)  # Leve tendência de alta
-            seasonal_factor = 1 + 0.02 * np.sin(2 * np.pi * i / 365)
-            random_factor = np.random.uniform(0.98, 1.02)
-            
-            predicted_price = base_price * trend_factor * seasonal_factor * random_factor
-            confidence_score = max(0.6, 0.9 - (i * 0.01))  # Confiança diminui com tempo
-            
-            # Intervalo de confiança
-            margin = predicted_price * (1 - confidence_score) * 0.5
-            confidence_interval = (predicted_price - margin, predicted_price + margin)
-            
-            prediction = PredictionResult(
-                commodity=commodity,
-                predicted_price=predicted_price,
-                confidence_interval=confidence_interval,
-                confidence_score=confidence_score,
-                prediction_date=base_date,
-                target_date=target_date,
-                factors={
-                    "weather_impact": np.random.uniform(-0.1, 0.1),
-                    "economic_indicators": np.random.uniform(-0.05, 0.05),
-                    "supply_demand": np.random.uniform(-0.08, 0.08),
-                    "seasonal_effect": (seasonal_factor - 1)
-                }
-            )
-            
-            predictions.append(prediction)
+        # Simular predição (em produção, usaria modelo real) - todo o horizonte de uma vez
+        base_price = 95.0
+        i = np.arange(horizon_days)
+        trend_factor = 1 + i * 0.001  # Leve tendência de alta
+        seasonal_factor = 1 + 0.02 * _SEASONAL_LUT[i % 365]
+        # Sorteios do horizonte em uma única chamada:
+        # random_factor, weather_impact, economic_indicators, supply_demand
+        draws = rng.uniform(
+            low=(0.98, -0.1, -0.05, -0.08),
+            high=(1.02, 0.1, 0.05, 0.08),
+            size=(horizon_days, 4)
+        )
+        
+        data = np.empty(horizon_days, dtype=PREDICTION_DTYPE)
+        predicted_price = base_price * trend_factor * seasonal_factor * draws[:, 0]
+        confidence_score = np.clip(0.9 - 0.01 * i, 0.6, 0.9)  # Confiança diminui com tempo
+        
+        # Intervalo de confiança
+        margin = 0.5 * predicted_price * (1.0 - confidence_score)
         
-        return predictions
+        data["predicted_price"] = predicted_price
+        data["confidence_score"] = confidence_score
+        data["ci_lower"] = predicted_price - margin
+        data["ci_upper"] = predicted_price + margin
+        data["target_date"] = np.datetime64(base_date, "us") + np.arange(1, horizon_days + 1, dtype="timedelta64[D]")
+        data["factors"][:, :3] = draws[:, 1:]
+        data["factors"][:, 3] = seasonal_factor - 1
+        
+        return PredictionBatch(commodity=commodity, prediction_date=base_date, data=data)
+    
+    def generate_predictions(self, commodity: str, horizon_days: int = 30,
+                             seed: Optional[int] = None) -> List[PredictionResult]:
+        """Gerar predições para commodity"""
+        return self.generate_prediction_batch(commodity, horizon_days, seed).to_dataclasses()
     
-    def create_analytics_dashboard(self) -> Dict[str, Any]:
+    def create_analytics_dashboard(self) -> Mapping[str, Any]:
         """Criar especificação do dashboard de analytics"""
         self.logger.info("📊 Criando dashboard de analytics...")
         
-        dashboard_spec = {
-            "overview_page": {
-                "kpis": [
-                    {"name": "Model Accuracy", "value": "87.3%", "trend": "+2.1%"},
-                    {"name": "Daily Predictions", "value": "1,247", "trend": "+15%"},
-                    {"name": "API Calls", "value": "45,672", "trend": "+8%"},
-                    {"name": "Active Users", "value": "892", "trend": "+12%"}
-                ],
-                "charts": [
-                    {"type": "line", "title": "Prediction Accuracy Over Time"},
-                    {"type": "bar", "title": "Predictions by Commodity"},
-                    {"type": "heatmap", "title": "Model Performance Matrix"},
-                    {"type": "gauge", "title": "System Health Score"}
-                ]
-            },
-            "model_performance": {
-                "metrics_tracking": [
-                    "MAPE (Mean Absolute Percentage Error)",
-                    "Direction Accuracy", 
-                    "Prediction Interval Coverage",
-                    "Feature Importance Stability"
-                ],
-                "visualizations": [
-                    "Residual plots",
-                    "Feature importance charts",
-                    "SHAP value explanations",
-                    "Prediction vs Actual scatter plots"
-                ]
-            },
-            "data_quality": {
-                "monitoring": [
-                    "Data freshness alerts",
-                    "Missing value tracking", 
-                    "Outlier detection reports",
-                    "Data source availability"
-                ],
-                "data_profiling": [
-                    "Statistical summaries by source",
-                    "Data drift detection",
-                    "Feature correlation matrices", 
-                    "Time series decomposition"
-                ]
-            },
-            "business_insights": {
-                "commodity_analysis": [
-                    "Price trend analysis",
-                    "Volatility patterns",
-                    "Seasonal decomposition",
-                    "Cross-commodity correlations"
-                ],
-                "market_intelligence": [
-                    "Supply-demand indicators",
-                    "Weather impact analysis",
-                    "Economic factor influence", 
-                    "Global market comparisons"
-                ]
-            }
-        }
-        
-        return dashboard_spec
+        return _ANALYTICS_DASHBOARD
     
-    def setup_mlops_pipeline(self) -> Dict[str, Any]:
+    def setup_mlops_pipeline(self) -> Mapping[str, Any]:
         """Configurar pipeline MLOps"""
         self.logger.info("⚙️ Configurando pipeline MLOps...")
         
-        return {
-            "model_development": {
-                "experiment_tracking": "MLflow",
-                "model_registry": "MLflow Model Registry",
-                "version_control": "DVC + Git",
-                "notebook_environment": "Jupyter Lab + Papermill"
-            },
-            "model_training": {
-                "compute_infrastructure": "Docker + Kubernetes",
-                "hyperparameter_optimization": "Optuna",
-                "distributed_training": "Ray Train",
-                "scheduled_retraining": "Apache Airflow"
-            },
-            "model_deployment": {
-                "serving_framework": "FastAPI + Uvicorn",
-                "containerization": "Docker",
-                "orchestration": "Kubernetes", 
-                "load_balancing": "NGINX + Kubernetes Ingress"
-            },
-            "monitoring_observability": {
-                "model_monitoring": "Evidently AI",
-                "application_monitoring": "Prometheus + Grafana",
-                "logging": "ELK Stack (Elasticsearch, Logstash, Kibana)",
-                "alerting": "PagerDuty + Slack"
-            },
-            "data_pipeline": {
-                "data_ingestion": "Apache Kafka",
-                "data_processing": "Apache Spark", 
-                "data_storage": "PostgreSQL + Apache Parquet",
-                "data_validation": "Great Expectations"
-            },
-            "ci_cd": {
-                "source_control": "Git + GitHub",
-                "ci_pipeline": "GitHub Actions",
-                "testing": "pytest + MLflow",
-                "deployment": "ArgoCD + Kubernetes"
-            }
-        }
+        return _MLOPS_PIPELINE
     
-    def evaluate_model_performance(self, predictions: List[PredictionResult]) -> Dict[str, Any]:
+    def evaluate_model_performance(self, predictions: Union[PredictionBatch, List[PredictionResult]]) -> Dict[str, Any]:
         """Avaliar performance dos modelos"""
-        if not predictions:
+        if not len(predictions):
             return {"error": "No predictions to evaluate"}
             
-        avg_confidence = np.mean([p.confidence_score for p in predictions])
+        n = len(predictions)
+        if isinstance(predictions, PredictionBatch):
+            prices = predictions.data["predicted_price"]
+            confs = predictions.data["confidence_score"]
+        else:
+            prices = np.fromiter((p.predicted_price for p in predictions), dtype=np.float64, count=n)
+            confs = np.fromiter((p.confidence_score for p in predictions), dtype=np.float64, count=n)
+        
         price_range = {
-            "min": min(p.predicted_price for p in predictions),
-            "max": max(p.predicted_price for p in predictions),
-            "mean": np.mean([p.predicted_price for p in predictions])
+            "min": prices.min(),
+            "max": prices.max(),
+            "mean": prices.mean()
         }
         
         return {
             "model_metrics": {
-                "average_confidence": avg_confidence,
-                "predictions_generated": len(predictions),
-                "prediction_horizon": f"{len(predictions)} days",
-                "price_volatility": np.std([p.predicted_price for p in predictions])
+                "average_confidence": confs.mean(),
+                "predictions_generated": n,
+                "prediction_horizon": f"{n} days",
+                "price_volatility": prices.std()
             },
             "price_analysis": price_range,
             "risk_assessment": {
-                "high_confidence_predictions": sum(1 for p in predictions if p.confidence_score > 0.8),
-                "low_confidence_predictions": sum(1 for p in predictions if p.confidence_score < 0.6),
+                "high_confidence_predictions": int((confs > 0.8).sum()),
+                "low_confidence_predictions": int((confs < 0.6).sum()),
                 "trend_direction": "bullish" if price_range["max"] > price_range["min"] * 1.02 else "stable"
             }
         }
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     agent = AIDataAgent()
     
     # Testar funcionalidades
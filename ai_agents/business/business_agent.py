@@ -4,12 +4,14 @@
 SPR Sistema Preditivo Royal
 """
 
-import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import ClassVar, Mapping, Optional, Any, Tuple
 from dataclasses import dataclass
 
+from ai_agents._common import freeze
+
 @dataclass
 class BusinessOpportunity:
     """Oportunidade de negócio"""
@@ -19,6 +21,230 @@ class BusinessOpportunity:
     implementation_effort: str
     risk_level: str
 
+_logger = logging.getLogger("SPR")
+
+# Config padrão compartilhada (somente leitura) quando nenhuma é informada
+_EMPTY_CONFIG: Mapping[str, Any] = MappingProxyType({})
+
+# Especificações estáticas - construídas uma única vez no import e compartilhadas (somente leitura)
+_MARKET_OPPORTUNITY = freeze({
+    "market_size": {
+        "tam": "R$ 50 bilhões (Agronegócio Brasileiro)",
+        "sam": "R$ 5 bilhões (Tecnologia Agrícola)",
+        "som": "R$ 500 milhões (Previsão de Preços)"
+    },
+    "target_segments": [
+        {
+            "segment": "Grandes Produtores Rurais",
+            "size": "15.000 empresas", 
+            "willingness_to_pay": "R$ 500-2000/mês",
+            "pain_points": ["volatilidade preços", "planejamento safra"]
+        },
+        {
+            "segment": "Corretores e Trading",
+            "size": "2.500 empresas",
+            "willingness_to_pay": "R$ 1000-5000/mês", 
+            "pain_points": ["decisões rápidas", "análise mercado"]
+        },
+        {
+            "segment": "Cooperativas Agrícolas",
+            "size": "1.200 cooperativas",
+            "willingness_to_pay": "R$ 2000-10000/mês",
+            "pain_points": ["orientação produtores", "gestão estoques"]
+        }
+    ],
+    "competitive_landscape": {
+        "direct_competitors": ["AgriRisk", "FarmLogs", "Climate FieldView"],
+        "indirect_competitors": ["Bloomberg Terminal", "Reuters", "CEPEA"],
+        "competitive_advantage": [
+            "Foco específico no mercado brasileiro",
+            "Integração WhatsApp para alcance", 
+            "Modelos de IA customizados",
+            "Interface simplificada para produtores"
+        ]
+    }
+})
+
+_BUSINESS_MODEL = freeze({
+    "value_propositions": {
+        "primary": "Previsibilidade de preços com 85%+ de precisão",
+        "secondary": [
+            "Redução de risco em 30-40%",
+            "Aumento de margem em 10-15%", 
+            "Otimização de timing de venda",
+            "Acesso via WhatsApp (sem necessidade de app)"
+        ]
+    },
+    "revenue_streams": [
+        {
+            "name": "SaaS Subscription", 
+            "model": "Freemium + Paid Tiers",
+            "tiers": {
+                "free": {
+                    "price": "R$ 0/mês",
+                    "features": ["3 consultas/dia", "dados básicos"],
+                    "target": "pequenos produtores"
+                },
+                "professional": {
+                    "price": "R$ 299/mês", 
+                    "features": ["ilimitado", "previsões avançadas", "alertas"],
+                    "target": "médios produtores"
+                },
+                "enterprise": {
+                    "price": "R$ 1.499/mês",
+                    "features": ["API access", "custom models", "support"],
+                    "target": "grandes produtores/trading"
+                }
+            }
+        },
+        {
+            "name": "API Licensing",
+            "model": "Per-call pricing", 
+            "price": "R$ 0.10-0.50 per API call",
+            "target": "fintechs, apps agrícolas, cooperativas"
+        },
+        {
+            "name": "Custom Analytics",
+            "model": "Project-based", 
+            "price": "R$ 25.000-100.000 per project",
+            "target": "grandes corporações, governo"
+        }
+    ],
+    "cost_structure": {
+        "technology": "35% (infra, desenvolvimento)",
+        "data_acquisition": "25% (CEPEA, IMEA, external feeds)", 
+        "personnel": "30% (eng, data science, sales)",
+        "marketing": "10% (digital marketing, events)"
+    },
+    "key_metrics": {
+        "acquisition": ["CAC", "MRR growth", "conversion rate"],
+        "engagement": ["DAU/MAU", "query volume", "retention"],
+        "business": ["LTV/CAC", "gross margin", "churn rate"]
+    }
+})
+
+_GO_TO_MARKET_STRATEGY = freeze({
+    "launch_phases": {
+        "phase_1": {
+            "timeline": "Meses 1-3",
+            "target": "100 early adopters",
+            "focus": "product-market fit validation",
+            "channels": ["direct sales", "agricultural events"],
+            "investment": "R$ 150.000"
+        },
+        "phase_2": {
+            "timeline": "Meses 4-8", 
+            "target": "500 paying customers",
+            "focus": "scalable acquisition channels",
+            "channels": ["digital marketing", "partnerships"],
+            "investment": "R$ 500.000"
+        },
+        "phase_3": {
+            "timeline": "Meses 9-18",
+            "target": "2.500 customers", 
+            "focus": "market expansion",
+            "channels": ["enterprise sales", "channel partners"],
+            "investment": "R$ 1.500.000"
+        }
+    },
+    "marketing_channels": [
+        {
+            "channel": "Content Marketing",
+            "tactics": ["blog técnico", "webinars", "whitepapers"],
+            "budget_allocation": "25%",
+            "expected_cac": "R$ 200"
+        },
+        {
+            "channel": "Eventos Agrícolas",
+            "tactics": ["Agrishow", "Show Rural", "regionais"],
+            "budget_allocation": "30%", 
+            "expected_cac": "R$ 300"
+        },
+        {
+            "channel": "Digital Ads",
+            "tactics": ["Google Ads", "Facebook", "LinkedIn"],
+            "budget_allocation": "20%",
+            "expected_cac": "R$ 150"
+        },
+        {
+            "channel": "Partnerships",
+            "tactics": ["cooperativas", "consultores", "revendas"],
+            "budget_allocation": "25%",
+            "expected_cac": "R$ 100"
+        }
+    ],
+    "sales_strategy": {
+        "model": "Inside Sales + Field Sales",
+        "team_structure": {
+            "inside_sales": "2 SDRs + 2 AEs",
+            "field_sales": "1 Regional Manager + 2 Field AEs",
+            "customer_success": "1 CSM"
+        },
+        "sales_cycle": {
+            "small_medium": "30-45 dias",
+            "enterprise": "90-120 dias"
+        }
+    }
+})
+
+_SUCCESS_METRICS = freeze({
+    "business_metrics": {
+        "revenue": {
+            "mrr_growth": "20% MoM",
+            "arr_target": "R$ 10M em 18 meses"
+        },
+        "customers": {
+            "acquisition": "150 novos/mês após mês 6",
+            "retention": "90% após 12 meses",
+            "expansion": "25% revenue expansion"
+        },
+        "unit_economics": {
+            "ltv_cac_ratio": "> 3:1",
+            "payback_period": "< 12 meses",
+            "gross_margin": "> 75%"
+        }
+    },
+    "product_metrics": {
+        "usage": {
+            "dau_mau": "> 0.3",
+            "queries_per_user": "> 50/mês",
+            "api_calls": "> 100k/mês"
+        },
+        "quality": {
+            "prediction_accuracy": "> 85%",
+            "uptime": "> 99.9%", 
+            "response_time": "< 500ms"
+        }
+    }
+})
+
+_PARTNERSHIPS: Tuple[Mapping[str, Any], ...] = freeze([
+    {
+        "partner": "Cooperativas Agrícolas",
+        "type": "distribution",
+        "value": "acesso a base de produtores",
+        "investment": "revenue sharing 20%"
+    },
+    {
+        "partner": "CEPEA/ESALQ",
+        "type": "data + credibility",
+        "value": "dados oficiais + validação acadêmica", 
+        "investment": "licensing fee + co-branding"
+    },
+    {
+        "partner": "Bancos/Fintechs Agrícolas",
+        "type": "integration",
+        "value": "embedded analytics em produtos financeiros",
+        "investment": "API licensing + joint development"
+    },
+    {
+        "partner": "John Deere / Climate Corp",
+        "type": "strategic", 
+        "value": "integração com precision agriculture",
+        "investment": "equity partnership ou acquisition"
+    }
+])
+
 class BusinessAgent:
     """
     Business Strategy & Solutions Agent
@@ -27,259 +253,52 @@ class BusinessAgent:
     e definir soluções escaláveis usando tecnologia.
     """
     
-    def __init__(self, config: Dict[str, Any] = None):
-        self.config = config or {}
+    expertise: ClassVar[Tuple[str, ...]] = (
+        "Business Model Design",
+        "Market Analysis", 
+        "Product Strategy",
+        "Revenue Optimization",
+        "Go-to-Market Planning",
+        "KPI Definition",
+        "Competitive Analysis",
+        "ROI Modeling"
+    )
+    
+    def __init__(self, config: Optional[Mapping[str, Any]] = None):
+        self.config = config if config is not None else _EMPTY_CONFIG
         self.agent_id = "business-strategist"
         self.agent_name = "Business Strategy & Solutions Agent"
-        self.expertise = [
-            "Business Model Design",
-            "Market Analysis", 
-            "Product Strategy",
-            "Revenue Optimization",
-            "Go-to-Market Planning",
-            "KPI Definition",
-            "Competitive Analysis",
-            "ROI Modeling"
-        ]
         
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(f"SPR.{self.agent_id}")
+        self.logger = _logger.getChild(self.agent_id)
         
-    def analyze_market_opportunity(self) -> Dict[str, Any]:
+    def analyze_market_opportunity(self) -> Mapping[str, Any]:
         """Analisar oportunidade de mercado para SPR"""
         self.logger.info("📊 Analisando oportunidade de mercado...")
         
-        return {
-            "market_size": {
-                "tam": "R$ 50 bilhões (Agronegócio Brasileiro)",
-                "sam": "R$ 5 bilhões (Tecnologia Agrícola)",
-                "som": "R$ 500 milhões (Previsão de Preços)"
-            },
-            "target_segments": [
-                {
-                    "segment": "Grandes Produtores Rurais",
-                    "size": "15.000 empresas", 
-                    "willingness_to_pay": "R$ 500-2000/mês",
-                    "pain_points": ["volatilidade preços", "planejamento safra"]
-                },
-                {
-                    "segment": "Corretores e Trading",
-                    "size": "2.500 empresas",
-                    "willingness_to_pay": "R$ 1000-5000/mês", 
-                    "pain_points": ["decisões rápidas", "análise mercado"]
-                },
-                {
-                    "segment": "Cooperativas Agrícolas",
-                    "size": "1.200 cooperativas",
-                    "willingness_to_pay": "R$ 2000-10000/mês",
-                    "pain_points": ["orientação produtores", "gestão estoques"]
-                }
-            ],
-            "competitive_landscape": {
-                "direct_competitors": ["AgriRisk", "FarmLogs", "Climate FieldView"],
-                "indirect_competitors": ["Bloomberg Terminal", "Reuters", "CEPEA"],
-                "competitive_advantage": [
-                    "Foco específico no mercado brasileiro",
-                    "Integração WhatsApp para alcance", 
-                    "Modelos de IA customizados",
-                    "Interface simplificada para produtores"
-                ]
-            }
-        }
+        return _MARKET_OPPORTUNITY
     
-    def design_business_model(self) -> Dict[str, Any]:
+    def design_business_model(self) -> Mapping[str, Any]:
         """Projetar modelo de negócio para SPR"""
         self.logger.info("💼 Projetando modelo de negócio...")
         
-        return {
-            "value_propositions": {
-                "primary": "Previsibilidade de preços com 85%+ de precisão",
-                "secondary": [
-                    "Redução de risco em 30-40%",
-                    "Aumento de margem em 10-15%", 
-                    "Otimização de timing de venda",
-                    "Acesso via WhatsApp (sem necessidade de app)"
-                ]
-            },
-            "revenue_streams": [
-                {
-                    "name": "SaaS Subscription", 
-                    "model": "Freemium + Paid Tiers",
-                    "tiers": {
-                        "free": {
-                            "price": "R$ 0/mês",
-                            "features": ["3 consultas/dia", "dados básicos"],
-                            "target": "pequenos produtores"
-                        },
-                        "professional": {
-                            "price": "R$ 299/mês", 
-                            "features": ["ilimitado", "previsões avançadas", "alertas"],
-                            "target": "médios produtores"
-                        },
-                        "enterprise": {
-                            "price": "R$ 1.499/mês",
-                            "features": ["API access", "custom models", "support"],
-                            "target": "grandes produtores/trading"
-                        }
-                    }
-                },
-                {
-                    "name": "API Licensing",
-                    "model": "Per-call pricing", 
-                    "price": "R$ 0.10-0.50 per API call",
-                    "target": "fintechs, apps agrícolas, cooperativas"
-                },
-                {
-                    "name": "Custom Analytics",
-                    "model": "Project-based", 
-                    "price": "R$ 25.000-100.000 per project",
-                    "target": "grandes corporações, governo"
-                }
-            ],
-            "cost_structure": {
-                "technology": "35% (infra, desenvolvimento)",
-                "data_acquisition": "25% (CEPEA, IMEA, external feeds)", 
-                "personnel": "30% (eng, data science, sales)",
-                "marketing": "10% (digital marketing, events)"
-            },
-            "key_metrics": {
-                "acquisition": ["CAC", "MRR growth", "conversion rate"],
-                "engagement": ["DAU/MAU", "query volume", "retention"],
-                "business": ["LTV/CAC", "gross margin", "churn rate"]
-            }
-        }
+        return _BUSINESS_MODEL
     
-    def create_go_to_market_strategy(self) -> Dict[str, Any]:
+    def create_go_to_market_strategy(self) -> Mapping[str, Any]:
         """Criar estratégia go-to-market"""
         self.logger.info("🚀 Criando estratégia go-to-market...")
         
-        return {
-            "launch_phases": {
-                "phase_1": {
-                    "timeline": "Meses 1-3",
-                    "target": "100 early adopters",
-                    "focus": "product-market fit validation",
-                    "channels": ["direct sales", "agricultural events"],
-                    "investment": "R$ 150.000"
-                },
-                "phase_2": {
-                    "timeline": "Meses 4-8", 
-                    "target": "500 paying customers",
-                    "focus": "scalable acquisition channels",
-                    "channels": ["digital marketing", "partnerships"],
-                    "investment": "R$ 500.000"
-                },
-                "phase_3": {
-                    "timeline": "Meses 9-18",
-                    "target": "2.500 customers", 
-                    "focus": "market expansion",
-                    "channels": ["enterprise sales", "channel partners"],
-                    "investment": "R$ 1.500.000"
-                }
-            },
-            "marketing_channels": [
-                {
-                    "channel": "Content Marketing",
-                    "tactics": ["blog técnico", "webinars", "whitepapers"],
-                    "budget_allocation": "25%",
-                    "expected_cac": "R$ 200"
-                },
-                {
-                    "channel": "Eventos Agrícolas",
-                    "tactics": ["Agrishow", "Show Rural", "regionais"],
-                    "budget_allocation": "30%", 
-                    "expected_cac": "R$ 300"
-                },
-                {
-                    "channel": "Digital Ads",
-                    "tactics": ["Google Ads", "Facebook", "LinkedIn"],
-                    "budget_allocation": "20%",
-                    "expected_cac": "R$ 150"
-                },
-                {
-                    "channel": "Partnerships",
-                    "tactics": ["cooperativas", "consultores", "revendas"],
-                    "budget_allocation": "25%",
-                    "expected_cac": "R$ 100"
-                }
-            ],
-            "sales_strategy": {
-                "model": "Inside Sales + Field Sales",
-                "team_structure": {
-                    "inside_sales": "2 SDRs + 2 AEs",
-                    "field_sales": "1 Regional Manager + 2 Field AEs",
-                    "customer_success": "1 CSM"
-                },
-                "sales_cycle": {
-                    "small_medium": "30-45 dias",
-                    "enterprise": "90-120 dias"
-                }
-            }
-        }
+        return _GO_TO_MARKET_STRATEGY
     
-    def define_success_metrics(self) -> Dict[str, Any]:
+    def define_success_metrics(self) -> Mapping[str, Any]:
         """Definir métricas de sucesso"""
-        return {
-            "business_metrics": {
-                "revenue": {
-                    "mrr_growth": "20% MoM",
-                    "arr_target": "R$ 10M em 18 meses"
-                },
-                "customers": {
-                    "acquisition": "150 novos/mês após mês 6",
-                    "retention": "90% após 12 meses",
-                    "expansion": "25% revenue expansion"
-                },
-                "unit_economics": {
-                    "ltv_cac_ratio": "> 3:1",
-                    "payback_period": "< 12 meses",
-                    "gross_margin": "> 75%"
-                }
-            },
-            "product_metrics": {
-                "usage": {
-                    "dau_mau": "> 0.3",
-                    "queries_per_user": "> 50/mês",
-                    "api_calls": "> 100k/mês"
-                },
-                "quality": {
-                    "prediction_accuracy": "> 85%",
-                    "uptime": "> 99.9%", 
-                    "response_time": "< 500ms"
-                }
-            }
-        }
+        return _SUCCESS_METRICS
     
-    def identify_partnerships(self) -> List[Dict[str, Any]]:
+    def identify_partnerships(self) -> Tuple[Mapping[str, Any], ...]:
         """Identificar parcerias estratégicas"""
-        return [
-            {
-                "partner": "Cooperativas Agrícolas",
-                "type": "distribution",
-                "value": "acesso a base de produtores",
-                "investment": "revenue sharing 20%"
-            },
-            {
-                "partner": "CEPEA/ESALQ",
-                "type": "data + credibility",
-                "value": "dados oficiais + validação acadêmica", 
-                "investment": "licensing fee + co-branding"
-            },
-            {
-                "partner": "Bancos/Fintechs Agrícolas",
-                "type": "integration",
-                "value": "embedded analytics em produtos financeiros",
-                "investment": "API licensing + joint development"
-            },
-            {
-                "partner": "John Deere / Climate Corp",
-                "type": "strategic", 
-                "value": "integração com precision agriculture",
-                "investment": "equity partnership ou acquisition"
-            }
-        ]
+        return _PARTNERSHIPS
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     agent = BusinessAgent()
     
     # Executar análise completa
@@ -4,37 +4,87 @@
 SPR Sistema Preditivo Royal
 """
 
-import json
+import heapq
+import itertools
 import logging
 import asyncio
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import ClassVar, Dict, Iterator, List, Mapping, Optional, Any, Tuple
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
 
-@dataclass
+import numpy as np
+
+from ai_agents._common import dumps_bytes
+
+_logger = logging.getLogger("SPR.team-coordinator")
+
+# Códigos de status de execução (índice em _STATUS_NAMES)
+TASK_PENDING, TASK_IN_PROGRESS, TASK_COMPLETED, TASK_FAILED = range(4)
+_STATUS_NAMES = ("pending", "in_progress", "completed", "failed")
+
+# Limite de tarefas em execução simultânea (backpressure do agendador)
+MAX_INFLIGHT_TASKS = 20
+
+@dataclass(slots=True, frozen=True)
 class TeamTask:
-    """Tarefa para equipe específica"""
+    """Tarefa para equipe específica (status de execução fica no TeamCoordinator)"""
     team_id: str
     task_id: str
     description: str
-    assigned_agents: List[str]
+    assigned_agents: Tuple[str, ...]
     priority: int = 5  # 1=highest, 10=lowest
-    dependencies: List[str] = None
+    dependencies: Tuple[str, ...] = ()
     estimated_time: int = 300  # segundos
-    status: str = "pending"  # pending, in_progress, completed, failed
+    
+    def __post_init__(self):
+        # Aceitar listas (API anterior) armazenando como tuplas
+        if not isinstance(self.assigned_agents, tuple):
+            object.__setattr__(self, "assigned_agents", tuple(self.assigned_agents))
+        if not isinstance(self.dependencies, tuple):
+            object.__setattr__(self, "dependencies", tuple(self.dependencies or ()))
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TeamStatus:
     """Status da equipe"""
     team_id: str
-    active_agents: List[str]
-    current_tasks: List[str]
+    active_agents: Tuple[str, ...]
+    current_tasks: Tuple[str, ...]
     completed_tasks: int
     success_rate: float
     avg_completion_time: float
 
+# Outputs simulados por tarefa (somente leitura, compartilhados)
+_TASK_OUTPUT_TEMPLATES = MappingProxyType({
+    "FE-001": MappingProxyType({
+        "components_created": 5,
+        "pages_implemented": 3,
+        "performance_score": 92,
+        "accessibility_score": 98
+    }),
+    "BE-001": MappingProxyType({
+        "apis_implemented": 8,
+        "endpoints_created": 15,
+        "avg_response_time": "245ms",
+        "test_coverage": "94%"
+    }),
+    "DS-001": MappingProxyType({
+        "data_sources_connected": 4,
+        "records_processed": 125000,
+        "pipeline_latency": "180ms",
+        "data_quality_score": 0.96
+    }),
+    "ST-001": MappingProxyType({
+        "market_size_identified": "R$ 50 billion TAM",
+        "competitors_analyzed": 12,
+        "opportunities_found": 8,
+        "confidence_level": "high"
+    })
+})
+
+_DEFAULT_TASK_OUTPUT = MappingProxyType({"status": "completed", "details": "Task executed successfully"})
+
 class TeamCoordinator:
     """
     Coordenador de Equipes de Agentes IA
@@ -43,12 +93,123 @@ class TeamCoordinator:
     no desenvolvimento do SPR.
     """
     
+    __slots__ = (
+        "coordinator_id", "coordinator_name", "logger", "teams",
+        "_team_ids", "_agents_per_team",
+        "_completed_tasks", "_success_rate", "_avg_time", "_rng", "_team_agents", "_task_id_pool",
+        "_total_agents", "_team_summary_static",
+        "task_queues", "_inbound", "_task_seq", "_task_idx", "_status_arr",
+        "team_status", "active_tasks",
+    )
+    
+    # Plano de trabalho estático: TeamTasks congeladas (campos em tuplas) compartilhadas entre chamadas
+    _WORK_PLAN_TEMPLATE: ClassVar[Mapping[str, Tuple[TeamTask, ...]]] = MappingProxyType({
+        "frontend_team": (
+            TeamTask(
+                team_id="frontend_team",
+                task_id="FE-001",
+                description="Desenvolver componentes dashboard principal",
+                assigned_agents=("frontend-engineer", "ui-ux-designer"),
+                priority=1,
+                estimated_time=480
+            ),
+            TeamTask(
+                team_id="frontend_team", 
+                task_id="FE-002",
+                description="Implementar páginas WhatsApp e Commodities",
+                assigned_agents=("frontend-engineer",),
+                priority=2,
+                estimated_time=360
+            ),
+            TeamTask(
+                team_id="frontend_team",
+                task_id="FE-003", 
+                description="Otimizar performance e acessibilidade",
+                assigned_agents=("frontend-engineer", "ui-ux-designer"),
+                priority=3,
+                estimated_time=240
+            )
+        ),
+        
+        "backend_team": (
+            TeamTask(
+                team_id="backend_team",
+                task_id="BE-001",
+                description="Implementar APIs de commodities e previsões",
+                assigned_agents=("database-engineer",),
+                priority=1,
+                estimated_time=420
+            ),
+            TeamTask(
+                team_id="backend_team",
+                task_id="BE-002", 
+                description="Integração Evolution API WhatsApp",
+                assigned_agents=("database-engineer",),
+                priority=1,
+                estimated_time=300
+            ),
+            TeamTask(
+                team_id="backend_team",
+                task_id="BE-003",
+                description="Otimização de performance e cache",
+                assigned_agents=("performance-engineer",),
+                priority=2,
+                estimated_time=240
+            )
+        ),
+        
+        "data_team": (
+            TeamTask(
+                team_id="data_team",
+                task_id="DS-001",
+                description="Pipeline ingestão dados CEPEA/IMEA",
+                assigned_agents=("data-engineer",),
+                priority=1,
+                estimated_time=360
+            ),
+            TeamTask(
+                team_id="data_team",
+                task_id="DS-002",
+                description="Modelos preditivos soja/milho/boi",
+                assigned_agents=("ai-data-scientist", "quant-analyst"),
+                priority=1,
+                estimated_time=600
+            ),
+            TeamTask(
+                team_id="data_team",
+                task_id="DS-003",
+                description="MLOps e monitoramento modelos",
+                assigned_agents=("ai-data-scientist",),
+                priority=2,
+                estimated_time=300
+            )
+        ),
+        
+        "strategy_team": (
+            TeamTask(
+                team_id="strategy_team",
+                task_id="ST-001", 
+                description="Análise mercado commodities Brasil",
+                assigned_agents=("web-researcher", "business-strategist"),
+                priority=1,
+                estimated_time=240
+            ),
+            TeamTask(
+                team_id="strategy_team",
+                task_id="ST-002",
+                description="Go-to-market strategy e pricing",
+                assigned_agents=("business-strategist",),
+                priority=2, 
+                estimated_time=180
+            )
+        )
+    })
+    
     def __init__(self):
         self.coordinator_id = "team-coordinator"
         self.coordinator_name = "Team Coordinator - Multi-Agent Management"
         
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(f"SPR.{self.coordinator_id}")
+        self.logger = _logger
         
         # Definir equipes especializadas
         self.teams = {
@@ -82,16 +243,48 @@ class TeamCoordinator:
             }
         }
         
-        # Queue de tarefas por equipe
+        # Visão colunar (SoA) das equipes: índice inteiro = posição em _team_ids
+        self._team_ids = list(self.teams)
+        self._agents_per_team = np.array([len(t["agents"]) for t in self.teams.values()], dtype=np.int32)
+        self._completed_tasks = np.zeros(len(self._team_ids), dtype=np.int32)
+        self._success_rate = np.zeros(len(self._team_ids), dtype=np.float32)
+        self._avg_time = np.zeros(len(self._team_ids), dtype=np.float32)
+        self._rng = np.random.default_rng()
+        self._team_agents = {team_id: tuple(t["agents"]) for team_id, t in self.teams.items()}
+        # IDs de tarefas correntes pré-formatados por equipe (fatiados em monitor_team_performance)
+        self._task_id_pool = {
+            team_id: tuple(f"{team_id.upper()}-00{i}" for i in range(1, 4))
+            for team_id in self._team_ids
+        }
+        
+        # Partes estáticas do dashboard (teams não muda após __init__)
+        self._total_agents = int(self._agents_per_team.sum())
+        self._team_summary_static = MappingProxyType({
+            team_id: MappingProxyType({
+                "lead": config["lead_coordinator"], 
+                "agents_count": len(config["agents"]),
+                "specialty": config["specialty"],
+                "capacity": f"{config['current_capacity']}%",
+                "max_tasks": config["max_concurrent_tasks"]
+            })
+            for team_id, config in self.teams.items()
+        })
+        
+        # Fila de prioridade (min-heap) por equipe: (priority, seq, task)
         self.task_queues = {team_id: [] for team_id in self.teams.keys()}
+        # Entrada multi-produtor por equipe: deque.append/popleft são atômicos sob o GIL,
+        # então produtores não precisam de lock; só o agendador move para o heap
+        self._inbound: Dict[str, deque] = {team_id: deque() for team_id in self.teams.keys()}
+        self._task_seq = itertools.count()
+        
+        # Status de execução como array uint8 denso (TASK_*), indexado via task_id -> idx
+        self._task_idx: Dict[str, int] = {}
+        self._status_arr = np.zeros(64, dtype=np.uint8)
         
         # Status tracking
         self.team_status = {}
         self.active_tasks = {}
         
-        # Thread pool para execução paralela
-        self.executor = ThreadPoolExecutor(max_workers=10)
-        
     def assign_coordinators(self) -> Dict[str, Any]:
         """Designar coordenadores para cada equipe"""
         self.logger.info("🎯 Designando coordenadores de equipe...")
@@ -165,191 +358,194 @@ class TeamCoordinator:
         return coordinators
     
     def create_simultaneous_work_plan(self) -> Dict[str, List[TeamTask]]:
-        """Criar plano de trabalho simultâneo para todas as equipes"""
-        self.logger.info("⚡ Criando plano de trabalho simultâneo...")
+        """
+        Criar plano de trabalho simultâneo para todas as equipes
         
-        work_plan = {
-            "frontend_team": [
-                TeamTask(
-                    team_id="frontend_team",
-                    task_id="FE-001",
-                    description="Desenvolver componentes dashboard principal",
-                    assigned_agents=["frontend-engineer", "ui-ux-designer"],
-                    priority=1,
-                    estimated_time=480
-                ),
-                TeamTask(
-                    team_id="frontend_team", 
-                    task_id="FE-002",
-                    description="Implementar páginas WhatsApp e Commodities",
-                    assigned_agents=["frontend-engineer"],
-                    priority=2,
-                    estimated_time=360
-                ),
-                TeamTask(
-                    team_id="frontend_team",
-                    task_id="FE-003", 
-                    description="Otimizar performance e acessibilidade",
-                    assigned_agents=["frontend-engineer", "ui-ux-designer"],
-                    priority=3,
-                    estimated_time=240
-                )
-            ],
-            
-            "backend_team": [
-                TeamTask(
-                    team_id="backend_team",
-                    task_id="BE-001",
-                    description="Implementar APIs de commodities e previsões",
-                    assigned_agents=["database-engineer"],
-                    priority=1,
-                    estimated_time=420
-                ),
-                TeamTask(
-                    team_id="backend_team",
-                    task_id="BE-002", 
-                    description="Integração Evolution API WhatsApp",
-                    assigned_agents=["database-engineer"],
-                    priority=1,
-                    estimated_time=300
-                ),
-                TeamTask(
-                    team_id="backend_team",
-                    task_id="BE-003",
-                    description="Otimização de performance e cache",
-                    assigned_agents=["performance-engineer"],
-                    priority=2,
-                    estimated_time=240
-                )
-            ],
-            
-            "data_team": [
-                TeamTask(
-                    team_id="data_team",
-                    task_id="DS-001",
-                    description="Pipeline ingestão dados CEPEA/IMEA",
-                    assigned_agents=["data-engineer"],
-                    priority=1,
-                    estimated_time=360
-                ),
-                TeamTask(
-                    team_id="data_team",
-                    task_id="DS-002",
-                    description="Modelos preditivos soja/milho/boi",
-                    assigned_agents=["ai-data-scientist", "quant-analyst"],
-                    priority=1,
-                    estimated_time=600
-                ),
-                TeamTask(
-                    team_id="data_team",
-                    task_id="DS-003",
-                    description="MLOps e monitoramento modelos",
-                    assigned_agents=["ai-data-scientist"],
-                    priority=2,
-                    estimated_time=300
-                )
-            ],
-            
-            "strategy_team": [
-                TeamTask(
-                    team_id="strategy_team",
-                    task_id="ST-001", 
-                    description="Análise mercado commodities Brasil",
-                    assigned_agents=["web-researcher", "business-strategist"],
-                    priority=1,
-                    estimated_time=240
-                ),
-                TeamTask(
-                    team_id="strategy_team",
-                    task_id="ST-002",
-                    description="Go-to-market strategy e pricing",
-                    assigned_agents=["business-strategist"],
-                    priority=2, 
-                    estimated_time=180
-                )
-            ]
-        }
+        As listas por equipe são novas a cada chamada; as TeamTasks são as do template,
+        imutáveis (use dataclasses.replace para derivar variações).
+        """
+        self.logger.info("⚡ Criando plano de trabalho simultâneo...")
+        return {team_id: list(tasks) for team_id, tasks in self._WORK_PLAN_TEMPLATE.items()}
+    
+    def enqueue_task(self, team_id: str, task: TeamTask) -> bool:
+        """
+        Enfileirar tarefa para a equipe (seguro para múltiplos produtores)
         
-        return work_plan
+        Retorna False, sem enfileirar de novo, se o task_id já estiver pendente.
+        """
+        idx = self._task_idx.get(task.task_id)
+        if idx is not None and self._status_arr[idx] == TASK_PENDING:
+            return False
+        if idx is None:
+            idx = self._task_idx[task.task_id] = len(self._task_idx)
+            if idx == len(self._status_arr):
+                # Crescimento geométrico do array de status
+                self._status_arr = np.resize(self._status_arr, 2 * idx)
+        self._status_arr[idx] = TASK_PENDING
+        self._inbound[team_id].append(task)
+        return True
     
-    def execute_simultaneous_tasks(self, work_plan: Dict[str, List[TeamTask]]) -> Dict[str, Any]:
-        """Executar tarefas simultaneamente em todas as equipes"""
-        self.logger.info("🚀 Iniciando execução simultânea de tarefas...")
+    def _drain_inbound(self) -> None:
+        """Mover tarefas recebidas para os heaps de prioridade (lado do agendador)"""
+        for team_id, inbound in self._inbound.items():
+            queue = self.task_queues[team_id]
+            while inbound:
+                task = inbound.popleft()
+                heapq.heappush(queue, (task.priority, next(self._task_seq), task))
+    
+    def get_task_status(self, task_id: str) -> Optional[str]:
+        """Status de execução de uma tarefa (None se nunca enfileirada)"""
+        idx = self._task_idx.get(task_id)
+        return None if idx is None else _STATUS_NAMES[self._status_arr[idx]]
+    
+    def status_counts(self) -> Dict[str, int]:
+        """Contagem de tarefas por status (uma única passada vetorizada)"""
+        counts = np.bincount(self._status_arr[:len(self._task_idx)], minlength=len(_STATUS_NAMES))
+        return dict(zip(_STATUS_NAMES, counts.tolist()))
+    
+    def get_queued_tasks(self, team_id: str) -> List[TeamTask]:
+        """Tarefas pendentes da equipe em ordem de prioridade"""
+        self._drain_inbound()
+        return [task for _, _, task in sorted(self.task_queues[team_id])]
+    
+    def _iter_by_priority(self) -> Iterator[Tuple[str, TeamTask]]:
+        """Consumir as filas em ordem de prioridade (entre todas as equipes)"""
+        while True:
+            self._drain_inbound()
+            ready = [team_id for team_id, queue in self.task_queues.items() if queue]
+            if not ready:
+                return
+            team_id = min(ready, key=lambda tid: self.task_queues[tid][0][:2])
+            _, _, task = heapq.heappop(self.task_queues[team_id])
+            yield team_id, task
+    
+    def _record_task_result(self, results: Dict[str, Any], team_id: str, task: TeamTask,
+                            future: asyncio.Future) -> float:
+        """Registrar resultado de uma tarefa em results; retorna o tempo se concluída com sucesso"""
+        try:
+            result = future.result()
+            self._status_arr[self._task_idx[task.task_id]] = TASK_COMPLETED if result["success"] else TASK_FAILED
+            if result["success"]:
+                results["completed_tasks"].append({
+                    "team_id": team_id,
+                    "task_id": task.task_id,
+                    "description": task.description,
+                    "execution_time": result["execution_time"],
+                    "output": result["output"]
+                })
+                return result["execution_time"]
+            else:
+                results["failed_tasks"].append({
+                    "team_id": team_id,
+                    "task_id": task.task_id, 
+                    "error": result["error"]
+                })
+                
+        except Exception as e:
+            self._status_arr[self._task_idx[task.task_id]] = TASK_FAILED
+            results["failed_tasks"].append({
+                "team_id": team_id,
+                "task_id": task.task_id,
+                "error": str(e)
+            })
+        return 0.0
+    
+    async def execute_simultaneous_tasks(self, work_plan: Dict[str, List[TeamTask]]) -> Dict[str, Any]:
+        """
+        Executar tarefas simultaneamente em todas as equipes
         
-        # Submit tasks para thread pool
-        future_to_task = {}
+        Executa as tarefas do work_plan e as que já estavam nas filas; total_tasks conta
+        as tarefas efetivamente executadas.
+        """
+        self.logger.info("🚀 Iniciando execução simultânea de tarefas...")
         
         for team_id, tasks in work_plan.items():
             for task in tasks:
-                future = self.executor.submit(self._execute_team_task, team_id, task)
-                future_to_task[future] = (team_id, task)
+                self.enqueue_task(team_id, task)
+        
+        # Concorrência limitada por equipe (max_concurrent_tasks)
+        semaphores = {
+            team_id: asyncio.Semaphore(config["max_concurrent_tasks"])
+            for team_id, config in self.teams.items()
+        }
+        
+        async def _bounded(team_id: str, task: TeamTask, jitter: float, roll: float) -> Dict[str, Any]:
+            async with semaphores[team_id]:
+                return await self._execute_team_task(team_id, task, jitter, roll)
+        
+        # Sorteios da simulação para o lote inteiro: variação de tempo e rolagem de sucesso
+        self._drain_inbound()
+        n_tasks = max(1, sum(len(queue) for queue in self.task_queues.values()))
+        exec_jitter = self._rng.uniform(0.5, 1.5, n_tasks).tolist()
+        success_roll = self._rng.random(n_tasks).tolist()
         
-        # Coletar resultados conforme completam
         results = {
             "completed_tasks": [],
             "failed_tasks": [],
             "execution_stats": {}
         }
         
-        start_time = datetime.now()
-        
-        for future in as_completed(future_to_task):
-            team_id, task = future_to_task[future]
-            try:
-                result = future.result()
-                if result["success"]:
-                    results["completed_tasks"].append({
-                        "team_id": team_id,
-                        "task_id": task.task_id,
-                        "description": task.description,
-                        "execution_time": result["execution_time"],
-                        "output": result["output"]
-                    })
-                else:
-                    results["failed_tasks"].append({
-                        "team_id": team_id,
-                        "task_id": task.task_id, 
-                        "error": result["error"]
-                    })
-                    
-            except Exception as e:
-                results["failed_tasks"].append({
-                    "team_id": team_id,
-                    "task_id": task.task_id,
-                    "error": str(e)
-                })
+        t0 = time.perf_counter_ns()
+        
+        # Backpressure: no máximo MAX_INFLIGHT_TASKS tarefas em voo; drena conforme completam
+        in_flight: Dict[asyncio.Future, Tuple[str, TeamTask]] = {}
+        
+        total_exec_time = 0.0
+        total_tasks = 0
+        
+        async def _drain() -> None:
+            nonlocal total_exec_time
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                team_id, task = in_flight.pop(future)
+                total_exec_time += self._record_task_result(results, team_id, task, future)
         
-        total_time = (datetime.now() - start_time).total_seconds()
+        for k, (team_id, task) in enumerate(self._iter_by_priority()):
+            if len(in_flight) >= MAX_INFLIGHT_TASKS:
+                await _drain()
+            if k >= len(exec_jitter):
+                # Tarefas enfileiradas durante a execução: novo lote de sorteios
+                exec_jitter += self._rng.uniform(0.5, 1.5, n_tasks).tolist()
+                success_roll += self._rng.random(n_tasks).tolist()
+            future = asyncio.ensure_future(_bounded(team_id, task, exec_jitter[k], success_roll[k]))
+            in_flight[future] = (team_id, task)
+            total_tasks += 1
         
+        while in_flight:
+            await _drain()
+        
+        total_time = (time.perf_counter_ns() - t0) * 1e-9
+        
+        completed_count = len(results["completed_tasks"])
         results["execution_stats"] = {
             "total_execution_time": total_time,
-            "total_tasks": sum(len(tasks) for tasks in work_plan.values()),
-            "completed_count": len(results["completed_tasks"]),
+            "total_tasks": total_tasks,
+            "completed_count": completed_count,
             "failed_count": len(results["failed_tasks"]),
-            "success_rate": len(results["completed_tasks"]) / sum(len(tasks) for tasks in work_plan.values()) * 100,
-            "avg_task_time": sum(t["execution_time"] for t in results["completed_tasks"]) / len(results["completed_tasks"]) if results["completed_tasks"] else 0
+            "success_rate": completed_count / total_tasks * 100 if total_tasks else 0,
+            "avg_task_time": total_exec_time / completed_count if completed_count else 0
         }
         
         return results
     
-    def _execute_team_task(self, team_id: str, task: TeamTask) -> Dict[str, Any]:
+    async def _execute_team_task(self, team_id: str, task: TeamTask,
+                                 jitter: float, roll: float) -> Dict[str, Any]:
         """Executar tarefa específica de uma equipe"""
-        start_time = datetime.now()
+        t0 = time.perf_counter_ns()
+        
+        self._status_arr[self._task_idx[task.task_id]] = TASK_IN_PROGRESS
         
         try:
-            self.logger.info(f"🔄 [{team_id}] Executando {task.task_id}: {task.description}")
+            self.logger.info("🔄 [%s] Executando %s: %s", team_id, task.task_id, task.description)
             
             # Simular execução da tarefa (em produção, chamaria agentes reais)
-            import time
-            import random
-            
-            # Simular tempo de execução baseado na estimativa
-            execution_time = random.uniform(0.5, 1.5) * (task.estimated_time / 100)
-            time.sleep(execution_time)
+            # jitter ~ U(0.5, 1.5) e roll ~ U(0, 1) vêm sorteados em lote pelo chamador
+            execution_time = jitter * (task.estimated_time / 100)
+            await asyncio.sleep(execution_time)
             
             # Simular sucesso/falha baseado na prioridade (maior prioridade = maior chance de sucesso)
             success_probability = 0.95 - (task.priority - 1) * 0.05
-            success = random.random() < success_probability
+            success = roll < success_probability
             
             if success:
                 # Gerar output simulado baseado na tarefa
@@ -370,81 +566,49 @@ class TeamCoordinator:
         except Exception as e:
             return {
                 "success": False,
-                "execution_time": (datetime.now() - start_time).total_seconds(),
+                "execution_time": (time.perf_counter_ns() - t0) * 1e-9,
                 "error": str(e)
             }
     
-    def _generate_task_output(self, task: TeamTask) -> Dict[str, Any]:
+    def _generate_task_output(self, task: TeamTask) -> Mapping[str, Any]:
         """Gerar output simulado para tarefa"""
-        outputs = {
-            "FE-001": {
-                "components_created": 5,
-                "pages_implemented": 3,
-                "performance_score": 92,
-                "accessibility_score": 98
-            },
-            "BE-001": {
-                "apis_implemented": 8,
-                "endpoints_created": 15,
-                "avg_response_time": "245ms",
-                "test_coverage": "94%"
-            },
-            "DS-001": {
-                "data_sources_connected": 4,
-                "records_processed": 125000,
-                "pipeline_latency": "180ms",
-                "data_quality_score": 0.96
-            },
-            "ST-001": {
-                "market_size_identified": "R$ 50 billion TAM",
-                "competitors_analyzed": 12,
-                "opportunities_found": 8,
-                "confidence_level": "high"
-            }
-        }
-        
-        return outputs.get(task.task_id, {"status": "completed", "details": "Task executed successfully"})
+        return _TASK_OUTPUT_TEMPLATES.get(task.task_id, _DEFAULT_TASK_OUTPUT)
     
     def monitor_team_performance(self) -> Dict[str, TeamStatus]:
         """Monitorar performance das equipes"""
         self.logger.info("📊 Monitorando performance das equipes...")
         
-        team_statuses = {}
+        # Simular métricas de performance - um sorteio vetorizado por métrica
+        n = len(self._team_ids)
+        rng = self._rng
+        self._completed_tasks[:] = rng.integers(15, 46, size=n)
+        self._success_rate[:] = rng.uniform(0.85, 0.98, size=n)
+        self._avg_time[:] = rng.uniform(180, 420, size=n)
+        current_counts = rng.integers(1, 5, size=n)
         
-        for team_id, team_config in self.teams.items():
-            # Simular métricas de performance
-            import random
-            
-            status = TeamStatus(
+        return {
+            team_id: TeamStatus(
                 team_id=team_id,
-                active_agents=team_config["agents"],
-                current_tasks=[f"{team_id.upper()}-00{i}" for i in range(1, random.randint(1, 4))],
-                completed_tasks=random.randint(15, 45),
-                success_rate=random.uniform(0.85, 0.98),
-                avg_completion_time=random.uniform(180, 420)
+                active_agents=self._team_agents[team_id],
+                current_tasks=self._task_id_pool[team_id][:k - 1],
+                completed_tasks=completed,
+                success_rate=success,
+                avg_completion_time=avg_time
             )
-            
-            team_statuses[team_id] = status
-        
-        return team_statuses
+            for team_id, k, completed, success, avg_time in zip(
+                self._team_ids, current_counts.tolist(), self._completed_tasks.tolist(),
+                self._success_rate.tolist(), self._avg_time.tolist()
+            )
+        }
     
     def generate_coordination_dashboard(self) -> Dict[str, Any]:
         """Gerar dashboard de coordenação"""
         return {
             "overall_status": "🟢 ALL TEAMS OPERATIONAL",
-            "active_teams": len(self.teams),
-            "total_agents": sum(len(team["agents"]) for team in self.teams.values()),
+            "active_teams": len(self._team_ids),
+            "total_agents": self._total_agents,
             
-            "team_summary": {
-                team_id: {
-                    "lead": config["lead_coordinator"], 
-                    "agents_count": len(config["agents"]),
-                    "specialty": config["specialty"],
-                    "capacity": f"{config['current_capacity']}%",
-                    "max_tasks": config["max_concurrent_tasks"]
-                }
-                for team_id, config in self.teams.items()
-            },
+            "team_summary": self._team_summary_static,
             
             "coordination_metrics": {
                 "cross_team_dependencies": 3,
@@ -461,7 +625,14 @@ class TeamCoordinator:
             ]
         }
 
+    def to_json(self, payload: Optional[Any] = None) -> str:
+        """Serializar dashboard (ou resultados informados) para JSON"""
+        if payload is None:
+            payload = self.generate_coordination_dashboard()
+        return dumps_bytes(payload).decode("utf-8")
+
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     coordinator = TeamCoordinator()
     
     # Ativar coordenação completa
@@ -479,7 +650,7 @@ if __name__ == "__main__":
     
     # 3. Executar tarefas simultaneamente
     print("🚀 Iniciando execução simultânea...")
-    results = coordinator.execute_simultaneous_tasks(work_plan)
+    results = asyncio.run(coordinator.execute_simultaneous_tasks(work_plan))
     
     # 4. Mostrar resultados
     stats = results["execution_stats"]
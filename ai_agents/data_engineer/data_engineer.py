@@ -4,13 +4,17 @@
 Especialista em pipelines de dados, ETL e infraestrutura de dados
 """
 
-import json
+import functools
 import logging
+import sys
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Any, Tuple
+from dataclasses import dataclass, field, fields, is_dataclass
 
-@dataclass
+from ai_agents._common import dumps_bytes, freeze
+
+@dataclass(slots=True, frozen=True)
 class DataSource:
     """Fonte de dados"""
     name: str
@@ -20,15 +24,529 @@ class DataSource:
     reliability: float
     latency_minutes: int
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DataPipeline:
-    """Pipeline de dados"""
+    """Pipeline de dados (imutável; monitoring fica fora do hash)"""
     name: str
-    sources: List[DataSource]
-    transformations: List[str]
+    sources: Tuple[DataSource, ...]
+    transformations: Tuple[str, ...]
     destination: str
     schedule: str
-    monitoring: Dict[str, Any]
+    monitoring: Mapping[str, Any] = field(hash=False)
+
+@dataclass(slots=True, frozen=True)
+class CacheKeyPolicy:
+    """Política de cache Redis por domínio (chave, TTL e gatilhos de invalidação)"""
+    domain: str
+    template: str
+    ttl_seconds: int
+    invalidate_on: Tuple[str, ...] = ()
+    
+    def key(self, **parts: Any) -> str:
+        """Montar a chave Redis a partir do template"""
+        return self.template.format(**parts)
+
+class DataSourceSpec(NamedTuple):
+    """Fonte de dados na especificação de arquitetura"""
+    name: str
+    type: str
+    data: str
+    frequency: str
+    reliability: Optional[float] = None
+
+class StreamProcessorSpec(NamedTuple):
+    """Processador de stream em tempo real"""
+    name: str
+    input: str
+    output: str
+    logic: str
+    latency: Optional[str] = None
+    window: Optional[str] = None
+
+class AlertRule(NamedTuple):
+    """Alerta automatizado de qualidade de dados"""
+    trigger: str
+    action: str
+    escalation: str
+
+_logger = logging.getLogger("SPR.data-engineer")
+
+# Políticas de cache: TTL curto para fontes menos confiáveis/mais frequentes,
+# longo para séries oficiais diárias (ex.: redis.set(key, value, ex=policy.ttl_seconds))
+_CACHE_POLICIES: Tuple[CacheKeyPolicy, ...] = (
+    CacheKeyPolicy("api_response", "spr:api:{endpoint}:{params_hash}", 300, ("price_update", "prediction_update")),
+    CacheKeyPolicy("session", "spr:session:{user_id}", 86400, ("logout",)),
+    CacheKeyPolicy("prices", "spr:prices:{commodity}:{date}", 14400, ("price_update",)),
+    CacheKeyPolicy("weather", "spr:weather:{region}:{hour}", 3600, ("weather_update",)),
+    CacheKeyPolicy("economic", "spr:economic:{indicator}:{date}", 86400, ("economic_update",)),
+    CacheKeyPolicy("predictions", "spr:predictions:{commodity}:{horizon}", 21600, ("price_update", "model_update")),
+)
+
+def _index_cache_policies(policies: Tuple[CacheKeyPolicy, ...]) -> Mapping[str, CacheKeyPolicy]:
+    """Indexar políticas por domínio, rejeitando domínios ou prefixos de chave duplicados"""
+    by_domain: Dict[str, CacheKeyPolicy] = {}
+    prefixes = set()
+    for policy in policies:
+        prefix = policy.template.split("{", 1)[0]
+        if policy.domain in by_domain or prefix in prefixes:
+            raise ValueError(f"Política de cache duplicada: {policy.domain} ({policy.template})")
+        by_domain[policy.domain] = policy
+        prefixes.add(prefix)
+    return MappingProxyType(by_domain)
+
+_CACHE_POLICY_BY_DOMAIN = _index_cache_policies(_CACHE_POLICIES)
+
+# Especificações estáticas - construídas uma única vez no import e compartilhadas (somente leitura)
+_ARCHITECTURE = freeze({
+    "data_sources": {
+        "external_apis": [
+            DataSourceSpec(
+                name="CEPEA API",
+                type="REST API", 
+                data="Preços diários commodities",
+                frequency="daily",
+                reliability=0.98
+            ),
+            DataSourceSpec(
+                name="IMEA API",
+                type="REST API",
+                data="Relatórios regionais MT",
+                frequency="weekly", 
+                reliability=0.95
+            ),
+            DataSourceSpec(
+                name="INMET API",
+                type="REST API",
+                data="Dados meteorológicos",
+                frequency="hourly",
+                reliability=0.92
+            ),
+            DataSourceSpec(
+                name="BACEN API",
+                type="REST API",
+                data="Indicadores econômicos",
+                frequency="daily",
+                reliability=0.99
+            )
+        ],
+        "web_scraping": [
+            DataSourceSpec(
+                name="USDA Reports",
+                type="PDF + HTML scraping",
+                data="Relatórios globais",
+                frequency="weekly"
+            ),
+            DataSourceSpec(
+                name="Commodity News",
+                type="RSS + Web scraping", 
+                data="Notícias e análises",
+                frequency="real-time"
+            )
+        ],
+        "user_generated": [
+            DataSourceSpec(
+                name="WhatsApp Bot Interactions",
+                type="Message logs",
+                data="Consultas e feedback",
+                frequency="real-time"
+            )
+        ]
+    },
+    
+    "data_ingestion_layer": {
+        "stream_processing": {
+            "tool": "Apache Kafka + Kafka Connect",
+            "purpose": "Real-time data ingestion",
+            "capacity": "10k messages/second"
+        },
+        "batch_processing": {
+            "tool": "Apache Airflow",
+            "purpose": "Scheduled ETL jobs", 
+            "frequency": "Hourly, Daily, Weekly"
+        },
+        "api_gateway": {
+            "tool": "Kong + Rate Limiting",
+            "purpose": "Manage external API calls",
+            "features": ["rate limiting", "authentication", "monitoring"]
+        }
+    },
+    
+    "data_storage": {
+        "transactional_db": {
+            "technology": "PostgreSQL (Supabase)",
+            "purpose": "Application data, user data",
+            "size": "< 100GB initially"
+        },
+        "analytical_db": {
+            "technology": "ClickHouse or BigQuery",
+            "purpose": "Time series, analytics",
+            "size": "1TB+ projected"
+        },
+        "data_lake": {
+            "technology": "MinIO (S3 compatible)",
+            "purpose": "Raw data, backups",
+            "format": "Parquet + Delta Lake"
+        },
+        "cache": {
+            "technology": "Redis",
+            "purpose": "API responses, sessions",
+            "policies": _CACHE_POLICIES
+        }
+    },
+    
+    "data_processing": {
+        "stream_processing": {
+            "technology": "Apache Kafka Streams",
+            "use_cases": ["real-time aggregations", "alerts", "data validation"]
+        },
+        "batch_processing": {
+            "technology": "Apache Spark",
+            "use_cases": ["ETL", "ML feature engineering", "reports"]
+        },
+        "ml_pipeline": {
+            "technology": "Apache Airflow + MLflow",
+            "use_cases": ["model training", "prediction generation", "model monitoring"]
+        }
+    },
+    
+    "data_quality": {
+        "validation_framework": "Great Expectations",
+        "monitoring": "Datadog + custom metrics",
+        "alerting": "Slack + PagerDuty",
+        "data_lineage": "Apache Atlas"
+    }
+})
+
+_QUALITY_FRAMEWORK = freeze({
+    "data_validation_rules": {
+        "price_data": [
+            "Price values must be positive numbers",
+            "Price changes > 20% require manual validation",
+            "Missing values < 2% per commodity per month",
+            "Timestamps must be within expected business hours"
+        ],
+        "weather_data": [
+            "Temperature within plausible ranges (-10°C to 50°C)",
+            "Precipitation values >= 0",
+            "No gaps > 6 hours in hourly data",
+            "Geographic coordinates within Brazil bounds"
+        ],
+        "economic_data": [
+            "Exchange rates within historical ranges",
+            "Interest rates >= 0",
+            "No duplicate records for same date/indicator",
+            "Values updated within expected frequency"
+        ]
+    },
+    
+    "monitoring_metrics": {
+        "data_freshness": {
+            "price_data": "< 4 hours delay",
+            "weather_data": "< 2 hours delay", 
+            "economic_data": "< 24 hours delay"
+        },
+        "data_completeness": {
+            "target": "> 98% complete records",
+            "measurement": "Missing values / Total expected values"
+        },
+        "data_accuracy": {
+            "cross_validation": "Compare multiple sources",
+            "anomaly_detection": "Statistical outlier detection",
+            "manual_spot_checks": "Weekly manual validation"
+        }
+    },
+    
+    "automated_alerts": [
+        AlertRule(
+            trigger="Data pipeline failure",
+            action="Slack alert + PagerDuty",
+            escalation="30 minutes"
+        ),
+        AlertRule(
+            trigger="Data quality score < 95%",
+            action="Email to data team",
+            escalation="2 hours"
+        ),
+        AlertRule(
+            trigger="Data freshness > threshold",
+            action="Dashboard alert",
+            escalation="1 hour"
+        )
+    ],
+    
+    "data_lineage_tracking": {
+        "source_tracking": "Every data point traced to origin",
+        "transformation_logs": "All transformations recorded", 
+        "impact_analysis": "Downstream effects of changes",
+        "compliance": "LGPD compliance tracking"
+    }
+})
+
+_REALTIME_SPEC = freeze({
+    "stream_architecture": {
+        "message_broker": {
+            "technology": "Apache Kafka",
+            "topics": [
+                "raw-price-updates",
+                "weather-alerts", 
+                "economic-indicators",
+                "prediction-results",
+                "user-interactions"
+            ],
+            "partitioning": "By commodity/region",
+            "retention": "7 days for raw data"
+        },
+        
+        "stream_processors": [
+            StreamProcessorSpec(
+                name="Price Alert Processor",
+                input="raw-price-updates",
+                output="price-alerts", 
+                logic="Detect significant price changes (>5%)",
+                latency="< 1 second"
+            ),
+            StreamProcessorSpec(
+                name="Real-time Aggregator",
+                input="raw-price-updates",
+                output="aggregated-metrics",
+                logic="Calculate moving averages, volatility",
+                window="1h, 4h, 24h sliding windows"
+            ),
+            StreamProcessorSpec(
+                name="Weather Impact Processor", 
+                input="weather-alerts",
+                output="impact-assessments",
+                logic="Correlate weather events with commodity regions",
+                latency="< 5 seconds"
+            )
+        ]
+    },
+    
+    "real_time_features": [
+        "Live price updates on dashboard",
+        "Instant WhatsApp notifications for price alerts",
+        "Real-time model predictions", 
+        "Live market sentiment indicators",
+        "Breaking news impact analysis"
+    ],
+    
+    "performance_requirements": {
+        "throughput": "10,000 messages/second peak",
+        "latency": "< 100ms for critical alerts",
+        "availability": "99.9% uptime",
+        "scalability": "Auto-scale based on load"
+    }
+})
+
+_GOVERNANCE = freeze({
+    "data_classification": {
+        "public": "Market prices, public weather data",
+        "internal": "Processed analytics, user preferences", 
+        "confidential": "User personal data, trading strategies",
+        "restricted": "API keys, internal algorithms"
+    },
+    
+    "access_control": {
+        "role_based_access": {
+            "data_engineer": "Full access to pipelines and raw data",
+            "data_scientist": "Read access to processed data",
+            "business_analyst": "Access to aggregated analytics",
+            "api_user": "Limited access via rate-limited APIs"
+        },
+        "data_masking": "PII data masked in non-production environments",
+        "audit_logging": "All data access logged and monitored"
+    },
+    
+    "compliance": {
+        "lgpd_compliance": {
+            "data_subject_rights": "User data deletion/export APIs",
+            "consent_management": "Explicit consent for data collection",
+            "breach_notification": "24-hour breach notification process"
+        },
+        "data_retention": {
+            "raw_data": "2 years retention",
+            "processed_analytics": "5 years retention", 
+            "user_personal_data": "Deleted upon request",
+            "audit_logs": "7 years retention"
+        }
+    },
+    
+    "data_catalog": {
+        "metadata_management": "Apache Atlas or custom solution",
+        "schema_registry": "Confluent Schema Registry",
+        "data_dictionary": "Documented business definitions",
+        "data_lineage": "End-to-end data flow documentation"
+    }
+})
+
+_DASHBOARD_SPEC = freeze({
+    "pipeline_health": {
+        "metrics": [
+            "Pipeline success rate (per pipeline)",
+            "Data processing latency", 
+            "Error rates and error types",
+            "Data volume trends"
+        ],
+        "visualizations": [
+            "Pipeline status heat map",
+            "Latency trends over time",
+            "Error distribution pie chart",
+            "Data volume line charts"
+        ]
+    },
+    
+    "data_quality": {
+        "metrics": [
+            "Data completeness scores",
+            "Data accuracy indicators",
+            "Schema validation results",
+            "Anomaly detection alerts"
+        ],
+        "visualizations": [
+            "Quality score gauge charts", 
+            "Completeness trend lines",
+            "Anomaly alert timeline",
+            "Source reliability scores"
+        ]
+    },
+    
+    "business_metrics": {
+        "metrics": [
+            "API response times",
+            "User query volumes",
+            "Prediction accuracy tracking",
+            "Cost per data source"
+        ],
+        "alerts": [
+            "Response time > 5 seconds",
+            "Query volume spikes", 
+            "Prediction accuracy drops",
+            "Cost threshold exceeded"
+        ]
+    }
+})
+
+# Pipelines ETL estáticos (imutáveis, compartilhados entre chamadas)
+# Pipeline de preços CEPEA
+_CEPEA_SOURCE = DataSource(
+    name="CEPEA",
+    url="https://cepea.esalq.usp.br/api/v1/prices",
+    frequency="daily",
+    format="JSON",
+    reliability=0.98,
+    latency_minutes=30
+)
+
+_CEPEA_PIPELINE = DataPipeline(
+    name="CEPEA_Price_Pipeline",
+    sources=(_CEPEA_SOURCE,),
+    transformations=(
+        "Extract daily commodity prices",
+        "Validate price ranges and formats",
+        "Convert currency if needed",
+        "Calculate price changes and trends", 
+        "Store in analytical database",
+        "Update cache for API responses",
+        "Trigger prediction model updates"
+    ),
+    destination="PostgreSQL + ClickHouse",
+    schedule="0 8 * * *",  # 8AM daily
+    monitoring=MappingProxyType({
+        "success_rate": "> 95%",
+        "latency": "< 5 minutes",
+        "data_freshness": "< 2 hours"
+    })
+)
+
+# Pipeline de dados meteorológicos
+_WEATHER_SOURCE = DataSource(
+    name="INMET",
+    url="https://apitempo.inmet.gov.br/token",
+    frequency="hourly", 
+    format="JSON",
+    reliability=0.92,
+    latency_minutes=15
+)
+
+_WEATHER_PIPELINE = DataPipeline(
+    name="Weather_Data_Pipeline",
+    sources=(_WEATHER_SOURCE,),
+    transformations=(
+        "Extract hourly weather data for agricultural regions",
+        "Calculate agricultural indices (precipitation, GDD)",
+        "Aggregate to daily/weekly summaries",
+        "Join with commodity production regions",
+        "Store time series data",
+        "Update ML features"
+    ),
+    destination="ClickHouse + Redis cache",
+    schedule="0 * * * *",  # Every hour
+    monitoring=MappingProxyType({
+        "success_rate": "> 90%",
+        "latency": "< 10 minutes", 
+        "data_coverage": "All major regions"
+    })
+)
+
+# Pipeline de indicadores econômicos
+_ECONOMIC_SOURCE = DataSource(
+    name="BACEN",
+    url="https://api.bcb.gov.br/dados/serie",
+    frequency="daily",
+    format="JSON", 
+    reliability=0.99,
+    latency_minutes=60
+)
+
+_ECONOMIC_PIPELINE = DataPipeline(
+    name="Economic_Indicators_Pipeline",
+    sources=(_ECONOMIC_SOURCE,),
+    transformations=(
+        "Extract key indicators (USD/BRL, SELIC, IPCA)",
+        "Calculate moving averages and trends",
+        "Normalize and scale indicators",
+        "Store historical time series",
+        "Update macro features for ML models"
+    ),
+    destination="PostgreSQL + ClickHouse",
+    schedule="0 10 * * *",  # 10AM daily
+    monitoring=MappingProxyType({
+        "success_rate": "> 99%",
+        "latency": "< 15 minutes",
+        "data_accuracy": "Validated against official sources"
+    })
+)
+
+_ETL_PIPELINES: Tuple[DataPipeline, ...] = (_CEPEA_PIPELINE, _WEATHER_PIPELINE, _ECONOMIC_PIPELINE)
+
+def _jsonable(obj: Any) -> Any:
+    """Converter specs congeladas (MappingProxyType, NamedTuple, dataclasses) em tipos JSON nativos"""
+    if isinstance(obj, Mapping):
+        return {key: _jsonable(value) for key, value in obj.items()}
+    if isinstance(obj, tuple) and hasattr(obj, "_fields"):
+        # NamedTuple vira objeto; campos opcionais ausentes são omitidos
+        return {key: _jsonable(value) for key, value in zip(obj._fields, obj) if value is not None}
+    if is_dataclass(obj):
+        return {f.name: _jsonable(getattr(obj, f.name)) for f in fields(obj)}
+    if isinstance(obj, (list, tuple)):
+        return [_jsonable(item) for item in obj]
+    return obj
+
+def _dumps_bytes(obj: Any) -> bytes:
+    return dumps_bytes(_jsonable(obj))
+
+# Especificações em JSON (UTF-8) prontas para respostas de API; serializadas
+# no primeiro uso, e não no import, para manter o import barato
+@functools.cache
+def _spec_json_bytes() -> Mapping[str, bytes]:
+    return MappingProxyType({
+        "architecture": _dumps_bytes(_ARCHITECTURE),
+        "quality_framework": _dumps_bytes(_QUALITY_FRAMEWORK),
+        "realtime_processing": _dumps_bytes(_REALTIME_SPEC),
+        "governance": _dumps_bytes(_GOVERNANCE),
+        "monitoring_dashboard": _dumps_bytes(_DASHBOARD_SPEC),
+        "etl_pipelines": _dumps_bytes(_ETL_PIPELINES),
+    })
 
 class DataEngineerAgent:
     """
@@ -53,453 +571,58 @@ class DataEngineerAgent:
             "Data Governance"
         ]
         
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(f"SPR.{self.agent_id}")
+        self.logger = _logger
         
-    def design_data_architecture(self) -> Dict[str, Any]:
+    def design_data_architecture(self) -> Mapping[str, Any]:
         """Projetar arquitetura de dados para SPR"""
         self.logger.info("🏗️ Projetando arquitetura de dados...")
-        
-        architecture = {
-            "data_sources": {
-                "external_apis": [
-                    {
-                        "name": "CEPEA API",
-                        "type": "REST API", 
-                        "data": "Preços diários commodities",
-                        "frequency": "daily",
-                        "reliability": 0.98
-                    },
-                    {
-                        "name": "IMEA API",
-                        "type": "REST API",
-                        "data": "Relatórios regionais MT",
-                        "frequency": "weekly", 
-                        "reliability": 0.95
-                    },
-                    {
-                        "name": "INMET API",
-                        "type": "REST API",
-                        "data": "Dados meteorológicos",
-                        "frequency": "hourly",
-                        "reliability": 0.92
-                    },
-                    {
-                        "name": "BACEN API",
-                        "type": "REST API",
-                        "data": "Indicadores econômicos",
-                        "frequency": "daily",
-                        "reliability": 0.99
-                    }
-                ],
-                "web_scraping": [
-                    {
-                        "name": "USDA Reports",
-                        "type": "PDF + HTML scraping",
-                        "data": "Relatórios globais",
-                        "frequency": "weekly"
-                    },
-                    {
-                        "name": "Commodity News",
-                        "type": "RSS + Web scraping", 
-                        "data": "Notícias e análises",
-                        "frequency": "real-time"
-                    }
-                ],
-                "user_generated": [
-                    {
-                        "name": "WhatsApp Bot Interactions",
-                        "type": "Message logs",
-                        "data": "Consultas e feedback",
-                        "frequency": "real-time"
-                    }
-                ]
-            },
-            
-            "data_ingestion_layer": {
-                "stream_processing": {
-                    "tool": "Apache Kafka + Kafka Connect",
-                    "purpose": "Real-time data ingestion",
-                    "capacity": "10k messages/second"
-                },
-                "batch_processing": {
-                    "tool": "Apache Airflow",
-                    "purpose": "Scheduled ETL jobs", 
-                    "frequency": "Hourly, Daily, Weekly"
-                },
-                "api_gateway": {
-                    "tool": "Kong + Rate Limiting",
-                    "purpose": "Manage external API calls",
-                    "features": ["rate limiting", "authentication", "monitoring"]
-                }
-            },
-            
-            "data_storage": {
-                "transactional_db": {
-                    "technology": "PostgreSQL (Supabase)",
-                    "purpose": "Application data, user data",
-                    "size": "< 100GB initially"
-                },
-                "analytical_db": {
-                    "technology": "ClickHouse or BigQuery",
-                    "purpose": "Time series, analytics",
-                    "size": "1TB+ projected"
-                },
-                "data_lake": {
-                    "technology": "MinIO (S3 compatible)",
-                    "purpose": "Raw data, backups",
-                    "format": "Parquet + Delta Lake"
-                },
-                "cache": {
-                    "technology": "Redis",
-                    "purpose": "API responses, sessions",
-                    "ttl": "5min - 24h depending on data"
-                }
-            },
-            
-            "data_processing": {
-                "stream_processing": {
-                    "technology": "Apache Kafka Streams",
-                    "use_cases": ["real-time aggregations", "alerts", "data validation"]
-                },
-                "batch_processing": {
-                    "technology": "Apache Spark",
-                    "use_cases": ["ETL", "ML feature engineering", "reports"]
-                },
-                "ml_pipeline": {
-                    "technology": "Apache Airflow + MLflow",
-                    "use_cases": ["model training", "prediction generation", "model monitoring"]
-                }
-            },
-            
-            "data_quality": {
-                "validation_framework": "Great Expectations",
-                "monitoring": "Datadog + custom metrics",
-                "alerting": "Slack + PagerDuty",
-                "data_lineage": "Apache Atlas"
-            }
-        }
-        
-        return architecture
+        return _ARCHITECTURE
     
     def create_etl_pipelines(self) -> List[DataPipeline]:
         """Criar pipelines ETL específicos"""
         self.logger.info("🔄 Criando pipelines ETL...")
-        
-        # Pipeline de preços CEPEA
-        cepea_source = DataSource(
-            name="CEPEA",
-            url="https://cepea.esalq.usp.br/api/v1/prices",
-            frequency="daily",
-            format="JSON",
-            reliability=0.98,
-            latency_minutes=30
-        )
-        
-        cepea_pipeline = DataPipeline(
-            name="CEPEA_Price_Pipeline",
-            sources=[cepea_source],
-            transformations=[
-                "Extract daily commodity prices",
-                "Validate price ranges and formats",
-                "Convert currency if needed",
-                "Calculate price changes and trends", 
-                "Store in analytical database",
-                "Update cache for API responses",
-                "Trigger prediction model updates"
-            ],
-            destination="PostgreSQL + ClickHouse",
-            schedule="0 8 * * *",  # 8AM daily
-            monitoring={
-                "success_rate": "> 95%",
-                "latency": "< 5 minutes",
-                "data_freshness": "< 2 hours"
-            }
-        )
-        
-        # Pipeline de dados meteorológicos
-        weather_source = DataSource(
-            name="INMET",
-            url="https://apitempo.inmet.gov.br/token",
-            frequency="hourly", 
-            format="JSON",
-            reliability=0.92,
-            latency_minutes=15
-        )
-        
-        weather_pipeline = DataPipeline(
-            name="Weather_Data_Pipeline",
-            sources=[weather_source],
-            transformations=[
-                "Extract hourly weather data for agricultural regions",
-                "Calculate agricultural indices (precipitation, GDD)",
-                "Aggregate to daily/weekly summaries",
-                "Join with commodity production regions",
-                "Store time series data",
-                "Update ML features"
-            ],
-            destination="ClickHouse + Redis cache",
-            schedule="0 * * * *",  # Every hour
-            monitoring={
-                "success_rate": "> 90%",
-                "latency": "< 10 minutes", 
-                "data_coverage": "All major regions"
-            }
-        )
-        
-        # Pipeline de indicadores econômicos
-        economic_source = DataSource(
-            name="BACEN",
-            url="https://api.bcb.gov.br/dados/serie",
-            frequency="daily",
-            format="JSON", 
-            reliability=0.99,
-            latency_minutes=60
-        )
-        
-        economic_pipeline = DataPipeline(
-            name="Economic_Indicators_Pipeline",
-            sources=[economic_source],
-            transformations=[
-                "Extract key indicators (USD/BRL, SELIC, IPCA)",
-                "Calculate moving averages and trends",
-                "Normalize and scale indicators",
-                "Store historical time series",
-                "Update macro features for ML models"
-            ],
-            destination="PostgreSQL + ClickHouse",
-            schedule="0 10 * * *",  # 10AM daily
-            monitoring={
-                "success_rate": "> 99%",
-                "latency": "< 15 minutes",
-                "data_accuracy": "Validated against official sources"
-            }
-        )
-        
-        return [cepea_pipeline, weather_pipeline, economic_pipeline]
+        return list(_ETL_PIPELINES)
     
-    def implement_data_quality_framework(self) -> Dict[str, Any]:
+    def implement_data_quality_framework(self) -> Mapping[str, Any]:
         """Implementar framework de qualidade de dados"""
         self.logger.info("✅ Implementando framework de qualidade...")
-        
-        return {
-            "data_validation_rules": {
-                "price_data": [
-                    "Price values must be positive numbers",
-                    "Price changes > 20% require manual validation",
-                    "Missing values < 2% per commodity per month",
-                    "Timestamps must be within expected business hours"
-                ],
-                "weather_data": [
-                    "Temperature within plausible ranges (-10°C to 50°C)",
-                    "Precipitation values >= 0",
-                    "No gaps > 6 hours in hourly data",
-                    "Geographic coordinates within Brazil bounds"
-                ],
-                "economic_data": [
-                    "Exchange rates within historical ranges",
-                    "Interest rates >= 0",
-                    "No duplicate records for same date/indicator",
-                    "Values updated within expected frequency"
-                ]
-            },
-            
-            "monitoring_metrics": {
-                "data_freshness": {
-                    "price_data": "< 4 hours delay",
-                    "weather_data": "< 2 hours delay", 
-                    "economic_data": "< 24 hours delay"
-                },
-                "data_completeness": {
-                    "target": "> 98% complete records",
-                    "measurement": "Missing values / Total expected values"
-                },
-                "data_accuracy": {
-                    "cross_validation": "Compare multiple sources",
-                    "anomaly_detection": "Statistical outlier detection",
-                    "manual_spot_checks": "Weekly manual validation"
-                }
-            },
-            
-            "automated_alerts": [
-                {
-                    "trigger": "Data pipeline failure",
-                    "action": "Slack alert + PagerDuty",
-                    "escalation": "30 minutes"
-                },
-                {
-                    "trigger": "Data quality score < 95%",
-                    "action": "Email to data team",
-                    "escalation": "2 hours"
-                },
-                {
-                    "trigger": "Data freshness > threshold",
-                    "action": "Dashboard alert",
-                    "escalation": "1 hour"
-                }
-            ],
-            
-            "data_lineage_tracking": {
-                "source_tracking": "Every data point traced to origin",
-                "transformation_logs": "All transformations recorded", 
-                "impact_analysis": "Downstream effects of changes",
-                "compliance": "LGPD compliance tracking"
-            }
-        }
+        return _QUALITY_FRAMEWORK
     
-    def design_realtime_processing(self) -> Dict[str, Any]:
+    def design_realtime_processing(self) -> Mapping[str, Any]:
         """Projetar processamento de dados em tempo real"""
         self.logger.info("⚡ Projetando processamento em tempo real...")
-        
-        return {
-            "stream_architecture": {
-                "message_broker": {
-                    "technology": "Apache Kafka",
-                    "topics": [
-                        "raw-price-updates",
-                        "weather-alerts", 
-                        "economic-indicators",
-                        "prediction-results",
-                        "user-interactions"
-                    ],
-                    "partitioning": "By commodity/region",
-                    "retention": "7 days for raw data"
-                },
-                
-                "stream_processors": [
-                    {
-                        "name": "Price Alert Processor",
-                        "input": "raw-price-updates",
-                        "output": "price-alerts", 
-                        "logic": "Detect significant price changes (>5%)",
-                        "latency": "< 1 second"
-                    },
-                    {
-                        "name": "Real-time Aggregator",
-                        "input": "raw-price-updates",
-                        "output": "aggregated-metrics",
-                        "logic": "Calculate moving averages, volatility",
-                        "window": "1h, 4h, 24h sliding windows"
-                    },
-                    {
-                        "name": "Weather Impact Processor", 
-                        "input": "weather-alerts",
-                        "output": "impact-assessments",
-                        "logic": "Correlate weather events with commodity regions",
-                        "latency": "< 5 seconds"
-                    }
-                ]
-            },
-            
-            "real_time_features": [
-                "Live price updates on dashboard",
-                "Instant WhatsApp notifications for price alerts",
-                "Real-time model predictions", 
-                "Live market sentiment indicators",
-                "Breaking news impact analysis"
-            ],
-            
-            "performance_requirements": {
-                "throughput": "10,000 messages/second peak",
-                "latency": "< 100ms for critical alerts",
-                "availability": "99.9% uptime",
-                "scalability": "Auto-scale based on load"
-            }
-        }
+        return _REALTIME_SPEC
     
-    def create_data_governance_framework(self) -> Dict[str, Any]:
+    def create_data_governance_framework(self) -> Mapping[str, Any]:
         """Criar framework de governança de dados"""
-        return {
-            "data_classification": {
-                "public": "Market prices, public weather data",
-                "internal": "Processed analytics, user preferences", 
-                "confidential": "User personal data, trading strategies",
-                "restricted": "API keys, internal algorithms"
-            },
-            
-            "access_control": {
-                "role_based_access": {
-                    "data_engineer": "Full access to pipelines and raw data",
-                    "data_scientist": "Read access to processed data",
-                    "business_analyst": "Access to aggregated analytics",
-                    "api_user": "Limited access via rate-limited APIs"
-                },
-                "data_masking": "PII data masked in non-production environments",
-                "audit_logging": "All data access logged and monitored"
-            },
-            
-            "compliance": {
-                "lgpd_compliance": {
-                    "data_subject_rights": "User data deletion/export APIs",
-                    "consent_management": "Explicit consent for data collection",
-                    "breach_notification": "24-hour breach notification process"
-                },
-                "data_retention": {
-                    "raw_data": "2 years retention",
-                    "processed_analytics": "5 years retention", 
-                    "user_personal_data": "Deleted upon request",
-                    "audit_logs": "7 years retention"
-                }
-            },
-            
-            "data_catalog": {
-                "metadata_management": "Apache Atlas or custom solution",
-                "schema_registry": "Confluent Schema Registry",
-                "data_dictionary": "Documented business definitions",
-                "data_lineage": "End-to-end data flow documentation"
-            }
-        }
+        return _GOVERNANCE
     
-    def generate_monitoring_dashboard(self) -> Dict[str, Any]:
+    def generate_monitoring_dashboard(self) -> Mapping[str, Any]:
         """Especificar dashboard de monitoramento de dados"""
-        return {
-            "pipeline_health": {
-                "metrics": [
-                    "Pipeline success rate (per pipeline)",
-                    "Data processing latency", 
-                    "Error rates and error types",
-                    "Data volume trends"
-                ],
-                "visualizations": [
-                    "Pipeline status heat map",
-                    "Latency trends over time",
-                    "Error distribution pie chart",
-                    "Data volume line charts"
-                ]
-            },
-            
-            "data_quality": {
-                "metrics": [
-                    "Data completeness scores",
-                    "Data accuracy indicators",
-                    "Schema validation results",
-                    "Anomaly detection alerts"
-                ],
-                "visualizations": [
-                    "Quality score gauge charts", 
-                    "Completeness trend lines",
-                    "Anomaly alert timeline",
-                    "Source reliability scores"
-                ]
-            },
-            
-            "business_metrics": {
-                "metrics": [
-                    "API response times",
-                    "User query volumes",
-                    "Prediction accuracy tracking",
-                    "Cost per data source"
-                ],
-                "alerts": [
-                    "Response time > 5 seconds",
-                    "Query volume spikes", 
-                    "Prediction accuracy drops",
-                    "Cost threshold exceeded"
-                ]
-            }
-        }
+        return _DASHBOARD_SPEC
+    
+    def get_cache_policy(self, domain: str) -> CacheKeyPolicy:
+        """Política de cache do domínio (KeyError se não definida)"""
+        return _CACHE_POLICY_BY_DOMAIN[domain]
+    
+    def get_spec_bytes(self, name: str) -> bytes:
+        """JSON pré-serializado de uma especificação estática (ver _spec_json_bytes)"""
+        return _spec_json_bytes()[name]
+    
+    def get_architecture_bytes(self) -> bytes:
+        """JSON pré-serializado da arquitetura de dados"""
+        return _spec_json_bytes()["architecture"]
+    
+    def get_pipeline_spec_bytes(self) -> bytes:
+        """JSON pré-serializado dos pipelines ETL"""
+        return _spec_json_bytes()["etl_pipelines"]
 
 if __name__ == "__main__":
+    if "--selftest" not in sys.argv:
+        print(f"Uso: python {sys.argv[0]} --selftest")
+        sys.exit(0)
+    
+    logging.basicConfig(level=logging.INFO)
     agent = DataEngineerAgent()
     
     # Testar funcionalidades
@@ -513,6 +636,6 @@ if __name__ == "__main__":
     print(f"✅ Qualidade: {len(quality_framework['data_validation_rules'])} categorias de validação")
     
     realtime_processing = agent.design_realtime_processing()
-    print(f"⚡ Tempo real: {len(realtime_processing['stream_architecture']['topics'])} tópicos Kafka")
+    print(f"⚡ Tempo real: {len(realtime_processing['stream_architecture']['message_broker']['topics'])} tópicos Kafka")
     
-    print(f"\n🎯 {agent.agent_name} - Operacional!")
\ No newline at end of file
+    print(f"\n🎯 {agent.agent_name} - Operacional!")
@@ -4,32 +4,510 @@
 SPR Sistema Preditivo Royal
 """
 
+import hashlib
+import io
 import json
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import re
+import sys
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Sequence, TextIO, Tuple
 from dataclasses import dataclass
-from pathlib import Path
 
-@dataclass
+from ai_agents._common import freeze
+
+@dataclass(slots=True, frozen=True, eq=False)
 class DatabaseSchema:
-    """Schema de banco de dados"""
+    """Schema de banco de dados (igualdade e hash por identidade; campos são mappingproxy)"""
     name: str
-    tables: List[Dict[str, Any]]
-    views: List[Dict[str, Any]]
-    functions: List[Dict[str, Any]]
-    policies: List[Dict[str, Any]]
-    indexes: List[Dict[str, Any]]
+    tables: Sequence[Mapping[str, Any]]
+    views: Sequence[Mapping[str, Any]]
+    functions: Sequence[Mapping[str, Any]]
+    policies: Sequence[Mapping[str, Any]]
+    indexes: Sequence[Mapping[str, Any]]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RLSPolicy:
     """Row Level Security Policy"""
     table: str
     policy_name: str
     command: str  # SELECT, INSERT, UPDATE, DELETE
-    roles: List[str]
+    roles: Tuple[str, ...]
     using_expression: str
     with_check_expression: Optional[str] = None
+    
+    def __post_init__(self):
+        # table/command se repetem entre políticas: compartilhar a mesma string
+        object.__setattr__(self, "table", sys.intern(self.table))
+        object.__setattr__(self, "command", sys.intern(self.command))
+
+_logger = logging.getLogger("SPR.database-engineer")
+
+# Schema SPR - construído uma única vez no import e compartilhado (somente leitura)
+_SPR_TABLES = freeze([
+    {
+        "name": "users",
+        "columns": [
+            {"name": "id", "type": "uuid", "primary_key": True, "default": "uuidv7()"},
+            {"name": "email", "type": "text", "unique": True, "not_null": True},
+            {"name": "name", "type": "text", "not_null": True},
+            {"name": "role", "type": "user_role", "default": "'user'"},
+            {"name": "created_at", "type": "timestamp", "default": "now()"},
+            {"name": "last_login", "type": "timestamp"},
+            {"name": "is_active", "type": "boolean", "default": True}
+        ],
+        "rls_enabled": True
+    },
+    {
+        "name": "commodities",
+        "columns": [
+            {"name": "id", "type": "uuid", "primary_key": True, "default": "uuidv7()"},
+            {"name": "symbol", "type": "text", "unique": True, "not_null": True},
+            {"name": "name", "type": "text", "not_null": True},
+            {"name": "category", "type": "commodity_category", "not_null": True},
+            {"name": "unit", "type": "text", "not_null": True},
+            {"name": "is_active", "type": "boolean", "default": True},
+            {"name": "created_at", "type": "timestamp", "default": "now()"}
+        ],
+        "rls_enabled": False
+    },
+    {
+        "name": "price_data",
+        "columns": [
+            {"name": "id", "type": "uuid", "not_null": True, "default": "uuidv7()"},
+            {"name": "commodity_id", "type": "uuid", "foreign_key": "commodities(id)", "not_null": True},
+            {"name": "source", "type": "text", "not_null": True},
+            {"name": "price", "type": "decimal(10,2)", "not_null": True},
+            {"name": "date", "type": "date", "not_null": True},
+            {"name": "location", "type": "text"},
+            {"name": "quality_grade", "type": "text"},
+            {"name": "created_at", "type": "timestamp", "default": "now()"}
+        ],
+        "indexes": [
+            # Cobre a ordem de latest_prices_view/get_price_trend: index-only scan, sem sort
+            {"name": "cid_date_desc", "columns": "commodity_id, date DESC",
+             "include": "price, source, location"},
+            # Série temporal append-only: BRIN é ordens de grandeza menor que BTREE
+            {"column": "date", "type": "brin", "opts": "pages_per_range=32"}
+        ],
+        # Hypertable TimescaleDB por date: chaves únicas precisam incluir a coluna de tempo
+        "primary_key": ["id", "date"],
+        "hypertable": {"time_column": "date", "chunk_time_interval": "7 days"},
+        "rls_enabled": False
+    },
+    {
+        "name": "predictions",
+        "columns": [
+            {"name": "id", "type": "uuid", "primary_key": True, "default": "uuidv7()"},
+            {"name": "commodity_id", "type": "uuid", "foreign_key": "commodities(id)", "not_null": True},
+            {"name": "model_version", "type": "text", "not_null": True},
+            {"name": "prediction_date", "type": "date", "not_null": True},
+            {"name": "target_date", "type": "date", "not_null": True},
+            {"name": "predicted_price", "type": "decimal(10,2)", "not_null": True},
+            {"name": "confidence_score", "type": "decimal(3,2)"},
+            {"name": "factors", "type": "jsonb", "gin_path_ops": True},
+            {"name": "created_at", "type": "timestamp", "default": "now()"}
+        ],
+        "indexes": [
+            {"column": "commodity_id"},
+            {"column": "prediction_date", "type": "brin", "opts": "pages_per_range=32"},
+            {"column": "target_date", "type": "brin", "opts": "pages_per_range=32"}
+        ],
+        "rls_enabled": True
+    },
+    {
+        "name": "whatsapp_sessions",
+        "columns": [
+            {"name": "id", "type": "uuid", "primary_key": True, "default": "uuidv7()"},
+            {"name": "phone_number", "type": "text", "not_null": True},
+            {"name": "session_data", "type": "jsonb", "gin_path_ops": True},
+            {"name": "last_message_at", "type": "timestamp"},
+            {"name": "is_active", "type": "boolean", "default": True},
+            {"name": "created_at", "type": "timestamp", "default": "now()"}
+        ],
+        "rls_enabled": True
+    }
+])
+
+_SPR_VIEWS = freeze([
+    {
+        "name": "latest_prices_view",
+        "materialized": True,
+        "mlog_sources": ["price_data"],
+        "definition": """
+        CREATE MATERIALIZED VIEW latest_prices_view AS
+        SELECT DISTINCT ON (commodity_id) 
+            commodity_id,
+            price,
+            date,
+            source,
+            location
+        FROM price_data 
+        ORDER BY commodity_id, date DESC
+        WITH DATA;
+        -- Índice único exigido por REFRESH MATERIALIZED VIEW CONCURRENTLY
+        CREATE UNIQUE INDEX idx_latest_prices_view_commodity ON latest_prices_view (commodity_id);
+        """
+    },
+    {
+        "name": "prediction_accuracy_view", 
+        "materialized": True,
+        "mlog_sources": ["predictions", "price_data", "commodities"],
+        "definition": """
+        CREATE MATERIALIZED VIEW prediction_accuracy_view AS
+        SELECT 
+            p.commodity_id,
+            c.symbol,
+            p.model_version,
+            AVG(ABS(p.predicted_price - pd.price)) as avg_error,
+            COUNT(*) as total_predictions
+        FROM predictions p
+        JOIN commodities c ON p.commodity_id = c.id
+        JOIN price_data pd ON p.commodity_id = pd.commodity_id 
+            AND p.target_date = pd.date
+        GROUP BY p.commodity_id, c.symbol, p.model_version
+        WITH DATA;
+        -- symbol depende de commodity_id, então (commodity_id, model_version) é único
+        CREATE UNIQUE INDEX idx_prediction_accuracy_view_model
+            ON prediction_accuracy_view (commodity_id, model_version);
+        """
+    },
+    {
+        "name": "price_data_weekly",
+        "continuous": True,
+        "definition": """
+        -- Agregado contínuo TimescaleDB: refresh incremental automático por política
+        CREATE MATERIALIZED VIEW price_data_weekly
+        WITH (timescaledb.continuous) AS
+        SELECT
+            commodity_id,
+            time_bucket(INTERVAL '7 days', date) AS bucket,
+            first(price, date) AS open_price,
+            max(price) AS high_price,
+            min(price) AS low_price,
+            last(price, date) AS close_price,
+            COUNT(*) AS samples
+        FROM price_data
+        GROUP BY commodity_id, bucket
+        WITH NO DATA;
+        SELECT add_continuous_aggregate_policy('price_data_weekly',
+            start_offset => INTERVAL '1 month',
+            end_offset => INTERVAL '1 day',
+            schedule_interval => INTERVAL '1 hour');
+        """
+    }
+])
+
+_SPR_FUNCTIONS = freeze([
+    {
+        "name": "auth_has_role",
+        "definition": """
+        -- Checagem de papel compartilhada pelas políticas RLS: um único plano em cache
+        -- em vez de reanalisar o EXISTS (SELECT 1 FROM users ...) em cada política
+        CREATE OR REPLACE FUNCTION auth_has_role(p_roles user_role[])
+        RETURNS boolean AS $$
+            SELECT EXISTS (
+                SELECT 1 FROM users WHERE id = auth.uid() AND role = ANY(p_roles)
+            );
+        $$ LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public;
+        
+        CREATE OR REPLACE FUNCTION auth_is_admin()
+        RETURNS boolean AS $$
+            SELECT auth_has_role(ARRAY['admin']::user_role[]);
+        $$ LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public;
+        """
+    },
+    {
+        "name": "get_price_trend",
+        "definition": """
+        CREATE OR REPLACE FUNCTION get_price_trend(
+            p_commodity_id uuid,
+            p_days integer DEFAULT 30
+        )
+        RETURNS TABLE(
+            trend_direction text,
+            price_change decimal,
+            percentage_change decimal
+        ) AS $$
+        BEGIN
+            RETURN QUERY
+            -- Uma única varredura do intervalo (commodity_id, date) com funções de janela
+            WITH price_window AS (
+                SELECT
+                    FIRST_VALUE(price) OVER (ORDER BY date DESC) AS current_price,
+                    FIRST_VALUE(price) OVER (ORDER BY date ASC) AS past_price
+                FROM price_data
+                WHERE commodity_id = p_commodity_id
+                  AND date >= CURRENT_DATE - p_days
+                LIMIT 1
+            )
+            SELECT 
+                CASE 
+                    WHEN current_price > past_price THEN 'UP'
+                    WHEN current_price < past_price THEN 'DOWN'
+                    ELSE 'STABLE'
+                END,
+                current_price - past_price,
+                ROUND(((current_price - past_price) / NULLIF(past_price, 0) * 100), 2)
+            FROM price_window;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    }
+])
+
+# Políticas RLS por tabela: uma política por comando em "ops", nome formatado com {op}.
+# Checagens de papel usam (SELECT auth_*()) para avaliar a função uma vez por query.
+_RLS_TEMPLATES = freeze([
+    {"table": "users", "name": "users_{op}_own", "ops": ["SELECT", "UPDATE"],
+     "using": "auth.uid() = id"},
+    {"table": "predictions", "name": "predictions_{op}_all", "ops": ["SELECT"],
+     "using": "true"},
+    {"table": "predictions", "name": "predictions_{op}_admin", "ops": ["INSERT"],
+     "using": "(SELECT auth_is_admin())"},
+    {"table": "whatsapp_sessions", "name": "whatsapp_admin_only", "ops": ["ALL"],
+     "using": "(SELECT auth_has_role(ARRAY['admin', 'operator']::user_role[]))"},
+])
+
+# Cabeçalho fixo do script de migração (extensões e tipos customizados)
+_MIGRATION_HEADER = """
+-- Migration: SPR Database Schema
+-- Generated: {generated}
+-- Database: {name}
+
+-- Enable required extensions
+CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS timescaledb;
+
+-- UUIDv7 (ordenado por tempo): inserts vão para a folha mais à direita da PK
+-- 48 bits de timestamp Unix em ms sobre um v4 aleatório, com a versão ajustada para 7
+CREATE OR REPLACE FUNCTION uuidv7() RETURNS uuid AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(uuid_send(gen_random_uuid())
+                        PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                        FROM 1 FOR 6),
+                52, 1),
+            53, 1),
+        'hex')::uuid;
+$$ LANGUAGE sql VOLATILE;
+
+-- Sessões compatíveis com pool (PgBouncer): transações ociosas não seguram
+-- VACUUM/REFRESH CONCURRENTLY e queries descontroladas não saturam o pool
+ALTER DATABASE {name} SET idle_in_transaction_session_timeout = '60s';
+ALTER DATABASE {name} SET statement_timeout = '30s';
+ALTER DATABASE {name} SET lock_timeout = '2s';
+
+-- Create custom types
+CREATE TYPE user_role AS ENUM ('admin', 'operator', 'user');
+CREATE TYPE commodity_category AS ENUM ('grains', 'livestock', 'energy', 'metals');
+
+"""
+
+# Pool de conexões: limite de alerta e template PgBouncer (modo transaction)
+_POOL_USAGE_WARN_PERCENT = 80
+_PGBOUNCER_INI = """[databases]
+spr_production = host=127.0.0.1 port=5432 dbname=spr_production
+
+[pgbouncer]
+pool_mode = transaction
+default_pool_size = 25
+max_client_conn = 500
+server_idle_timeout = 60
+"""
+
+# Modificadores de coluna, na ordem em que aparecem no DDL: (flag, formatter)
+_COL_FLAGS = (
+    ("primary_key", lambda v: " PRIMARY KEY"),
+    ("unique", lambda v: " UNIQUE"),
+    ("not_null", lambda v: " NOT NULL"),
+    ("default", lambda v: f" DEFAULT {v}"),
+    ("foreign_key", lambda v: f" REFERENCES {v}"),
+)
+
+def _render_column(col: Mapping[str, Any]) -> str:
+    """Renderizar a definição SQL de uma coluna"""
+    col_def = f"    {col['name']} {col['type']}"
+    for flag, fmt in _COL_FLAGS:
+        value = col.get(flag)
+        if value:
+            col_def += fmt(value)
+    return col_def
+
+def _render_mlog(table: Mapping[str, Any], pk_cols: Sequence[str] = ("id",)) -> str:
+    """
+    Renderizar log de alterações (mlog) + trigger de captura para uma tabela
+    
+    Cada linha guarda o xid da transação que a gravou (change_xid): o refresh usa um
+    watermark por xid porque now()/sequências são atribuídos antes do commit, e uma
+    transação ainda aberta durante o refresh gravaria linhas "no passado".
+    """
+    name = table['name']
+    log_cols = [col for col in table['columns'] if col['name'] in pk_cols] + \
+               [col for col in table['columns'] if col['name'] not in pk_cols]
+    col_names = ", ".join(col['name'] for col in log_cols)
+    
+    def values(row: str) -> str:
+        return ", ".join(f"{row}.{col['name']}" for col in log_cols)
+    
+    col_defs = "".join(f"    {col['name']} {col['type']},\n" for col in log_cols)
+    return f"""
+-- Materialized view log: {name}
+CREATE TABLE mlog$_{name} (
+    seq bigserial PRIMARY KEY,
+    dmltype char(1) NOT NULL,
+    old_new char(3) NOT NULL,
+{col_defs}    change_xid xid8 NOT NULL DEFAULT pg_current_xact_id(),
+    change_ts timestamptz NOT NULL DEFAULT clock_timestamp()
+);
+CREATE INDEX idx_mlog$_{name}_change_xid ON mlog$_{name}(change_xid);
+
+CREATE OR REPLACE FUNCTION _mlog_capture_{name}() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO mlog$_{name} (dmltype, old_new, {col_names})
+        VALUES (left(TG_OP, 1), 'OLD', {values("OLD")});
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO mlog$_{name} (dmltype, old_new, {col_names})
+        VALUES (left(TG_OP, 1), 'NEW', {values("NEW")});
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER mlog_capture_{name}
+    AFTER INSERT OR UPDATE OR DELETE ON {name}
+    FOR EACH ROW EXECUTE FUNCTION _mlog_capture_{name}();
+"""
+
+def _refresh_if_changed_func(view_name: str) -> str:
+    """Nome da função de refresh condicionado a delta de uma view com mlog"""
+    return f"refresh_{view_name.removesuffix('_view')}_if_changed"
+
+def _render_refresh_if_changed(view: Mapping[str, Any]) -> str:
+    """
+    Renderizar função que faz o REFRESH CONCURRENTLY completo só quando há delta nos mlogs
+    
+    O watermark é o xmin do snapshot tomado antes do refresh: toda transação com xid menor
+    já terminou e está visível para o refresh. Linhas de transações ainda abertas ficam
+    acima do watermark e disparam o próximo refresh (no pior caso, um refresh a mais).
+    """
+    name = view['name']
+    has_delta = " OR ".join(
+        f"EXISTS (SELECT 1 FROM mlog$_{src} WHERE change_xid >= v_last)"
+        for src in view['mlog_sources']
+    )
+    purge = "".join(
+        f"    DELETE FROM mlog$_{src} WHERE change_xid < "
+        f"(SELECT min(consumed_xmin) FROM mlog_refresh_state);\n"
+        for src in view['mlog_sources']
+    )
+    return f"""
+INSERT INTO mlog_refresh_state (view_name) VALUES ('{name}');
+
+CREATE OR REPLACE FUNCTION {_refresh_if_changed_func(name)}() RETURNS boolean AS $$
+DECLARE
+    v_xmin xid8;
+    v_last xid8;
+BEGIN
+    SELECT consumed_xmin INTO v_last FROM mlog_refresh_state
+    WHERE view_name = '{name}' FOR UPDATE;
+    IF NOT ({has_delta}) THEN
+        RETURN false;
+    END IF;
+    v_xmin := pg_snapshot_xmin(pg_current_snapshot());
+    REFRESH MATERIALIZED VIEW CONCURRENTLY {name};
+    UPDATE mlog_refresh_state SET consumed_xmin = v_xmin WHERE view_name = '{name}';
+    -- Descartar linhas de log já consumidas por todas as views
+{purge}    RETURN true;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+_MLOG_STATE_TABLE = """
+-- Watermark (xid) dos mlogs já refletidos em cada view materializada
+CREATE TABLE mlog_refresh_state (
+    view_name text PRIMARY KEY,
+    consumed_xmin xid8 NOT NULL DEFAULT '0'
+);
+"""
+
+# Tokens SQL relevantes para a análise de queries lentas (case-insensitive)
+_QUERY_TOKENS = re.compile(
+    r"(?P<order_by>\bORDER\s+BY\b)|(?P<limit>\bLIMIT\b)|(?P<join>\bJOIN\b)"
+    r"|(?P<where>\bWHERE\b)|(?P<select_star>\bSELECT\s+\*)",
+    re.IGNORECASE,
+)
+_QUERY_RULES = (
+    ("order_by", "limit", "Adicionar LIMIT para evitar ordenação completa da tabela"),
+    ("join", "where", "Adicionar condições WHERE antes dos JOINs"),
+    ("select_star", None, "Especificar apenas as colunas necessárias"),
+)
+
+# Tamanho máximo de cada cache de memoização do DatabaseAgent
+_CACHE_MAXSIZE = 32
+
+def _requirements_key(requirements: Mapping[str, Any]) -> bytes:
+    """Hash estável dos requisitos de negócio (chave de cache)"""
+    payload = json.dumps(requirements, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+def _cache_put(cache: Dict[Any, Any], key: Any, value: Any) -> None:
+    """Inserir no cache descartando a entrada mais antiga quando cheio"""
+    if len(cache) >= _CACHE_MAXSIZE:
+        del cache[next(iter(cache))]
+    cache[key] = value
+
+def _render_index(table_name: str, index: Mapping[str, Any]) -> str:
+    """Renderizar CREATE INDEX (btree por padrão; "type" escolhe o método, ex.: brin)"""
+    columns = index.get('columns') or index['column']
+    name = index.get('name') or index['column']
+    method = f" USING {index['type']} " if index.get('type') else ""
+    include = f" INCLUDE ({index['include']})" if index.get('include') else ""
+    opts = f" WITH ({index['opts']})" if index.get('opts') else ""
+    return f"CREATE INDEX idx_{table_name}_{name} ON {table_name}{method}({columns}){include}{opts};\n"
+
+def _render_table(table: Mapping[str, Any]) -> str:
+    """Renderizar CREATE TABLE + RLS + índices de uma tabela"""
+    name = table['name']
+    columns = [_render_column(col) for col in table['columns']]
+    if table.get('primary_key'):
+        columns.append(f"    PRIMARY KEY ({', '.join(table['primary_key'])})")
+    columns = ",\n".join(columns)
+    parts = [f"\n-- Create table: {name}\nCREATE TABLE {name} (\n{columns}\n);\n"]
+    
+    # Converter em hypertable (chunks por tempo); índices vêm da spec, não os padrão
+    hypertable = table.get('hypertable')
+    if hypertable:
+        parts.append(
+            f"SELECT create_hypertable('{name}', '{hypertable['time_column']}', "
+            f"chunk_time_interval => INTERVAL '{hypertable['chunk_time_interval']}', "
+            f"create_default_indexes => false);\n"
+        )
+    
+    # Enable RLS se necessário
+    if table.get('rls_enabled'):
+        parts.append(f"\nALTER TABLE {name} ENABLE ROW LEVEL SECURITY;\n")
+    
+    # Criar índices
+    for index in table.get('indexes', ()):
+        parts.append(_render_index(name, index))
+    
+    # Índices GIN parciais para filtros JSONB por containment (@>); linhas NULL ficam fora
+    for col in table['columns']:
+        if col.get('gin_path_ops'):
+            parts.append(
+                f"CREATE INDEX idx_{name}_{col['name']}_gin "
+                f"ON {name} USING GIN ({col['name']} jsonb_path_ops) "
+                f"WHERE {col['name']} IS NOT NULL;\n"
+            )
+    return "".join(parts)
+
+# DDL das tabelas SPR renderizado uma vez (chave: id da tabela constante, sempre viva)
+_TABLE_SQL: Mapping[int, str] = MappingProxyType({id(table): _render_table(table) for table in _SPR_TABLES})
 
 class DatabaseAgent:
     """
@@ -53,9 +531,21 @@ class DatabaseAgent:
             "Backup & Recovery"
         ]
         
-        # Setup logging
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(f"SPR.{self.agent_id}")
+        self.logger = _logger
+        
+        # Memoização: schema por hash dos requisitos; políticas/migração por instância de schema
+        self._schema_cache: Dict[bytes, DatabaseSchema] = {}
+        self._policy_cache: Dict[int, Tuple[DatabaseSchema, Tuple[RLSPolicy, ...]]] = {}
+        self._migration_cache: Dict[int, Tuple[DatabaseSchema, str]] = {}
+        
+        # Timestamp do cabeçalho da migração, fixo por agente (saída determinística)
+        self._gen_ts = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    
+    def refresh_timestamp(self) -> str:
+        """Renovar o timestamp de geração (descarta migrações memoizadas)"""
+        self._gen_ts = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self._migration_cache.clear()
+        return self._gen_ts
         
     def analyze_schema_requirements(self, business_requirements: Dict[str, Any]) -> DatabaseSchema:
         """
@@ -63,214 +553,51 @@ class DatabaseAgent:
         """
         self.logger.info("🔍 Analisando requisitos para design do schema...")
         
-        # Análise baseada nos requisitos do SPR
-        spr_tables = [
-            {
-                "name": "users",
-                "columns": [
-                    {"name": "id", "type": "uuid", "primary_key": True, "default": "gen_random_uuid()"},
-                    {"name": "email", "type": "text", "unique": True, "not_null": True},
-                    {"name": "name", "type": "text", "not_null": True},
-                    {"name": "role", "type": "user_role", "default": "'user'"},
-                    {"name": "created_at", "type": "timestamp", "default": "now()"},
-                    {"name": "last_login", "type": "timestamp"},
-                    {"name": "is_active", "type": "boolean", "default": True}
-                ],
-                "rls_enabled": True
-            },
-            {
-                "name": "commodities",
-                "columns": [
-                    {"name": "id", "type": "uuid", "primary_key": True, "default": "gen_random_uuid()"},
-                    {"name": "symbol", "type": "text", "unique": True, "not_null": True},
-                    {"name": "name", "type": "text", "not_null": True},
-                    {"name": "category", "type": "commodity_category", "not_null": True},
-                    {"name": "unit", "type": "text", "not_null": True},
-                    {"name": "is_active", "type": "boolean", "default": True},
-                    {"name": "created_at", "type": "timestamp", "default": "now()"}
-                ],
-                "rls_enabled": False
-            },
-            {
-                "name": "price_data",
-                "columns": [
-                    {"name": "id", "type": "uuid", "primary_key": True, "default": "gen_random_uuid()"},
-                    {"name": "commodity_id", "type": "uuid", "foreign_key": "commodities(id)", "not_null": True},
-                    {"name": "source", "type": "text", "not_null": True},
-                    {"name": "price", "type": "decimal(10,2)", "not_null": True},
-                    {"name": "date", "type": "date", "not_null": True},
-                    {"name": "location", "type": "text"},
-                    {"name": "quality_grade", "type": "text"},
-                    {"name": "created_at", "type": "timestamp", "default": "now()"}
-                ],
-                "indexes": ["commodity_id", "date", "source"],
-                "rls_enabled": False
-            },
-            {
-                "name": "predictions",
-                "columns": [
-                    {"name": "id", "type": "uuid", "primary_key": True, "default": "gen_random_uuid()"},
-                    {"name": "commodity_id", "type": "uuid", "foreign_key": "commodities(id)", "not_null": True},
-                    {"name": "model_version", "type": "text", "not_null": True},
-                    {"name": "prediction_date", "type": "date", "not_null": True},
-                    {"name": "target_date", "type": "date", "not_null": True},
-                    {"name": "predicted_price", "type": "decimal(10,2)", "not_null": True},
-                    {"name": "confidence_score", "type": "decimal(3,2)"},
-                    {"name": "factors", "type": "jsonb"},
-                    {"name": "created_at", "type": "timestamp", "default": "now()"}
-                ],
-                "indexes": ["commodity_id", "prediction_date", "target_date"],
-                "rls_enabled": True
-            },
-            {
-                "name": "whatsapp_sessions",
-                "columns": [
-                    {"name": "id", "type": "uuid", "primary_key": True, "default": "gen_random_uuid()"},
-                    {"name": "phone_number", "type": "text", "not_null": True},
-                    {"name": "session_data", "type": "jsonb"},
-                    {"name": "last_message_at", "type": "timestamp"},
-                    {"name": "is_active", "type": "boolean", "default": True},
-                    {"name": "created_at", "type": "timestamp", "default": "now()"}
-                ],
-                "rls_enabled": True
-            }
-        ]
-        
-        # Views importantes
-        views = [
-            {
-                "name": "latest_prices_view",
-                "definition": """
-                CREATE VIEW latest_prices_view AS
-                SELECT DISTINCT ON (commodity_id) 
-                    commodity_id,
-                    price,
-                    date,
-                    source,
-                    location
-                FROM price_data 
-                ORDER BY commodity_id, date DESC;
-                """
-            },
-            {
-                "name": "prediction_accuracy_view", 
-                "definition": """
-                CREATE VIEW prediction_accuracy_view AS
-                SELECT 
-                    p.commodity_id,
-                    c.symbol,
-                    p.model_version,
-                    AVG(ABS(p.predicted_price - pd.price)) as avg_error,
-                    COUNT(*) as total_predictions
-                FROM predictions p
-                JOIN commodities c ON p.commodity_id = c.id
-                JOIN price_data pd ON p.commodity_id = pd.commodity_id 
-                    AND p.target_date = pd.date
-                GROUP BY p.commodity_id, c.symbol, p.model_version;
-                """
-            }
-        ]
-        
-        # Funções SQL
-        functions = [
-            {
-                "name": "get_price_trend",
-                "definition": """
-                CREATE OR REPLACE FUNCTION get_price_trend(
-                    p_commodity_id uuid,
-                    p_days integer DEFAULT 30
-                )
-                RETURNS TABLE(
-                    trend_direction text,
-                    price_change decimal,
-                    percentage_change decimal
-                ) AS $$
-                BEGIN
-                    RETURN QUERY
-                    WITH price_comparison AS (
-                        SELECT 
-                            (SELECT price FROM price_data 
-                             WHERE commodity_id = p_commodity_id 
-                             ORDER BY date DESC LIMIT 1) as current_price,
-                            (SELECT price FROM price_data 
-                             WHERE commodity_id = p_commodity_id 
-                             AND date <= CURRENT_DATE - p_days 
-                             ORDER BY date DESC LIMIT 1) as past_price
-                    )
-                    SELECT 
-                        CASE 
-                            WHEN current_price > past_price THEN 'UP'
-                            WHEN current_price < past_price THEN 'DOWN'
-                            ELSE 'STABLE'
-                        END,
-                        current_price - past_price,
-                        ROUND(((current_price - past_price) / past_price * 100), 2)
-                    FROM price_comparison;
-                END;
-                $$ LANGUAGE plpgsql;
-                """
-            }
-        ]
-        
-        return DatabaseSchema(
-            name="spr_production",
-            tables=spr_tables,
-            views=views, 
-            functions=functions,
-            policies=[],
-            indexes=[]
-        )
+        key = _requirements_key(business_requirements)
+        schema = self._schema_cache.get(key)
+        if schema is None:
+            # Schema do SPR: tabelas, views e funções estáticas compartilhadas (somente leitura)
+            schema = DatabaseSchema(
+                name="spr_production",
+                tables=_SPR_TABLES,
+                views=_SPR_VIEWS,
+                functions=_SPR_FUNCTIONS,
+                policies=(),
+                indexes=()
+            )
+            _cache_put(self._schema_cache, key, schema)
+        return schema
+    
+    def _cached_for_schema(self, cache: Dict[int, Tuple[DatabaseSchema, Any]],
+                           schema: DatabaseSchema, build) -> Any:
+        """Resultado memoizado por instância de schema (a entrada mantém o schema vivo, então o id não é reutilizado)"""
+        entry = cache.get(id(schema))
+        if entry is not None and entry[0] is schema:
+            return entry[1]
+        value = build(schema)
+        _cache_put(cache, id(schema), (schema, value))
+        return value
     
     def create_rls_policies(self, schema: DatabaseSchema) -> List[RLSPolicy]:
         """
         Criar políticas de Row Level Security
         """
         self.logger.info("🔐 Criando políticas RLS...")
-        
-        policies = [
-            # Políticas para tabela users
-            RLSPolicy(
-                table="users",
-                policy_name="users_select_own",
-                command="SELECT", 
-                roles=["authenticated"],
-                using_expression="auth.uid() = id"
-            ),
-            RLSPolicy(
-                table="users",
-                policy_name="users_update_own",
-                command="UPDATE",
-                roles=["authenticated"],
-                using_expression="auth.uid() = id"
-            ),
-            
-            # Políticas para predictions
-            RLSPolicy(
-                table="predictions",
-                policy_name="predictions_select_all",
-                command="SELECT",
-                roles=["authenticated"],
-                using_expression="true"
-            ),
-            RLSPolicy(
-                table="predictions", 
-                policy_name="predictions_insert_admin",
-                command="INSERT",
-                roles=["authenticated"],
-                using_expression="EXISTS (SELECT 1 FROM users WHERE id = auth.uid() AND role = 'admin')"
-            ),
-            
-            # Políticas para whatsapp_sessions
+        return list(self._cached_for_schema(self._policy_cache, schema, self._build_rls_policies))
+    
+    def _build_rls_policies(self, schema: DatabaseSchema) -> Tuple[RLSPolicy, ...]:
+        """Construir as políticas RLS do schema"""
+        return tuple(
             RLSPolicy(
-                table="whatsapp_sessions",
-                policy_name="whatsapp_admin_only",
-                command="ALL",
-                roles=["authenticated"],
-                using_expression="EXISTS (SELECT 1 FROM users WHERE id = auth.uid() AND role IN ('admin', 'operator'))"
+                table=tpl['table'],
+                policy_name=tpl['name'].format(op=op.lower()),
+                command=op,
+                roles=tpl.get('roles', ("authenticated",)),
+                using_expression=tpl['using']
             )
-        ]
-        
-        return policies
+            for tpl in _RLS_TEMPLATES
+            for op in tpl['ops']
+        )
     
     def optimize_queries(self, slow_queries: List[str]) -> Dict[str, str]:
         """
@@ -281,77 +608,88 @@ class DatabaseAgent:
         optimizations = {}
         
         for query in slow_queries:
-            # Análise básica de otimização
-            if "ORDER BY" in query and "LIMIT" not in query:
-                optimizations[query] = "Adicionar LIMIT para evitar ordenação completa da tabela"
-            elif "JOIN" in query and "WHERE" not in query:
-                optimizations[query] = "Adicionar condições WHERE antes dos JOINs"
-            elif "SELECT *" in query:
-                optimizations[query] = "Especificar apenas as colunas necessárias"
+            # Uma única varredura (regex compilada) coleta todos os tokens relevantes
+            found = {m.lastgroup for m in _QUERY_TOKENS.finditer(query)}
+            # Regras em ordem de prioridade: (presente, ausente, sugestão)
+            for required, missing, advice in _QUERY_RULES:
+                if required in found and (missing is None or missing not in found):
+                    optimizations[query] = advice
+                    break
         
         return optimizations
     
-    def generate_migration_script(self, schema: DatabaseSchema) -> str:
+    def generate_migration_script(self, schema: DatabaseSchema,
+                                  out: Optional[TextIO] = None) -> Optional[str]:
         """
         Gerar script de migração SQL
+        
+        Sem out, retorna o script como string (memoizado por schema); com out
+        (ex.: arquivo aberto), escreve direto nele e retorna None.
         """
         self.logger.info("📝 Gerando script de migração...")
+        if out is None:
+            return self._cached_for_schema(self._migration_cache, schema, self._render_migration)
+        entry = self._migration_cache.get(id(schema))
+        if entry is not None and entry[0] is schema:
+            out.write(entry[1])
+        else:
+            self._write_migration(schema, out)
+        return None
+    
+    def _render_migration(self, schema: DatabaseSchema) -> str:
+        """Renderizar o script de migração SQL do schema em uma string"""
+        buffer = io.StringIO()
+        self._write_migration(schema, buffer)
+        return buffer.getvalue()
+    
+    def _write_migration(self, schema: DatabaseSchema, out: TextIO) -> None:
+        """Escrever o script de migração fragmento a fragmento em out"""
+        out.write(_MIGRATION_HEADER.format(generated=self._gen_ts, name=schema.name))
         
-        migration_sql = f"""
--- Migration: SPR Database Schema
--- Generated: {datetime.now().isoformat()}
--- Database: {schema.name}
-
--- Enable required extensions
-CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
-
--- Create custom types
-CREATE TYPE user_role AS ENUM ('admin', 'operator', 'user');
-CREATE TYPE commodity_category AS ENUM ('grains', 'livestock', 'energy', 'metals');
-
-"""
+        # Criar tabelas (DDL das tabelas SPR já pré-renderizado no import)
+        for table in schema.tables:
+            out.write(_TABLE_SQL.get(id(table)) or _render_table(table))
         
-        # Criar tabelas
+        # Logs de alteração (mlog) das tabelas de origem das views materializadas
+        mlog_tables = dict.fromkeys(src for view in schema.views for src in view.get('mlog_sources', ()))
         for table in schema.tables:
-            migration_sql += f"\n-- Create table: {table['name']}\n"
-            migration_sql += f"CREATE TABLE {table['name']} (\n"
-            
-            columns = []
-            for col in table['columns']:
-                col_def = f"    {col['name']} {col['type']}"
-                if col.get('primary_key'):
-                    col_def += " PRIMARY KEY"
-                if col.get('unique'):
-                    col_def += " UNIQUE"
-                if col.get('not_null'):
-                    col_def += " NOT NULL"
-                if col.get('default'):
-                    col_def += f" DEFAULT {col['default']}"
-                if col.get('foreign_key'):
-                    col_def += f" REFERENCES {col['foreign_key']}"
-                columns.append(col_def)
-            
-            migration_sql += ",\n".join(columns)
-            migration_sql += "\n);\n"
-            
-            # Enable RLS se necessário
-            if table.get('rls_enabled'):
-                migration_sql += f"\nALTER TABLE {table['name']} ENABLE ROW LEVEL SECURITY;\n"
-            
-            # Criar índices
-            if table.get('indexes'):
-                for index in table['indexes']:
-                    migration_sql += f"CREATE INDEX idx_{table['name']}_{index} ON {table['name']}({index});\n"
+            if table['name'] in mlog_tables:
+                out.write(_render_mlog(table))
+        if mlog_tables:
+            out.write(_MLOG_STATE_TABLE)
         
         # Criar views
         for view in schema.views:
-            migration_sql += f"\n{view['definition']}\n"
+            out.write(f"\n{view['definition']}\n")
+            if view.get('mlog_sources'):
+                out.write(_render_refresh_if_changed(view))
         
         # Criar funções
         for func in schema.functions:
-            migration_sql += f"\n{func['definition']}\n"
-        
-        return migration_sql
+            out.write(f"\n{func['definition']}\n")
+    
+    def refresh_materialized_views(self, schema: Optional[DatabaseSchema] = None) -> str:
+        """
+        SQL de refresh (CONCURRENTLY, sem bloquear leituras) das views materializadas
+        """
+        views = schema.views if schema is not None else _SPR_VIEWS
+        # O refresh pode exceder o statement_timeout padrão do banco (30s)
+        return "SET statement_timeout = '5min';\n" + "".join(
+            # Views com mlog só são recalculadas quando há delta nas tabelas de origem
+            f"SELECT {_refresh_if_changed_func(view['name'])}();\n"
+            if view.get('mlog_sources') else
+            f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view['name']};\n"
+            for view in views if view.get('materialized')
+        )
+    
+    def generate_mlog_sql(self, table_name: str, pk_cols: Sequence[str] = ("id",),
+                          schema: Optional[DatabaseSchema] = None) -> str:
+        """
+        SQL do log de alterações (mlog) + trigger de captura de uma tabela
+        """
+        tables = schema.tables if schema is not None else _SPR_TABLES
+        table = next(t for t in tables if t['name'] == table_name)
+        return _render_mlog(table, pk_cols)
     
     def backup_strategy(self) -> Dict[str, Any]:
         """
@@ -373,6 +711,15 @@ CREATE TYPE commodity_category AS ENUM ('grains', 'livestock', 'energy', 'metals
             "point_in_time_recovery": {
                 "enabled": True,
                 "retention": "7 days"
+            },
+            "materialized_view_refresh": {
+                "schedule": "*/5 * * * *",  # a cada 5 minutos
+                "command": self.refresh_materialized_views(),
+                "concurrent": True
+            },
+            "connection_pooling": {
+                "tool": "PgBouncer",
+                "config": _PGBOUNCER_INI
             }
         }
     
@@ -380,13 +727,23 @@ CREATE TYPE commodity_category AS ENUM ('grains', 'livestock', 'energy', 'metals
         """
         Verificação de saúde do banco
         """
+        connections = {
+            "active": 12,
+            "max": 100,
+            "usage_percent": 12,
+            "pool_mode": "transaction"
+        }
+        warnings = []
+        if connections["usage_percent"] > _POOL_USAGE_WARN_PERCENT:
+            warnings.append(
+                f"Uso de conexões em {connections['usage_percent']}% - revisar pool "
+                f"(PgBouncer default_pool_size) antes de aumentar max_connections"
+            )
+        
         return {
             "status": "operational",
-            "connections": {
-                "active": 12,
-                "max": 100,
-                "usage_percent": 12
-            },
+            "connections": connections,
+            "warnings": warnings,
             "storage": {
                 "total_gb": 50,
                 "used_gb": 8.5,
@@ -404,6 +761,7 @@ CREATE TYPE commodity_category AS ENUM ('grains', 'livestock', 'energy', 'metals
         }
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     agent = DatabaseAgent()
     
     # Simular requisitos de negócio
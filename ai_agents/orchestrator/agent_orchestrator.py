@@ -4,35 +4,349 @@
 Coordenação e orquestração de todos os agentes especializados
 """
 
+import functools
 import json
 import logging
 import asyncio
+import inspect
+import py_compile
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
-from pathlib import Path
+from types import MappingProxyType
+from typing import ClassVar, Dict, List, Mapping, NamedTuple, Optional, Any, Sequence, Set, Tuple
+from dataclasses import dataclass, field
+import importlib
 import importlib.util
+from weakref import WeakValueDictionary
 
-@dataclass
+from ai_agents._common import dumps_bytes, freeze
+
+_logger = logging.getLogger("SPR.agent-orchestrator")
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+def to_json(obj: Any) -> bytes:
+    """Serializar dashboards/planos para JSON (bytes UTF-8)"""
+    return dumps_bytes(obj)
+
+# Plano de projeto por área (agente responsável + entregáveis)
+_PROJECT_PLAN_TEMPLATE = freeze({
+    "project_overview": {
+        "name": "SPR - Sistema Preditivo Royal",
+        "description": "Plataforma completa para previsão de preços de commodities",
+        "timeline": "6 meses para MVP, 12 meses para versão completa",
+        "team_size": "8-12 pessoas"
+    },
+    
+    "business_analysis": {
+        "agent": "business-strategist",
+        "deliverables": [
+            "Análise de mercado detalhada",
+            "Modelo de negócio validado", 
+            "Estratégia go-to-market",
+            "Projeções financeiras 18 meses"
+        ]
+    },
+    
+    "user_experience": {
+        "agent": "ui-ux-designer",
+        "deliverables": [
+            "3 personas principais validadas",
+            "Jornadas de usuário mapeadas",
+            "Sistema de design completo",
+            "Protótipos interativos testados"
+        ]
+    },
+    
+    "frontend_development": {
+        "agent": "frontend-engineer", 
+        "deliverables": [
+            "Arquitetura frontend Next.js 14",
+            "Componentes reutilizáveis (ShadCN)",
+            "Dashboard responsivo",
+            "Performance otimizada (< 3s LCP)"
+        ]
+    },
+    
+    "backend_architecture": {
+        "agent": "backend-engineer",
+        "deliverables": [
+            "APIs RESTful escaláveis",
+            "Sistema de autenticação JWT",
+            "Integração WhatsApp Bot",
+            "Pipeline de dados em tempo real"
+        ]
+    },
+    
+    "database_design": {
+        "agent": "database-engineer",
+        "deliverables": [
+            "Schema otimizado Supabase",
+            "Políticas RLS implementadas", 
+            "Estratégia backup/recovery",
+            "Performance tuning"
+        ]
+    },
+    
+    "ai_data_science": {
+        "agent": "ai-data-scientist",
+        "deliverables": [
+            "Modelos preditivos (85%+ accuracy)",
+            "Pipeline MLOps automatizado",
+            "Dashboard analytics avançado",
+            "Monitoramento modelo produção"
+        ]
+    },
+    
+    "quality_assurance": {
+        "agent": "qa-tester",
+        "deliverables": [
+            "Suíte testes automatizados",
+            "Testes E2E Playwright",
+            "Performance testing",
+            "Acessibilidade WCAG AA"
+        ]
+    },
+    
+    "devops_security": {
+        "agent": "security-devops", 
+        "deliverables": [
+            "CI/CD pipeline GitHub Actions",
+            "Infraestrutura Vercel + Supabase",
+            "Monitoring APM completo",
+            "Security audit + compliance"
+        ]
+    }
+})
+
+# Métricas ainda estáticas do dashboard (somente leitura, compartilhadas entre chamadas)
+_PERF_METRICS_STUB = MappingProxyType({
+    "avg_task_time": "2.3s",
+    "success_rate": "96.8%",
+    "error_rate": "3.2%",
+    "uptime": "99.9%"
+})
+_RESOURCE_USAGE_STUB = MappingProxyType({
+    "memory": "245 MB",
+    "cpu": "12%", 
+    "active_connections": 8
+})
+
+def _agent_health_views(agent_config: Mapping[str, Any]) -> Tuple[Mapping[str, Any], Mapping[str, Any]]:
+    """Entradas de agent_health do dashboard para o agente (não carregado, carregado)"""
+    static = {"status": agent_config["status"], "capabilities": len(agent_config["capabilities"])}
+    return (MappingProxyType({**static, "loaded": False}),
+            MappingProxyType({**static, "loaded": True}))
+
+# Pool compartilhado por todos os orquestradores para chamadas bloqueantes de agentes
+# (I/O de rede/disco). As threads só são criadas no primeiro uso e o interpretador
+# as encerra na saída, então nenhum orquestrador precisa fechá-lo.
+_IO_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="agent-io")
+
+# Intervalo mínimo entre amostras do psutil (limita syscalls a 1 Hz por orquestrador)
+_RESOURCE_SAMPLE_INTERVAL = 1.0
+
+# Memoização de workflows/planos (_memoize_ttl)
+_MEMO_MAXSIZE = 32
+_MISS = object()
+
+def _memoize_ttl(ttl_seconds: float):
+    """
+    Memoizar método do AgentOrchestrator por ttl_seconds
+    
+    A chave inclui os argumentos (serializados) e a versão do registro de agentes, então
+    register_agent invalida tudo. O resultado é congelado (freeze) antes de ir para o cache,
+    pois a mesma instância é devolvida a todos os chamadores dentro do TTL.
+    Métodos async guardam o valor aguardado, não a coroutine.
+    """
+    def decorator(fn):
+        def lookup(self, args, kwargs):
+            key = (fn.__name__, self._registry_version,
+                   json.dumps([args, kwargs], sort_keys=True, default=str))
+            with self._memo_lock:
+                hit = self._memo.get(key)
+            if hit is not None and time.monotonic() - hit[1] < ttl_seconds:
+                return key, hit[0]
+            return key, _MISS
+        
+        def store(self, key, result):
+            result = freeze(result)
+            with self._memo_lock:
+                self._memo.pop(key, None)
+                if len(self._memo) >= _MEMO_MAXSIZE:
+                    del self._memo[next(iter(self._memo))]
+                self._memo[key] = (result, time.monotonic())
+            return result
+        
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(self, *args, **kwargs):
+                key, result = lookup(self, args, kwargs)
+                if result is _MISS:
+                    result = store(self, key, await fn(self, *args, **kwargs))
+                return result
+        else:
+            @functools.wraps(fn)
+            def wrapper(self, *args, **kwargs):
+                key, result = lookup(self, args, kwargs)
+                if result is _MISS:
+                    result = store(self, key, fn(self, *args, **kwargs))
+                return result
+        return wrapper
+    return decorator
+
+@dataclass(slots=True, frozen=True)
 class AgentTask:
     """Tarefa para agente específico"""
     agent_id: str
     task_type: str
-    parameters: Dict[str, Any]
+    parameters: Mapping[str, Any] = field(hash=False)
     priority: str = "medium"  # high, medium, low
-    dependencies: List[str] = None
+    dependencies: Tuple[str, ...] = ()  # task_ids que precisam terminar antes
     timeout: int = 300  # segundos
+    task_id: Optional[str] = None  # padrão: "<agent_id>.<task_type>"
+    
+    def __post_init__(self):
+        # Aceitar lista ou None (API anterior) armazenando como tupla
+        if not isinstance(self.dependencies, tuple):
+            object.__setattr__(self, "dependencies", tuple(self.dependencies or ()))
+    
+    @property
+    def key(self) -> str:
+        """Identificador usado para resolver dependências entre tarefas"""
+        return self.task_id or f"{self.agent_id}.{self.task_type}"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentResponse:
     """Resposta de agente"""
     agent_id: str
     task_id: str
     success: bool
-    result: Any
+    result: Any = field(hash=False)
     execution_time: float
     error: Optional[str] = None
 
+class CircularDependencyError(ValueError):
+    """Dependências entre AgentTasks formam um ciclo"""
+
+def _topological_waves(dependencies: Mapping[str, Sequence[str]], kind: str = "tarefas") -> List[List[str]]:
+    """Ordenar chaves topologicamente (Kahn) em ondas; cada onda só depende das anteriores"""
+    in_degree = dict.fromkeys(dependencies, 0)
+    dependents: Dict[str, List[str]] = {key: [] for key in dependencies}
+    for key, deps in dependencies.items():
+        for dep in deps:
+            if dep not in dependents:
+                raise ValueError(f"{key} depende de {dep}, que não foi informado")
+            in_degree[key] += 1
+            dependents[dep].append(key)
+    
+    waves = []
+    ready = [key for key, degree in in_degree.items() if degree == 0]
+    while ready:
+        waves.append(ready)
+        next_ready = []
+        for key in ready:
+            for child in dependents[key]:
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    next_ready.append(child)
+        ready = next_ready
+    
+    if sum(in_degree.values()) != 0:
+        cycle = sorted(key for key, degree in in_degree.items() if degree)
+        raise CircularDependencyError(f"Dependência circular entre {kind}: {cycle}")
+    return waves
+
+def plan_execution_waves(tasks: List[AgentTask]) -> List[List[AgentTask]]:
+    """
+    Ordenar tarefas topologicamente (Kahn) em ondas de tarefas independentes
+    
+    Cada onda só depende de ondas anteriores, então suas tarefas podem rodar em paralelo.
+    """
+    by_key = {task.key: task for task in tasks}
+    if len(by_key) != len(tasks):
+        raise ValueError("task_id duplicado entre as tarefas")
+    waves = _topological_waves({key: task.dependencies for key, task in by_key.items()})
+    return [[by_key[key] for key in wave] for wave in waves]
+
+class Ref(NamedTuple):
+    """Referência a um valor do escopo do workflow (parâmetro ou resultado de outro AgentCall)"""
+    name: str
+
+class AgentCall(NamedTuple):
+    """Nó do grafo de workflow: scope[name] = agent_id.method(*args), com Refs resolvidas"""
+    name: str
+    agent_id: str
+    method: str
+    args: Tuple[Any, ...] = ()
+
+def _collect_refs(value: Any) -> List[str]:
+    """Nomes referenciados (Ref) em args, recursivamente"""
+    if isinstance(value, Ref):
+        return [value.name]
+    if isinstance(value, Mapping):
+        return [name for item in value.values() for name in _collect_refs(item)]
+    if isinstance(value, (tuple, list)):
+        return [name for item in value for name in _collect_refs(item)]
+    return []
+
+def _resolve_refs(value: Any, scope: Mapping[str, Any]) -> Any:
+    """Substituir Refs pelos valores do escopo (sempre gera cópias de dicts/listas)"""
+    if isinstance(value, Ref):
+        return scope[value.name]
+    if isinstance(value, Mapping):
+        return {key: _resolve_refs(item, scope) for key, item in value.items()}
+    if isinstance(value, (tuple, list)):
+        return type(value)(_resolve_refs(item, scope) for item in value)
+    return value
+
+def _compile_workflow(calls: Sequence[AgentCall]) -> Tuple[Tuple[AgentCall, ...], ...]:
+    """
+    Validar e organizar um workflow em ondas de AgentCalls independentes
+    
+    Dependências vêm das Refs a outros nós; Refs a nomes que não são nós são
+    parâmetros do workflow (ex.: commodity).
+    """
+    by_name = {call.name: call for call in calls}
+    if len(by_name) != len(calls):
+        raise ValueError("AgentCall com nome duplicado no workflow")
+    dependencies = {
+        name: list(dict.fromkeys(ref for ref in _collect_refs(call.args) if ref in by_name))
+        for name, call in by_name.items()
+    }
+    waves = _topological_waves(dependencies, kind="etapas do workflow")
+    return tuple(tuple(by_name[name] for name in wave) for wave in waves)
+
+# Grafos dos workflows com chamadas a agentes; a consolidação dos resultados fica nos métodos
+_WORKFLOW_SPECS: Mapping[str, Tuple[AgentCall, ...]] = MappingProxyType({
+    "complete_market_analysis": (
+        AgentCall("market_research", "web-researcher", "research_commodity_markets", (Ref("commodity"),)),
+        AgentCall("business_analysis", "business-strategist", "analyze_market_opportunity"),
+    ),
+    "ui_design_to_code": (
+        AgentCall("personas", "ui-ux-designer", "create_user_personas",
+                  ({"target": "agricultural users"},)),
+        AgentCall("design_system", "ui-ux-designer", "define_design_system"),
+        AgentCall("ui_requirements", "frontend-engineer", "analyze_ui_requirements",
+                  ({"personas": Ref("personas"), "design_system": Ref("design_system")},)),
+        AgentCall("db_schema", "database-engineer", "analyze_schema_requirements",
+                  ({"ui_requirements": Ref("ui_requirements")},)),
+    ),
+})
+
+# Validados (acíclicos) e divididos em ondas uma única vez, na importação
+_WORKFLOW_GRAPHS: Mapping[str, Tuple[Tuple[AgentCall, ...], ...]] = MappingProxyType({
+    name: _compile_workflow(calls) for name, calls in _WORKFLOW_SPECS.items()
+})
+
 class AgentOrchestrator:
     """
     Orquestrador Central dos Agentes de IA do SPR
@@ -41,204 +355,274 @@ class AgentOrchestrator:
     gerencia dependências e otimiza o fluxo de trabalho.
     """
     
+    # Classes de agente já resolvidas no processo: (módulo, classe) -> classe.
+    # Compartilhado entre instâncias para pular import_module + getattr a cada orquestrador.
+    _MODULE_CACHE: ClassVar[Dict[Tuple[str, str], type]] = {}
+    # Módulos de agente ausentes: não repetir a busca em sys.path a cada tentativa.
+    # Falhas em dependências do módulo não entram (podem ser instaladas depois);
+    # register_agent limpa a entrada do módulo registrado.
+    _FAILED_IMPORTS: ClassVar[Set[str]] = set()
+    
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or {}
         self.orchestrator_id = "agent-orchestrator"
         self.orchestrator_name = "AI Agent Orchestrator"
         
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(f"SPR.{self.orchestrator_id}")
+        self.logger = _logger
         
         # Registro de agentes disponíveis
         self.available_agents = {
             "database-engineer": {
-                "path": "ai_agents/database/database_agent.py",
+                "module": "ai_agents.database.database_agent",
                 "class": "DatabaseAgent",
                 "status": "active",
                 "capabilities": ["schema_design", "rls_policies", "query_optimization"]
             },
             "frontend-engineer": {
-                "path": "ai_agents/frontend/frontend_agent.py", 
+                "module": "ai_agents.frontend.frontend_agent", 
                 "class": "FrontendAgent",
                 "status": "active",
                 "capabilities": ["ui_components", "page_generation", "performance_optimization"]
             },
             "ui-ux-designer": {
-                "path": "ai_agents/ui_ux/ui_ux_agent.py",
+                "module": "ai_agents.ui_ux.ui_ux_agent",
                 "class": "UIUXAgent", 
                 "status": "active",
                 "capabilities": ["user_research", "wireframes", "design_systems"]
             },
             "business-strategist": {
-                "path": "ai_agents/business/business_agent.py",
+                "module": "ai_agents.business.business_agent",
                 "class": "BusinessAgent",
                 "status": "active", 
                 "capabilities": ["market_analysis", "business_model", "go_to_market"]
             },
             "web-researcher": {
-                "path": "ai_agents/research/research_agent.py",
+                "module": "ai_agents.research.research_agent",
                 "class": "ResearchAgent",
                 "status": "active",
                 "capabilities": ["market_research", "competitive_analysis", "trend_analysis"]
             }
         }
         
-        self.loaded_agents = {}
+        # Cache de _memoize_ttl; _registry_version muda a cada register_agent
+        self._memo: Dict[Any, Tuple[Any, float]] = {}
+        # Workflows rodam no event loop e em threads do _IO_POOL
+        self._memo_lock = threading.Lock()
+        self._registry_version = 0
+        
+        # Grafos pré-compilados dos workflows (ondas de AgentCall), usados por _run_graph
+        self._workflow_graphs = _WORKFLOW_GRAPHS
+        
+        # Tabela de despacho de execute_coordinated_workflow
+        self._workflows = {
+            "complete_market_analysis": self._execute_market_analysis_workflow,
+            "ui_design_to_code": self._execute_design_to_code_workflow,
+            "data_to_insights": self._execute_data_to_insights_workflow
+        }
+        
+        # Última amostra de recursos: (instante monotonic, resource_usage)
+        self._process = psutil.Process() if HAS_PSUTIL else None
+        self._resource_cache: Tuple[float, Mapping[str, Any]] = (float("-inf"), _RESOURCE_USAGE_STUB)
+        
+        # agent_health do dashboard pré-montado: (não carregado, carregado) por agente
+        self._agent_health_views = {
+            agent_id: _agent_health_views(config)
+            for agent_id, config in self.available_agents.items()
+        }
+        
+        # Construtor especializado por agente (módulo/classe já resolvidos na closure)
+        self._load_dispatch = {
+            agent_id: self._make_loader(agent_config)
+            for agent_id, agent_config in self.available_agents.items()
+        }
+        
+        if self.config.get("precompile_agents"):
+            self.compile_agent_bytecode()
+        
+        # Referências fracas: agentes fora do LRU _hot_agents podem ser coletados
+        self.loaded_agents: "WeakValueDictionary[str, Any]" = WeakValueDictionary()
+        self._hot_agents: "OrderedDict[str, Any]" = OrderedDict()
+        self._hot_agents_max = self.config.get("hot_agents", 8)
+        # load_agent roda em threads de trabalho durante preload_agents
+        self._agents_lock = threading.Lock()
         self.task_queue = []
-        self.execution_history = []
+        # Histórico limitado (entradas antigas descartadas); _total_completed conta o total
+        self.execution_history: "deque[AgentResponse]" = deque(maxlen=self.config.get("history_size", 10_000))
+        self._total_completed = 0
         
     def load_agent(self, agent_id: str) -> Any:
         """Carregar agente dinamicamente"""
-        if agent_id in self.loaded_agents:
-            return self.loaded_agents[agent_id]
+        agent_instance = self.loaded_agents.get(agent_id)
+        if agent_instance is not None:
+            self._touch_hot_agent(agent_id, agent_instance)
+            return agent_instance
             
-        if agent_id not in self.available_agents:
+        loader = self._load_dispatch.get(agent_id)
+        if loader is None:
             raise ValueError(f"Agente {agent_id} não encontrado")
-            
-        agent_config = self.available_agents[agent_id]
         
         try:
-            # Carregar módulo dinamicamente
-            spec = importlib.util.spec_from_file_location(
-                agent_id, 
-                agent_config["path"]
-            )
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            
-            # Instanciar classe do agente
-            agent_class = getattr(module, agent_config["class"])
-            agent_instance = agent_class(self.config)
+            # Instanciar classe do agente (módulo carregado uma vez por processo)
+            agent_instance = loader()
             
-            self.loaded_agents[agent_id] = agent_instance
-            self.logger.info(f"✅ Agente {agent_id} carregado com sucesso")
+            with self._agents_lock:
+                # Outra thread pode ter carregado o mesmo agente: manter uma única instância
+                agent_instance = self.loaded_agents.setdefault(agent_id, agent_instance)
+            self._touch_hot_agent(agent_id, agent_instance)
+            self.logger.info("✅ Agente %s carregado com sucesso", agent_id)
             
             return agent_instance
             
         except Exception as e:
-            self.logger.error(f"❌ Erro ao carregar agente {agent_id}: {e}")
+            self.logger.error("❌ Erro ao carregar agente %s: %s", agent_id, e)
             return None
     
-    def create_comprehensive_project_plan(self, requirements: Dict[str, Any]) -> Dict[str, Any]:
-        """Criar plano abrangente do projeto coordenando todos os agentes"""
-        self.logger.info("🎯 Criando plano abrangente do projeto SPR...")
+    def _make_loader(self, agent_config: Dict[str, Any]):
+        """Criar construtor do agente com chave de cache e config pré-resolvidas"""
+        key = (agent_config["module"], agent_config["class"])
+        module_cache = self._MODULE_CACHE
+        resolve = self._resolve_agent_class
+        config = self.config
         
-        # Coordenar análise de múltiplos agentes
-        project_plan = {
-            "project_overview": {
-                "name": "SPR - Sistema Preditivo Royal",
-                "description": "Plataforma completa para previsão de preços de commodities",
-                "timeline": "6 meses para MVP, 12 meses para versão completa",
-                "team_size": "8-12 pessoas"
-            },
-            
-            "business_analysis": {
-                "agent": "business-strategist",
-                "deliverables": [
-                    "Análise de mercado detalhada",
-                    "Modelo de negócio validado", 
-                    "Estratégia go-to-market",
-                    "Projeções financeiras 18 meses"
-                ]
-            },
-            
-            "user_experience": {
-                "agent": "ui-ux-designer",
-                "deliverables": [
-                    "3 personas principais validadas",
-                    "Jornadas de usuário mapeadas",
-                    "Sistema de design completo",
-                    "Protótipos interativos testados"
-                ]
-            },
-            
-            "frontend_development": {
-                "agent": "frontend-engineer", 
-                "deliverables": [
-                    "Arquitetura frontend Next.js 14",
-                    "Componentes reutilizáveis (ShadCN)",
-                    "Dashboard responsivo",
-                    "Performance otimizada (< 3s LCP)"
-                ]
-            },
-            
-            "backend_architecture": {
-                "agent": "backend-engineer",
-                "deliverables": [
-                    "APIs RESTful escaláveis",
-                    "Sistema de autenticação JWT",
-                    "Integração WhatsApp Bot",
-                    "Pipeline de dados em tempo real"
-                ]
-            },
-            
-            "database_design": {
-                "agent": "database-engineer",
-                "deliverables": [
-                    "Schema otimizado Supabase",
-                    "Políticas RLS implementadas", 
-                    "Estratégia backup/recovery",
-                    "Performance tuning"
-                ]
-            },
-            
-            "ai_data_science": {
-                "agent": "ai-data-scientist",
-                "deliverables": [
-                    "Modelos preditivos (85%+ accuracy)",
-                    "Pipeline MLOps automatizado",
-                    "Dashboard analytics avançado",
-                    "Monitoramento modelo produção"
-                ]
-            },
-            
-            "quality_assurance": {
-                "agent": "qa-tester",
-                "deliverables": [
-                    "Suíte testes automatizados",
-                    "Testes E2E Playwright",
-                    "Performance testing",
-                    "Acessibilidade WCAG AA"
-                ]
-            },
-            
-            "devops_security": {
-                "agent": "security-devops", 
-                "deliverables": [
-                    "CI/CD pipeline GitHub Actions",
-                    "Infraestrutura Vercel + Supabase",
-                    "Monitoring APM completo",
-                    "Security audit + compliance"
-                ]
-            }
-        }
+        def load() -> Any:
+            agent_class = module_cache.get(key) or resolve(agent_config)
+            return agent_class(config)
+        return load
+    
+    def _touch_hot_agent(self, agent_id: str, agent_instance: Any) -> None:
+        """Marcar agente como recente no LRU (referência forte), descartando o mais antigo"""
+        with self._agents_lock:
+            self._hot_agents[agent_id] = agent_instance
+            self._hot_agents.move_to_end(agent_id)
+            while len(self._hot_agents) > self._hot_agents_max:
+                self._hot_agents.popitem(last=False)
+    
+    def unload_agent(self, agent_id: str) -> bool:
+        """Descarregar agente; retorna True se ele estava carregado"""
+        with self._agents_lock:
+            hot = self._hot_agents.pop(agent_id, None)
+            loaded = self.loaded_agents.pop(agent_id, None)
+        return (hot or loaded) is not None
+    
+    def register_agent(self, agent_id: str, agent_config: Dict[str, Any]) -> None:
+        """Registrar (ou substituir) um agente; invalida os resultados memoizados"""
+        self.available_agents[agent_id] = agent_config
+        self._FAILED_IMPORTS.discard(agent_config["module"])
+        self._load_dispatch[agent_id] = self._make_loader(agent_config)
+        self._agent_health_views[agent_id] = _agent_health_views(agent_config)
+        self.unload_agent(agent_id)
+        self._registry_version += 1
+    
+    def compile_agent_bytecode(self) -> Dict[str, Optional[str]]:
+        """
+        Pré-compilar os módulos dos agentes para __pycache__
         
-        return project_plan
+        O primeiro load_agent do processo passa a ler o .pyc em vez de compilar o fonte.
+        Retorna agent_id -> caminho do .pyc (None se a compilação falhou).
+        """
+        compiled = {}
+        for agent_id, agent_config in self.available_agents.items():
+            try:
+                spec = importlib.util.find_spec(agent_config["module"])
+                if spec is None or not spec.origin:
+                    raise ModuleNotFoundError(f"Módulo {agent_config['module']} não encontrado")
+                compiled[agent_id] = py_compile.compile(spec.origin, doraise=True)
+            except (ImportError, OSError, py_compile.PyCompileError) as e:
+                self.logger.warning("⚠️ Bytecode de %s não gerado: %s", agent_id, e)
+                compiled[agent_id] = None
+        return compiled
+    
+    async def run_blocking(self, func, *args, **kwargs) -> Any:
+        """Executar chamada bloqueante (ex.: agente real) no pool de I/O compartilhado"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_IO_POOL, functools.partial(func, *args, **kwargs))
+    
+    async def preload_agents(self, agent_ids: List[str]) -> List[Any]:
+        """Carregar vários agentes em paralelo (I/O de disco e exec dos módulos em threads)"""
+        return list(await asyncio.gather(*[
+            self.run_blocking(self.load_agent, agent_id) for agent_id in agent_ids
+        ]))
     
-    def execute_coordinated_workflow(self, workflow_name: str) -> Dict[str, Any]:
-        """Executar workflow coordenado entre agentes"""
-        self.logger.info(f"🔄 Executando workflow: {workflow_name}")
+    @classmethod
+    def _resolve_agent_class(cls, agent_config: Dict[str, Any]) -> type:
+        """Obter a classe do agente do cache do processo, importando o módulo se necessário"""
+        key = (agent_config["module"], agent_config["class"])
+        agent_class = cls._MODULE_CACHE.get(key)
+        if agent_class is not None:
+            return agent_class
         
-        if workflow_name == "complete_market_analysis":
-            return self._execute_market_analysis_workflow()
-        elif workflow_name == "ui_design_to_code":
-            return self._execute_design_to_code_workflow()
-        elif workflow_name == "data_to_insights":
-            return self._execute_data_to_insights_workflow()
-        else:
+        module_name = agent_config["module"]
+        if module_name in cls._FAILED_IMPORTS:
+            raise ModuleNotFoundError(f"Módulo {module_name} indisponível (falha anterior)", name=module_name)
+        try:
+            # import_module usa sys.modules, os caches dos finders e o bytecode em __pycache__
+            module = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            # O próprio módulo (ou um pacote pai) não existe; não uma dependência dele
+            if e.name and (module_name + ".").startswith(e.name + "."):
+                cls._FAILED_IMPORTS.add(module_name)
+            raise
+        
+        agent_class = cls._MODULE_CACHE[key] = getattr(module, agent_config["class"])
+        return agent_class
+    
+    @_memoize_ttl(60)
+    def create_comprehensive_project_plan(self, requirements: Dict[str, Any]) -> Mapping[str, Any]:
+        """Criar plano abrangente do projeto coordenando todos os agentes (somente leitura)"""
+        self.logger.info("🎯 Criando plano abrangente do projeto SPR...")
+        
+        # Esqueleto estático compartilhado; requirements["overview"] sobrescreve a visão geral
+        overview = requirements.get("overview")
+        if not overview:
+            return _PROJECT_PLAN_TEMPLATE
+        return MappingProxyType({
+            **_PROJECT_PLAN_TEMPLATE,
+            "project_overview": MappingProxyType({**_PROJECT_PLAN_TEMPLATE["project_overview"], **freeze(dict(overview))})
+        })
+    
+    def _start_workflow(self, workflow_name: str, params: Mapping[str, Any]) -> Any:
+        """Chamar o handler do workflow (resultado ou coroutine); erro se não registrado"""
+        handler = self._workflows.get(workflow_name)
+        if handler is None:
             return {"error": f"Workflow {workflow_name} não encontrado"}
+        
+        self.logger.info("🔄 Executando workflow: %s", workflow_name)
+        return handler(**params)
     
-    def _execute_market_analysis_workflow(self) -> Dict[str, Any]:
-        """Workflow: Análise completa de mercado"""
-        self.logger.info("📊 Executando análise completa de mercado...")
+    async def execute_coordinated_workflow_async(self, workflow_name: str, **params: Any) -> Mapping[str, Any]:
+        """Executar workflow coordenado no event loop corrente (params repassados ao workflow)"""
+        result = self._start_workflow(workflow_name, params)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+    
+    def execute_coordinated_workflow(self, workflow_name: str, **params: Any) -> Mapping[str, Any]:
+        """
+        Executar workflow coordenado entre agentes (params repassados ao workflow)
         
-        # 1. Pesquisa de mercado (Research Agent)
-        research_agent = self.load_agent("web-researcher")
-        market_research = research_agent.research_commodity_markets("soja")
+        Workflows assíncronos rodam em um event loop próprio; de dentro de um event loop
+        (ex.: handler FastAPI) use `await execute_coordinated_workflow_async(...)`.
+        """
+        if inspect.iscoroutinefunction(self._workflows.get(workflow_name)):
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self.execute_coordinated_workflow_async(workflow_name, **params))
+            raise RuntimeError(
+                f"Workflow {workflow_name} chamado de dentro de um event loop; "
+                "use await execute_coordinated_workflow_async(...)"
+            )
+        return self._start_workflow(workflow_name, params)
+    
+    @_memoize_ttl(60)
+    async def _execute_market_analysis_workflow(self, commodity: str = "soja") -> Mapping[str, Any]:
+        """Workflow: Análise completa de mercado (memoizado por commodity)"""
+        self.logger.info("📊 Executando análise completa de mercado...")
         
-        # 2. Análise de negócio (Business Agent) 
-        business_agent = self.load_agent("business-strategist")
-        business_analysis = business_agent.analyze_market_opportunity()
+        # 1-2. Pesquisa de mercado e análise de negócio (independentes: mesma onda)
+        scope = await self._run_graph("complete_market_analysis", commodity=commodity)
+        market_research = scope["market_research"]
+        business_analysis = scope["business_analysis"]
         
         # 3. Consolidar insights
         consolidated_analysis = {
@@ -268,27 +652,23 @@ class AgentOrchestrator:
         
         return consolidated_analysis
     
-    def _execute_design_to_code_workflow(self) -> Dict[str, Any]:
+    async def _execute_design_to_code_workflow(self) -> Dict[str, Any]:
         """Workflow: Do design ao código funcional"""
         self.logger.info("🎨➡️💻 Executando workflow design-to-code...")
         
-        # 1. UX Research e Design System
-        ux_agent = self.load_agent("ui-ux-designer")
-        personas = ux_agent.create_user_personas({"target": "agricultural users"})
-        design_system = ux_agent.define_design_system()
+        # 1. UX Research e Design System -> 2. Frontend -> 3. Database Schema
+        scope = await self._run_graph("ui_design_to_code")
+        design_system = scope["design_system"]
+        ui_requirements = scope["ui_requirements"]
+        db_schema = scope["db_schema"]
         
-        # 2. Frontend Implementation
-        frontend_agent = self.load_agent("frontend-engineer") 
-        ui_requirements = frontend_agent.analyze_ui_requirements({
-            "personas": personas,
-            "design_system": design_system
-        })
-        
-        # 3. Database Schema
-        db_agent = self.load_agent("database-engineer")
-        db_schema = db_agent.analyze_schema_requirements({
-            "ui_requirements": ui_requirements
-        })
+        # Contagens de RLS e índices em uma única passada sobre as tabelas
+        tables = db_schema.tables
+        rls_count = 0
+        idx_count = 0
+        for table in tables:
+            rls_count += 1 if table.get("rls_enabled") else 0
+            idx_count += len(table.get("indexes") or ())
         
         return {
             "design_system": {
@@ -302,9 +682,9 @@ class AgentOrchestrator:
                 "framework": ui_requirements["framework"]
             }, 
             "database_schema": {
-                "tables_designed": len(db_schema.tables),
-                "rls_enabled": sum(1 for t in db_schema.tables if t.get("rls_enabled")),
-                "indexes_planned": sum(len(t.get("indexes", [])) for t in db_schema.tables)
+                "tables_designed": len(tables),
+                "rls_enabled": rls_count,
+                "indexes_planned": idx_count
             },
             "integration_points": [
                 "Design tokens ↔ Tailwind config",
@@ -314,7 +694,8 @@ class AgentOrchestrator:
             ]
         }
     
-    def _execute_data_to_insights_workflow(self) -> Dict[str, Any]:
+    @_memoize_ttl(60)
+    def _execute_data_to_insights_workflow(self) -> Mapping[str, Any]:
         """Workflow: Dados para insights acionáveis"""
         self.logger.info("📊➡️💡 Executando workflow data-to-insights...")
         
@@ -340,39 +721,104 @@ class AgentOrchestrator:
             ]
         }
     
-    def generate_status_dashboard(self) -> Dict[str, Any]:
-        """Gerar dashboard de status dos agentes"""
-        return {
+    async def _run_graph(self, workflow_name: str, **params: Any) -> Dict[str, Any]:
+        """
+        Executar o grafo pré-compilado de um workflow
+        
+        Cada onda roda em paralelo; o resultado de cada AgentCall entra no escopo
+        (inicializado com params) e fica disponível às ondas seguintes via Ref.
+        """
+        waves = self._workflow_graphs[workflow_name]
+        agent_ids = list(dict.fromkeys(call.agent_id for wave in waves for call in wave))
+        agents = dict(zip(agent_ids, await self.preload_agents(agent_ids)))
+        
+        scope = dict(params)
+        for wave in waves:
+            results = await asyncio.gather(*[
+                self.run_blocking(getattr(agents[call.agent_id], call.method),
+                                  *_resolve_refs(call.args, scope))
+                for call in wave
+            ])
+            scope.update(zip((call.name for call in wave), results))
+        return scope
+    
+    async def run_waves(self, waves: List[List[AgentTask]]) -> List[AgentResponse]:
+        """Executar ondas em sequência; tarefas de uma mesma onda rodam em paralelo"""
+        await self.preload_agents(list(dict.fromkeys(task.agent_id for wave in waves for task in wave)))
+        
+        responses = []
+        for wave in waves:
+            self.task_queue = list(wave)
+            responses += await asyncio.gather(*[self._run_task(task) for task in wave])
+        self.task_queue = []
+        return responses
+    
+    async def _run_task(self, task: AgentTask) -> AgentResponse:
+        """Executar uma tarefa (método task_type do agente) e registrar no histórico"""
+        start = time.perf_counter()
+        try:
+            agent = self.load_agent(task.agent_id)
+            if agent is None:
+                raise RuntimeError(f"Agente {task.agent_id} indisponível")
+            method = getattr(agent, task.task_type)
+            result = await asyncio.wait_for(
+                self.run_blocking(method, **task.parameters),
+                timeout=task.timeout
+            )
+            response = AgentResponse(task.agent_id, task.key, True, result,
+                                     time.perf_counter() - start)
+        except Exception as e:
+            response = AgentResponse(task.agent_id, task.key, False, None,
+                                     time.perf_counter() - start, error=str(e) or type(e).__name__)
+            self.logger.error("❌ Tarefa %s falhou: %s", task.key, response.error)
+        
+        self.execution_history.append(response)
+        self._total_completed += 1
+        return response
+    
+    def generate_status_dashboard(self) -> Mapping[str, Any]:
+        """Gerar dashboard de status dos agentes (somente leitura)"""
+        loaded = self.loaded_agents
+        return MappingProxyType({
             "orchestrator_status": "operational",
             "total_agents": len(self.available_agents),
             "loaded_agents": len(self.loaded_agents),
             "active_tasks": len(self.task_queue),
-            "completed_tasks": len(self.execution_history),
+            "completed_tasks": self._total_completed,
             
-            "agent_health": {
-                agent_id: {
-                    "status": config["status"],
-                    "capabilities": len(config["capabilities"]),
-                    "loaded": agent_id in self.loaded_agents
-                }
-                for agent_id, config in self.available_agents.items()
-            },
+            "agent_health": MappingProxyType({
+                agent_id: views[agent_id in loaded]
+                for agent_id, views in self._agent_health_views.items()
+            }),
             
-            "performance_metrics": {
-                "avg_task_time": "2.3s",
-                "success_rate": "96.8%",
-                "error_rate": "3.2%",
-                "uptime": "99.9%"
-            },
+            "performance_metrics": _PERF_METRICS_STUB,
             
-            "resource_usage": {
-                "memory": "245 MB",
-                "cpu": "12%", 
-                "active_connections": 8
-            }
-        }
+            "resource_usage": self._resource_usage()
+        })
+    
+    def _resource_usage(self) -> Mapping[str, Any]:
+        """Uso de memória/CPU do processo (psutil), amostrado no máximo uma vez por segundo"""
+        if self._process is None:
+            return _RESOURCE_USAGE_STUB
+        
+        now = time.monotonic()
+        sampled_at, usage = self._resource_cache
+        if now - sampled_at >= _RESOURCE_SAMPLE_INTERVAL:
+            usage = MappingProxyType({
+                **_RESOURCE_USAGE_STUB,
+                "memory": f"{self._process.memory_info().rss / 2**20:.0f} MB",
+                # interval=None: delta desde a última chamada, sem bloquear
+                "cpu": f"{self._process.cpu_percent(None):.0f}%"
+            })
+            self._resource_cache = (now, usage)
+        return usage
+    
+    def dump_json(self, payload: Optional[Any] = None) -> bytes:
+        """Serializar payload (padrão: dashboard de status) para resposta HTTP/WebSocket"""
+        return to_json(self.generate_status_dashboard() if payload is None else payload)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     orchestrator = AgentOrchestrator()
     
     # Testar carregamento de agentes
@@ -4,13 +4,26 @@
 Especialista em otimização, profiling e estratégias de cache
 """
 
-import json
+import functools
+import itertools
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from types import MappingProxyType
+from typing import Callable, ClassVar, Dict, Iterable, Mapping, Any, Sequence, Tuple
 from dataclasses import dataclass
 
-@dataclass
+import numpy as np
+
+from ai_agents._common import dumps_bytes, dumps_pretty, freeze
+
+try:
+    from redis.exceptions import ConnectionError as RedisConnectionError
+except ImportError:
+    RedisConnectionError = ConnectionError
+
+_logger = logging.getLogger("SPR.performance-engineer")
+
+@dataclass(slots=True, frozen=True, eq=False)
 class PerformanceMetric:
     """Métrica de performance"""
     name: str
@@ -18,6 +31,431 @@ class PerformanceMetric:
     target_value: float
     unit: str
     status: str  # good, warning, critical
+    category: str = ""  # "<seção>.<grupo>", ex.: "frontend_metrics.core_web_vitals"
+
+@dataclass(frozen=True)
+class CacheKeys:
+    """
+    Construtores das chaves de cache de api_cache.cache_keys (argumentos posicionais)
+    
+    Cada um é o str.format de um template já parseado: CacheKeys.commodity_price("SOJA", "2024-01-15")
+    -> "commodity:SOJA:date:2024-01-15". Mudanças de convenção de nomes são feitas só aqui.
+    """
+    commodity_price: ClassVar[Callable[[str, str], str]] = staticmethod("commodity:{}:date:{}".format)
+    predictions: ClassVar[Callable[[str, str, str], str]] = staticmethod("predictions:{}:{}:{}".format)
+    user_profile: ClassVar[Callable[[str], str]] = staticmethod("user:{}:profile".format)
+
+# Métricas atuais vs. alvo; category = "<seção>.<grupo>" do relatório aninhado
+_PERFORMANCE_METRICS: Tuple[PerformanceMetric, ...] = (
+    PerformanceMetric("lcp", 2.8, 2.5, "seconds", "warning", "frontend_metrics.core_web_vitals"),
+    PerformanceMetric("fid", 85, 100, "milliseconds", "good", "frontend_metrics.core_web_vitals"),
+    PerformanceMetric("cls", 0.08, 0.1, "score", "good", "frontend_metrics.core_web_vitals"),
+    PerformanceMetric("main_bundle_size", 280, 250, "KB", "warning", "frontend_metrics.bundle_analysis"),
+    PerformanceMetric("vendor_bundle_size", 420, 400, "KB", "warning", "frontend_metrics.bundle_analysis"),
+    PerformanceMetric("total_js_size", 700, 650, "KB", "warning", "frontend_metrics.bundle_analysis"),
+    PerformanceMetric("css_size", 45, 50, "KB", "good", "frontend_metrics.bundle_analysis"),
+    PerformanceMetric("dashboard", 1.8, 1.5, "seconds", "warning", "frontend_metrics.page_load_times"),
+    PerformanceMetric("commodities", 1.2, 1.0, "seconds", "warning", "frontend_metrics.page_load_times"),
+    PerformanceMetric("predictions", 2.1, 2.0, "seconds", "warning", "frontend_metrics.page_load_times"),
+
+    PerformanceMetric("get_commodities", 120, 100, "ms", "warning", "backend_metrics.api_response_times"),
+    PerformanceMetric("get_predictions", 350, 300, "ms", "warning", "backend_metrics.api_response_times"),
+    PerformanceMetric("get_price_history", 180, 150, "ms", "warning", "backend_metrics.api_response_times"),
+    PerformanceMetric("auth_endpoints", 45, 50, "ms", "good", "backend_metrics.api_response_times"),
+    PerformanceMetric("avg_query_time", 25, 20, "ms", "warning", "backend_metrics.database_performance"),
+    PerformanceMetric("slow_queries_count", 12, 5, "count", "critical", "backend_metrics.database_performance"),
+    PerformanceMetric("connection_pool_usage", 65, 80, "percent", "good", "backend_metrics.database_performance"),
+    PerformanceMetric("cache_hit_ratio", 94, 95, "percent", "warning", "backend_metrics.database_performance"),
+    PerformanceMetric("requests_per_second", 145, 200, "rps", "good", "backend_metrics.throughput"),
+    PerformanceMetric("concurrent_users", 85, 100, "users", "good", "backend_metrics.throughput"),
+
+    PerformanceMetric("cpu_usage", 68, 70, "percent", "good", "infrastructure_metrics.server_resources"),
+    PerformanceMetric("memory_usage", 72, 80, "percent", "good", "infrastructure_metrics.server_resources"),
+    PerformanceMetric("disk_usage", 45, 70, "percent", "good", "infrastructure_metrics.server_resources"),
+    PerformanceMetric("bandwidth_utilization", 35, 70, "percent", "good", "infrastructure_metrics.network"),
+    PerformanceMetric("latency_p95", 180, 200, "ms", "good", "infrastructure_metrics.network"),
+)
+
+# Código uint8 do status em _METRICS['status']
+_STATUS_CODES: Mapping[str, int] = MappingProxyType({"good": 0, "warning": 1, "critical": 2})
+
+_METRIC_DT = np.dtype([("current", "<f4"), ("target", "<f4"), ("status", "u1")])
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    arr.flags.writeable = False
+    return arr
+
+# Valores de _PERFORMANCE_METRICS em um array contíguo (mesma ordem), para comparações vetorizadas
+_METRICS: np.ndarray = _readonly(np.array(
+    [(m.current_value, m.target_value, _STATUS_CODES[m.status]) for m in _PERFORMANCE_METRICS],
+    dtype=_METRIC_DT,
+))
+
+# True onde o valor atual está acima do alvo (índices alinhados a _PERFORMANCE_METRICS)
+_STATUS_MASK: np.ndarray = _readonly(_METRICS["current"] > _METRICS["target"])
+
+def as_nested_dict(metrics: Sequence[PerformanceMetric]) -> Dict[str, Any]:
+    """Montar o formato aninhado seção -> grupo -> métrica -> {current, target, unit, status}"""
+    nested: Dict[str, Any] = {}
+    for metric in metrics:
+        section, group = metric.category.split(".", 1)
+        nested.setdefault(section, {}).setdefault(group, {})[metric.name] = {
+            "current": metric.current_value,
+            "target": metric.target_value,
+            "unit": metric.unit,
+            "status": metric.status
+        }
+    return nested
+
+# Especificações estáticas - construídas uma única vez no import e compartilhadas (somente leitura)
+_PERFORMANCE_ANALYSIS: Mapping[str, Any] = freeze(as_nested_dict(_PERFORMANCE_METRICS))
+
+_CACHING_STRATEGY: Mapping[str, Any] = freeze({
+    "application_cache": {
+        "technology": "Redis Cluster",
+        "use_cases": [
+            "API response caching",
+            "Session storage", 
+            "Rate limiting counters",
+            "Real-time data buffering"
+        ],
+        "configuration": {
+            "memory_limit": "2GB per node",
+            "eviction_policy": "allkeys-lru",
+            "persistence": "RDB snapshots every 15min"
+        }
+    },
+    
+    "database_cache": {
+        "query_cache": {
+            "technology": "PostgreSQL query cache + Redis",
+            "cache_duration": {
+                "static_data": "24 hours",
+                "price_data": "15 minutes", 
+                "user_data": "5 minutes",
+                "analytics": "1 hour"
+            }
+        },
+        "connection_pooling": {
+            "technology": "PgBouncer",
+            "pool_size": "25 connections per service",
+            "pool_mode": "transaction"
+        }
+    },
+    
+    "api_cache": {
+        "response_caching": {
+            "cache_headers": "Cache-Control, ETag",
+            "cdn_cache": "CloudFlare 4 hours for static",
+            "api_gateway_cache": "Kong 5-60 minutes based on endpoint"
+        },
+        "cache_keys": {
+            "commodity_prices": "commodity:{symbol}:date:{date}",
+            "predictions": "predictions:{symbol}:{horizon}:{date}",
+            "user_data": "user:{user_id}:profile",
+            "key_builders": "PerformanceAgent.cache_keys (CacheKeys)"
+        }
+    },
+    
+    "frontend_cache": {
+        "browser_cache": {
+            "static_assets": "1 year (with versioning)",
+            "api_responses": "5-30 minutes",
+            "images": "6 months"
+        },
+        "service_worker": {
+            "offline_support": "Critical commodity data",
+            "background_sync": "Price updates",
+            "cache_strategies": "Network first for real-time, Cache first for static"
+        }
+    },
+    
+    "invalidation_strategy": {
+        "event_driven": {
+            "price_updates": "Invalidate price-related caches immediately",
+            "user_changes": "Invalidate user-specific caches",
+            "prediction_updates": "Invalidate prediction caches",
+            "invalidation_fn": "ai_agents.performance.performance_agent.invalidate_many"
+        },
+        "time_based": {
+            "daily_cleanup": "Remove expired cache entries", 
+            "weekly_warmup": "Pre-load frequently accessed data"
+        }
+    }
+})
+
+_DATABASE_OPTIMIZATION: Mapping[str, Any] = freeze({
+    "index_optimization": {
+        "existing_indexes": [
+            "CREATE INDEX idx_price_data_commodity_date ON price_data (commodity_id, date DESC)",
+            "CREATE INDEX idx_predictions_commodity_target ON predictions (commodity_id, target_date)",
+            "CREATE INDEX idx_users_email ON users (email)",
+            "CREATE INDEX idx_whatsapp_sessions_phone ON whatsapp_sessions (phone_number)"
+        ],
+        "recommended_indexes": [
+            "CREATE INDEX idx_price_data_source_date ON price_data (source, date DESC)",
+            "CREATE INDEX idx_predictions_confidence ON predictions (confidence_score DESC)",
+            "CREATE PARTIAL INDEX idx_active_sessions ON whatsapp_sessions (created_at) WHERE is_active = true"
+        ]
+    },
+    
+    "query_optimization": {
+        "slow_query_fixes": [
+            {
+                "query": "SELECT * FROM price_data WHERE date > ?",
+                "issue": "Full table scan",
+                "fix": "Add date index + limit results + specific columns"
+            },
+            {
+                "query": "Complex JOIN with predictions and commodities",
+                "issue": "Nested loop join",
+                "fix": "Rewrite with EXISTS subquery + better index"
+            }
+        ],
+        "materialized_views": [
+            "CREATE MATERIALIZED VIEW latest_commodity_prices AS ...",
+            "CREATE MATERIALIZED VIEW daily_prediction_summary AS ...",
+            "CREATE MATERIALIZED VIEW user_activity_stats AS ..."
+        ]
+    },
+    
+    "connection_optimization": {
+        "pooling": "PgBouncer with transaction-level pooling",
+        "prepared_statements": "Use for frequently executed queries",
+        "batch_operations": "Batch inserts for price data updates"
+    }
+})
+
+_LOAD_TESTING_PLAN: Mapping[str, Any] = freeze({
+    "testing_tools": {
+        "primary": "k6 + Grafana dashboards",
+        "secondary": "Artillery.io for complex scenarios",
+        "monitoring": "Prometheus + Grafana during tests"
+    },
+    
+    "test_scenarios": {
+        "baseline_load": {
+            "users": 50,
+            "duration": "30 minutes",
+            "ramp_up": "5 minutes",
+            "target_rps": "100 requests/second",
+            "success_criteria": {
+                "response_time_p95": "< 500ms",
+                "error_rate": "< 1%"
+            }
+        },
+        "peak_load": {
+            "users": 200,
+            "duration": "15 minutes", 
+            "ramp_up": "10 minutes",
+            "target_rps": "400 requests/second",
+            "success_criteria": {
+                "response_time_p95": "< 1000ms",
+                "error_rate": "< 3%"
+            }
+        },
+        "stress_test": {
+            "users": "Increase until failure",
+            "duration": "Until bottleneck identified",
+            "purpose": "Find breaking point",
+            "metrics": "Identify resource constraints"
+        },
+        "spike_test": {
+            "users": "50 -> 500 -> 50",
+            "duration": "20 minutes",
+            "purpose": "Test auto-scaling",
+            "success_criteria": "Graceful handling of spikes"
+        }
+    },
+    
+    "test_endpoints": [
+        "GET /api/commodities (most frequent)",
+        "GET /api/predictions/{commodity} (CPU intensive)",
+        "POST /api/auth/login (database writes)",
+        "GET /api/price-data/{commodity} (large datasets)",
+        "WebSocket connections (real-time updates)"
+    ],
+    
+    "monitoring_during_tests": [
+        "Application response times",
+        "Database query performance",
+        "Cache hit ratios",
+        "Server resource utilization",
+        "Error rates and types"
+    ]
+})
+
+_CDN_OPTIMIZATION: Mapping[str, Any] = freeze({
+    "cdn_provider": "Cloudflare (recommended)",
+    
+    "static_asset_optimization": {
+        "javascript": {
+            "compression": "Brotli + Gzip",
+            "minification": "Terser with tree shaking",
+            "code_splitting": "Route-based + component-based",
+            "cache_duration": "1 year with versioning"
+        },
+        "css": {
+            "compression": "Brotli + Gzip",
+            "purging": "Remove unused CSS (PurgeCSS)",
+            "critical_css": "Inline above-the-fold styles",
+            "cache_duration": "1 year with versioning"
+        },
+        "images": {
+            "format_optimization": "WebP with JPEG fallback", 
+            "responsive_images": "Multiple sizes generated",
+            "lazy_loading": "Intersection Observer API",
+            "cache_duration": "6 months"
+        }
+    },
+    
+    "api_optimization": {
+        "geographic_distribution": "Edge servers in São Paulo, Rio, Brasília",
+        "api_caching": "5-60 minutes based on data volatility",
+        "compression": "Gzip for API responses",
+        "http2_push": "Push critical resources"
+    },
+    
+    "security_performance": {
+        "ddos_protection": "Cloudflare DDoS protection",
+        "rate_limiting": "Per-IP rate limiting at edge",
+        "bot_protection": "Challenge suspicious traffic",
+        "ssl_optimization": "TLS 1.3 + OCSP stapling"
+    }
+})
+
+_MONITORING_ALERTS: Mapping[str, Any] = freeze({
+    "performance_alerts": [
+        {
+            "metric": "API response time p95",
+            "threshold": "> 1000ms for 5 minutes", 
+            "severity": "warning",
+            "action": "Slack notification to dev team"
+        },
+        {
+            "metric": "Database slow queries",
+            "threshold": "> 15 queries/minute > 1s execution",
+            "severity": "critical",
+            "action": "PagerDuty alert + auto-scale DB"
+        },
+        {
+            "metric": "Cache hit ratio",
+            "threshold": "< 90% for 10 minutes",
+            "severity": "warning",
+            "action": "Email to performance team"
+        },
+        {
+            "metric": "Frontend Core Web Vitals",
+            "threshold": "LCP > 4s or CLS > 0.25",
+            "severity": "warning", 
+            "action": "Daily digest report"
+        }
+    ],
+    
+    "resource_alerts": [
+        {
+            "metric": "CPU usage",
+            "threshold": "> 80% for 10 minutes",
+            "action": "Auto-scale + team notification"
+        },
+        {
+            "metric": "Memory usage", 
+            "threshold": "> 85% for 5 minutes",
+            "action": "Auto-scale + investigation"
+        },
+        {
+            "metric": "Disk usage",
+            "threshold": "> 75%",
+            "action": "Cleanup + capacity planning alert"
+        }
+    ]
+})
+
+_OPTIMIZATION_REPORT: Mapping[str, Any] = freeze({
+    "current_performance": {
+        "overall_score": "B+ (83/100)",
+        "strengths": [
+            "Good database design with proper indexes",
+            "Effective caching for static data",
+            "Responsive frontend architecture"
+        ],
+        "weaknesses": [
+            "API response times above target",
+            "Bundle size optimization needed",
+            "Database queries need optimization"
+        ]
+    },
+    
+    "priority_optimizations": [
+        {
+            "priority": 1,
+            "task": "Optimize slow database queries",
+            "impact": "High - 30% API response time reduction",
+            "effort": "Medium - 2-3 days",
+            "implementation": "Add indexes + query rewriting"
+        },
+        {
+            "priority": 2,
+            "task": "Implement advanced caching",
+            "impact": "High - 40% reduction in database load",
+            "effort": "Medium - 3-4 days", 
+            "implementation": "Redis cluster + cache invalidation"
+        },
+        {
+            "priority": 3,
+            "task": "Frontend bundle optimization",
+            "impact": "Medium - 20% faster page loads",
+            "effort": "Low - 1-2 days",
+            "implementation": "Code splitting + tree shaking"
+        }
+    ],
+    
+    "expected_improvements": {
+        "api_response_time": "30-40% improvement",
+        "page_load_time": "20-25% improvement", 
+        "database_load": "40-50% reduction",
+        "user_experience": "Significantly better responsiveness"
+    }
+})
+
+# Chaves por UNLINK em cada round trip do pipeline de invalidação
+_INVALIDATION_BATCH = 500
+
+async def invalidate_many(redis: Any, keys: Iterable[str], chunk: int = _INVALIDATION_BATCH) -> int:
+    """
+    Invalidar muitas chaves de cache (cliente redis.asyncio) com poucos round trips
+    
+    Cada lote de `chunk` chaves vai em um único pipeline sem transação; UNLINK libera a
+    memória em background, sem bloquear o Redis como DEL. Se o pipeline perder a conexão,
+    o lote é refeito chave a chave. Retorna o número de chaves removidas.
+    """
+    removed = 0
+    keys = iter(keys)
+    while batch := tuple(itertools.islice(keys, chunk)):
+        try:
+            pipe = redis.pipeline(transaction=False)
+            pipe.unlink(*batch)
+            removed += sum(await pipe.execute())
+        except (RedisConnectionError, ConnectionError):
+            _logger.warning("⚠️ Pipeline de invalidação falhou; removendo %d chaves uma a uma", len(batch))
+            for key in batch:
+                removed += await redis.unlink(key)
+    return removed
+
+# Buffer de escrita dos relatórios em disco (um único write para relatórios típicos)
+_REPORT_BUFFER_SIZE = 1 << 20
+
+# Especificações em JSON (UTF-8) prontas para respostas de API, serializadas uma vez no import.
+# Chave = nome do método que retorna a especificação.
+_SPEC_JSON: Mapping[str, bytes] = MappingProxyType({
+    "analyze_application_performance": dumps_bytes(_PERFORMANCE_ANALYSIS),
+    "implement_caching_strategy": dumps_bytes(_CACHING_STRATEGY),
+    "optimize_database_queries": dumps_bytes(_DATABASE_OPTIMIZATION),
+    "create_load_testing_plan": dumps_bytes(_LOAD_TESTING_PLAN),
+    "implement_cdn_optimization": dumps_bytes(_CDN_OPTIMIZATION),
+    "create_monitoring_alerts": dumps_bytes(_MONITORING_ALERTS),
+    "generate_optimization_report": dumps_bytes(_OPTIMIZATION_REPORT),
+})
 
 class PerformanceAgent:
     """
@@ -27,410 +465,106 @@ class PerformanceAgent:
     e garantir performance escalável para commodities.
     """
     
+    logger: ClassVar[logging.Logger] = _logger
+    
+    expertise: ClassVar[Tuple[str, ...]] = (
+        "Application Profiling",
+        "Database Optimization", 
+        "Caching Strategies",
+        "Load Testing",
+        "CDN Configuration",
+        "API Performance",
+        "Frontend Optimization",
+        "Infrastructure Scaling"
+    )
+    
+    cache_keys: ClassVar[CacheKeys] = CacheKeys()
+    
+    metrics_array: ClassVar[np.ndarray] = _METRICS
+    status_mask: ClassVar[np.ndarray] = _STATUS_MASK
+    
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or {}
         self.agent_id = "performance-engineer"
         self.agent_name = "Performance Engineer - SPR Optimization"
-        self.expertise = [
-            "Application Profiling",
-            "Database Optimization", 
-            "Caching Strategies",
-            "Load Testing",
-            "CDN Configuration",
-            "API Performance",
-            "Frontend Optimization",
-            "Infrastructure Scaling"
-        ]
         
-        logging.basicConfig(level=logging.INFO)
-        self.logger = logging.getLogger(f"SPR.{self.agent_id}")
-        
-    def analyze_application_performance(self) -> Dict[str, Any]:
+    def analyze_application_performance(self) -> Mapping[str, Any]:
         """Analisar performance da aplicação SPR"""
         self.logger.info("🔍 Analisando performance da aplicação...")
         
-        performance_analysis = {
-            "frontend_metrics": {
-                "core_web_vitals": {
-                    "lcp": {"current": 2.8, "target": 2.5, "unit": "seconds", "status": "warning"},
-                    "fid": {"current": 85, "target": 100, "unit": "milliseconds", "status": "good"},
-                    "cls": {"current": 0.08, "target": 0.1, "unit": "score", "status": "good"}
-                },
-                "bundle_analysis": {
-                    "main_bundle_size": {"current": 280, "target": 250, "unit": "KB", "status": "warning"},
-                    "vendor_bundle_size": {"current": 420, "target": 400, "unit": "KB", "status": "warning"},
-                    "total_js_size": {"current": 700, "target": 650, "unit": "KB", "status": "warning"},
-                    "css_size": {"current": 45, "target": 50, "unit": "KB", "status": "good"}
-                },
-                "page_load_times": {
-                    "dashboard": {"current": 1.8, "target": 1.5, "unit": "seconds", "status": "warning"},
-                    "commodities": {"current": 1.2, "target": 1.0, "unit": "seconds", "status": "warning"},
-                    "predictions": {"current": 2.1, "target": 2.0, "unit": "seconds", "status": "warning"}
-                }
-            },
-            
-            "backend_metrics": {
-                "api_response_times": {
-                    "get_commodities": {"current": 120, "target": 100, "unit": "ms", "status": "warning"},
-                    "get_predictions": {"current": 350, "target": 300, "unit": "ms", "status": "warning"},
-                    "get_price_history": {"current": 180, "target": 150, "unit": "ms", "status": "warning"},
-                    "auth_endpoints": {"current": 45, "target": 50, "unit": "ms", "status": "good"}
-                },
-                "database_performance": {
-                    "avg_query_time": {"current": 25, "target": 20, "unit": "ms", "status": "warning"},
-                    "slow_queries_count": {"current": 12, "target": 5, "unit": "count", "status": "critical"},
-                    "connection_pool_usage": {"current": 65, "target": 80, "unit": "percent", "status": "good"},
-                    "cache_hit_ratio": {"current": 94, "target": 95, "unit": "percent", "status": "warning"}
-                },
-                "throughput": {
-                    "requests_per_second": {"current": 145, "target": 200, "unit": "rps", "status": "good"},
-                    "concurrent_users": {"current": 85, "target": 100, "unit": "users", "status": "good"}
-                }
-            },
-            
-            "infrastructure_metrics": {
-                "server_resources": {
-                    "cpu_usage": {"current": 68, "target": 70, "unit": "percent", "status": "good"},
-                    "memory_usage": {"current": 72, "target": 80, "unit": "percent", "status": "good"},
-                    "disk_usage": {"current": 45, "target": 70, "unit": "percent", "status": "good"}
-                },
-                "network": {
-                    "bandwidth_utilization": {"current": 35, "target": 70, "unit": "percent", "status": "good"},
-                    "latency_p95": {"current": 180, "target": 200, "unit": "ms", "status": "good"}
-                }
-            }
-        }
-        
-        return performance_analysis
+        return _PERFORMANCE_ANALYSIS
+    
+    def get_performance_metrics(self) -> Tuple[PerformanceMetric, ...]:
+        """Métricas de performance como registros (mesmos dados de analyze_application_performance)"""
+        return _PERFORMANCE_METRICS
+    
+    def metrics_above_target(self) -> Tuple[str, ...]:
+        """Nomes das métricas com valor atual acima do alvo (via status_mask)"""
+        return tuple(_PERFORMANCE_METRICS[i].name for i in np.flatnonzero(_STATUS_MASK))
     
-    def implement_caching_strategy(self) -> Dict[str, Any]:
+    def implement_caching_strategy(self) -> Mapping[str, Any]:
         """Implementar estratégia de cache abrangente"""
         self.logger.info("💾 Implementando estratégia de cache...")
         
-        caching_strategy = {
-            "application_cache": {
-                "technology": "Redis Cluster",
-                "use_cases": [
-                    "API response caching",
-                    "Session storage", 
-                    "Rate limiting counters",
-                    "Real-time data buffering"
-                ],
-                "configuration": {
-                    "memory_limit": "2GB per node",
-                    "eviction_policy": "allkeys-lru",
-                    "persistence": "RDB snapshots every 15min"
-                }
-            },
-            
-            "database_cache": {
-                "query_cache": {
-                    "technology": "PostgreSQL query cache + Redis",
-                    "cache_duration": {
-                        "static_data": "24 hours",
-                        "price_data": "15 minutes", 
-                        "user_data": "5 minutes",
-                        "analytics": "1 hour"
-                    }
-                },
-                "connection_pooling": {
-                    "technology": "PgBouncer",
-                    "pool_size": "25 connections per service",
-                    "pool_mode": "transaction"
-                }
-            },
-            
-            "api_cache": {
-                "response_caching": {
-                    "cache_headers": "Cache-Control, ETag",
-                    "cdn_cache": "CloudFlare 4 hours for static",
-                    "api_gateway_cache": "Kong 5-60 minutes based on endpoint"
-                },
-                "cache_keys": {
-                    "commodity_prices": "commodity:{symbol}:date:{date}",
-                    "predictions": "predictions:{symbol}:{horizon}:{date}",
-                    "user_data": "user:{user_id}:profile"
-                }
-            },
-            
-            "frontend_cache": {
-                "browser_cache": {
-                    "static_assets": "1 year (with versioning)",
-                    "api_responses": "5-30 minutes",
-                    "images": "6 months"
-                },
-                "service_worker": {
-                    "offline_support": "Critical commodity data",
-                    "background_sync": "Price updates",
-                    "cache_strategies": "Network first for real-time, Cache first for static"
-                }
-            },
-            
-            "invalidation_strategy": {
-                "event_driven": {
-                    "price_updates": "Invalidate price-related caches immediately",
-                    "user_changes": "Invalidate user-specific caches",
-                    "prediction_updates": "Invalidate prediction caches"
-                },
-                "time_based": {
-                    "daily_cleanup": "Remove expired cache entries", 
-                    "weekly_warmup": "Pre-load frequently accessed data"
-                }
-            }
-        }
-        
-        return caching_strategy
+        return _CACHING_STRATEGY
     
-    def optimize_database_queries(self) -> Dict[str, Any]:
+    def optimize_database_queries(self) -> Mapping[str, Any]:
         """Otimizar queries de banco de dados"""
         self.logger.info("🗄️ Otimizando queries de banco...")
         
-        return {
-            "index_optimization": {
-                "existing_indexes": [
-                    "CREATE INDEX idx_price_data_commodity_date ON price_data (commodity_id, date DESC)",
-                    "CREATE INDEX idx_predictions_commodity_target ON predictions (commodity_id, target_date)",
-                    "CREATE INDEX idx_users_email ON users (email)",
-                    "CREATE INDEX idx_whatsapp_sessions_phone ON whatsapp_sessions (phone_number)"
-                ],
-                "recommended_indexes": [
-                    "CREATE INDEX idx_price_data_source_date ON price_data (source, date DESC)",
-                    "CREATE INDEX idx_predictions_confidence ON predictions (confidence_score DESC)",
-                    "CREATE PARTIAL INDEX idx_active_sessions ON whatsapp_sessions (created_at) WHERE is_active = true"
-                ]
-            },
-            
-            "query_optimization": {
-                "slow_query_fixes": [
-                    {
-                        "query": "SELECT * FROM price_data WHERE date > ?",
-                        "issue": "Full table scan",
-                        "fix": "Add date index + limit results + specific columns"
-                    },
-                    {
-                        "query": "Complex JOIN with predictions and commodities",
-                        "issue": "Nested loop join",
-                        "fix": "Rewrite with EXISTS subquery + better index"
-                    }
-                ],
-                "materialized_views": [
-                    "CREATE MATERIALIZED VIEW latest_commodity_prices AS ...",
-                    "CREATE MATERIALIZED VIEW daily_prediction_summary AS ...",
-                    "CREATE MATERIALIZED VIEW user_activity_stats AS ..."
-                ]
-            },
-            
-            "connection_optimization": {
-                "pooling": "PgBouncer with transaction-level pooling",
-                "prepared_statements": "Use for frequently executed queries",
-                "batch_operations": "Batch inserts for price data updates"
-            }
-        }
+        return _DATABASE_OPTIMIZATION
     
-    def create_load_testing_plan(self) -> Dict[str, Any]:
+    def create_load_testing_plan(self) -> Mapping[str, Any]:
         """Criar plano de teste de carga"""
         self.logger.info("🧪 Criando plano de teste de carga...")
         
-        return {
-            "testing_tools": {
-                "primary": "k6 + Grafana dashboards",
-                "secondary": "Artillery.io for complex scenarios",
-                "monitoring": "Prometheus + Grafana during tests"
-            },
-            
-            "test_scenarios": {
-                "baseline_load": {
-                    "users": 50,
-                    "duration": "30 minutes",
-                    "ramp_up": "5 minutes",
-                    "target_rps": "100 requests/second",
-                    "success_criteria": {
-                        "response_time_p95": "< 500ms",
-                        "error_rate": "< 1%"
-                    }
-                },
-                "peak_load": {
-                    "users": 200,
-                    "duration": "15 minutes", 
-                    "ramp_up": "10 minutes",
-                    "target_rps": "400 requests/second",
-                    "success_criteria": {
-                        "response_time_p95": "< 1000ms",
-                        "error_rate": "< 3%"
-                    }
-                },
-                "stress_test": {
-                    "users": "Increase until failure",
-                    "duration": "Until bottleneck identified",
-                    "purpose": "Find breaking point",
-                    "metrics": "Identify resource constraints"
-                },
-                "spike_test": {
-                    "users": "50 -> 500 -> 50",
-                    "duration": "20 minutes",
-                    "purpose": "Test auto-scaling",
-                    "success_criteria": "Graceful handling of spikes"
-                }
-            },
-            
-            "test_endpoints": [
-                "GET /api/commodities (most frequent)",
-                "GET /api/predictions/{commodity} (CPU intensive)",
-                "POST /api/auth/login (database writes)",
-                "GET /api/price-data/{commodity} (large datasets)",
-                "WebSocket connections (real-time updates)"
-            ],
-            
-            "monitoring_during_tests": [
-                "Application response times",
-                "Database query performance",
-                "Cache hit ratios",
-                "Server resource utilization",
-                "Error rates and types"
-            ]
-        }
+        return _LOAD_TESTING_PLAN
     
-    def implement_cdn_optimization(self) -> Dict[str, Any]:
+    def implement_cdn_optimization(self) -> Mapping[str, Any]:
         """Implementar otimização de CDN"""
-        return {
-            "cdn_provider": "Cloudflare (recommended)",
-            
-            "static_asset_optimization": {
-                "javascript": {
-                    "compression": "Brotli + Gzip",
-                    "minification": "Terser with tree shaking",
-                    "code_splitting": "Route-based + component-based",
-                    "cache_duration": "1 year with versioning"
-                },
-                "css": {
-                    "compression": "Brotli + Gzip",
-                    "purging": "Remove unused CSS (PurgeCSS)",
-                    "critical_css": "Inline above-the-fold styles",
-                    "cache_duration": "1 year with versioning"
-                },
-                "images": {
-                    "format_optimization": "WebP with JPEG fallback", 
-                    "responsive_images": "Multiple sizes generated",
-                    "lazy_loading": "Intersection Observer API",
-                    "cache_duration": "6 months"
-                }
-            },
-            
-            "api_optimization": {
-                "geographic_distribution": "Edge servers in São Paulo, Rio, Brasília",
-                "api_caching": "5-60 minutes based on data volatility",
-                "compression": "Gzip for API responses",
-                "http2_push": "Push critical resources"
-            },
-            
-            "security_performance": {
-                "ddos_protection": "Cloudflare DDoS protection",
-                "rate_limiting": "Per-IP rate limiting at edge",
-                "bot_protection": "Challenge suspicious traffic",
-                "ssl_optimization": "TLS 1.3 + OCSP stapling"
-            }
-        }
+        return _CDN_OPTIMIZATION
     
-    def create_monitoring_alerts(self) -> Dict[str, Any]:
+    def create_monitoring_alerts(self) -> Mapping[str, Any]:
         """Criar alertas de monitoramento"""
-        return {
-            "performance_alerts": [
-                {
-                    "metric": "API response time p95",
-                    "threshold": "> 1000ms for 5 minutes", 
-                    "severity": "warning",
-                    "action": "Slack notification to dev team"
-                },
-                {
-                    "metric": "Database slow queries",
-                    "threshold": "> 15 queries/minute > 1s execution",
-                    "severity": "critical",
-                    "action": "PagerDuty alert + auto-scale DB"
-                },
-                {
-                    "metric": "Cache hit ratio",
-                    "threshold": "< 90% for 10 minutes",
-                    "severity": "warning",
-                    "action": "Email to performance team"
-                },
-                {
-                    "metric": "Frontend Core Web Vitals",
-                    "threshold": "LCP > 4s or CLS > 0.25",
-                    "severity": "warning", 
-                    "action": "Daily digest report"
-                }
-            ],
-            
-            "resource_alerts": [
-                {
-                    "metric": "CPU usage",
-                    "threshold": "> 80% for 10 minutes",
-                    "action": "Auto-scale + team notification"
-                },
-                {
-                    "metric": "Memory usage", 
-                    "threshold": "> 85% for 5 minutes",
-                    "action": "Auto-scale + investigation"
-                },
-                {
-                    "metric": "Disk usage",
-                    "threshold": "> 75%",
-                    "action": "Cleanup + capacity planning alert"
-                }
-            ]
-        }
+        return _MONITORING_ALERTS
     
-    def generate_optimization_report(self) -> Dict[str, Any]:
+    def generate_optimization_report(self) -> Mapping[str, Any]:
         """Gerar relatório de otimização"""
-        return {
-            "current_performance": {
-                "overall_score": "B+ (83/100)",
-                "strengths": [
-                    "Good database design with proper indexes",
-                    "Effective caching for static data",
-                    "Responsive frontend architecture"
-                ],
-                "weaknesses": [
-                    "API response times above target",
-                    "Bundle size optimization needed",
-                    "Database queries need optimization"
-                ]
-            },
-            
-            "priority_optimizations": [
-                {
-                    "priority": 1,
-                    "task": "Optimize slow database queries",
-                    "impact": "High - 30% API response time reduction",
-                    "effort": "Medium - 2-3 days",
-                    "implementation": "Add indexes + query rewriting"
-                },
-                {
-                    "priority": 2,
-                    "task": "Implement advanced caching",
-                    "impact": "High - 40% reduction in database load",
-                    "effort": "Medium - 3-4 days", 
-                    "implementation": "Redis cluster + cache invalidation"
-                },
-                {
-                    "priority": 3,
-                    "task": "Frontend bundle optimization",
-                    "impact": "Medium - 20% faster page loads",
-                    "effort": "Low - 1-2 days",
-                    "implementation": "Code splitting + tree shaking"
-                }
-            ],
-            
-            "expected_improvements": {
-                "api_response_time": "30-40% improvement",
-                "page_load_time": "20-25% improvement", 
-                "database_load": "40-50% reduction",
-                "user_experience": "Significantly better responsiveness"
-            }
-        }
+        return _OPTIMIZATION_REPORT
+    
+    def get_spec_bytes(self, name: str, with_timestamp: bool = False) -> bytes:
+        """
+        JSON pré-serializado de uma especificação (name = método que a retorna)
+        
+        with_timestamp acrescenta {"timestamp": ...} sem reserializar o corpo estático.
+        """
+        blob = _SPEC_JSON[name]
+        if not with_timestamp:
+            return blob
+        return b"".join((blob[:-1], b',"timestamp":"', datetime.now().isoformat().encode(), b'"}'))
+    
+    def analyze_application_performance_json(self) -> bytes:
+        """JSON pré-serializado da análise de performance"""
+        return _SPEC_JSON["analyze_application_performance"]
+    
+    def dump_report(self, path: str) -> None:
+        """Gravar o relatório de otimização como JSON indentado (UTF-8) em path"""
+        with open(path, "wb", buffering=_REPORT_BUFFER_SIZE) as f:
+            f.write(dumps_pretty(self.generate_optimization_report()))
+
+@functools.lru_cache(maxsize=32)
+def get_performance_agent(config_items: Tuple[Tuple[str, Any], ...] = ()) -> PerformanceAgent:
+    """
+    Instância compartilhada do agente por configuração
+    
+    config_items é a projeção hashable da config, ex.: tuple(sorted(config.items())).
+    O agente não guarda estado mutável, então chamadores podem reutilizar a mesma instância.
+    """
+    return PerformanceAgent(dict(config_items))
 
 if __name__ == "__main__":
-    agent = PerformanceAgent()
+    logging.basicConfig(level=logging.INFO)
+    agent = get_performance_agent()
     
     # Testar funcionalidades
     performance_analysis = agent.analyze_application_performance()
@@ -0,0 +1,28 @@
+"""Configuração dos testes dos agentes SPR"""
+
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+
+import pytest
+
+# Raiz do projeto no sys.path para importar o pacote ai_agents
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+
+def _mutable_nodes(obj, path="spec"):
+    """Caminhos de dicts/lists (mutáveis) dentro de uma especificação"""
+    if isinstance(obj, (dict, list)):
+        yield path
+    if isinstance(obj, Mapping):
+        for key, value in obj.items():
+            yield from _mutable_nodes(value, f"{path}[{key!r}]")
+    elif isinstance(obj, (list, tuple)):
+        for i, value in enumerate(obj):
+            yield from _mutable_nodes(value, f"{path}[{i}]")
+
+
+@pytest.fixture
+def mutable_nodes():
+    """Listar os caminhos mutáveis de uma especificação (vazio = somente leitura)"""
+    return lambda spec: list(_mutable_nodes(spec))
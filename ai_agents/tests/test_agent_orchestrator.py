@@ -0,0 +1,298 @@
+"""Testes do AgentOrchestrator (agentes reais substituídos por stubs em memória)"""
+
+import asyncio
+import importlib
+import sys
+import threading
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ai_agents.orchestrator.agent_orchestrator import (
+    _MEMO_MAXSIZE, AgentCall, AgentOrchestrator, AgentTask, CircularDependencyError, Ref,
+    _compile_workflow, plan_execution_waves,
+)
+
+
+class StubResearcher:
+    def research_commodity_markets(self, commodity):
+        return types.SimpleNamespace(key_findings=[f"{commodity} em alta"], confidence_level=0.9, sources=[1, 2])
+
+
+class StubStrategist:
+    def analyze_market_opportunity(self):
+        return {
+            "market_size": {"tam": "R$ 1"},
+            "target_segments": [1, 2],
+            "competitive_landscape": {"competitive_advantage": "whatsapp"},
+        }
+
+
+def _inject(orchestrator, agents):
+    for agent_id, agent in agents.items():
+        orchestrator.loaded_agents[agent_id] = agent
+        orchestrator._touch_hot_agent(agent_id, agent)
+
+
+@pytest.fixture
+def orchestrator():
+    orchestrator = AgentOrchestrator()
+    _inject(orchestrator, {"web-researcher": StubResearcher(), "business-strategist": StubStrategist()})
+    return orchestrator
+
+
+def test_sync_workflow_outside_event_loop(orchestrator):
+    result = orchestrator.execute_coordinated_workflow("complete_market_analysis", commodity="milho")
+    
+    assert result["market_research"]["key_findings"] == ("milho em alta",)
+    assert result["business_opportunity"]["target_segments"] == 2
+
+
+def test_async_workflow_inside_event_loop(orchestrator):
+    async def handler():
+        return await orchestrator.execute_coordinated_workflow_async("complete_market_analysis")
+    
+    result = asyncio.run(handler())
+    assert result["market_research"]["key_findings"] == ("soja em alta",)
+
+
+def test_sync_wrapper_inside_event_loop_raises_without_starting_workflow(orchestrator):
+    async def handler():
+        orchestrator.execute_coordinated_workflow("complete_market_analysis")
+    
+    with pytest.raises(RuntimeError, match="execute_coordinated_workflow_async"):
+        asyncio.run(handler())
+
+
+def test_unknown_workflow(orchestrator):
+    expected = {"error": "Workflow nope não encontrado"}
+    assert orchestrator.execute_coordinated_workflow("nope") == expected
+    assert asyncio.run(orchestrator.execute_coordinated_workflow_async("nope")) == expected
+
+
+@pytest.mark.parametrize("dependencies, expected", [
+    (None, ()),
+    (["a.x", "b.y"], ("a.x", "b.y")),
+    (("a.x",), ("a.x",)),
+])
+def test_agent_task_dependencies_are_stored_as_tuple(dependencies, expected):
+    task = AgentTask("web-researcher", "research_commodity_markets", {}, dependencies=dependencies)
+    assert task.dependencies == expected
+
+
+def _task(key, *dependencies):
+    agent_id, task_type = key.split(".")
+    return AgentTask(agent_id, task_type, {"label": key}, dependencies=list(dependencies))
+
+
+def test_plan_execution_waves_groups_independent_tasks():
+    tasks = [
+        _task("db.schema"),
+        _task("ui.design"),
+        _task("front.pages", "ui.design"),
+        _task("front.api", "db.schema", "ui.design"),
+        _task("qa.e2e", "front.pages", "front.api"),
+    ]
+    
+    waves = plan_execution_waves(tasks)
+    assert [[task.key for task in wave] for wave in waves] == [
+        ["db.schema", "ui.design"],
+        ["front.pages", "front.api"],
+        ["qa.e2e"],
+    ]
+
+
+def test_plan_execution_waves_rejects_cycles():
+    tasks = [_task("a.x", "c.z"), _task("b.y", "a.x"), _task("c.z", "b.y"), _task("d.w")]
+    
+    with pytest.raises(CircularDependencyError, match=r"\['a.x', 'b.y', 'c.z'\]"):
+        plan_execution_waves(tasks)
+
+
+def test_plan_execution_waves_rejects_unknown_and_duplicate_tasks():
+    with pytest.raises(ValueError, match="não foi informado"):
+        plan_execution_waves([_task("a.x", "nope.y")])
+    with pytest.raises(ValueError, match="duplicado"):
+        plan_execution_waves([_task("a.x"), _task("a.x")])
+
+
+class RecordingAgent:
+    def __init__(self, log):
+        self.log = log
+    
+    def __getattr__(self, task_type):
+        def run(label):
+            self.log.append(label)
+            return label
+        return run
+
+
+def test_run_waves_finishes_each_wave_before_the_next(orchestrator):
+    log = []
+    _inject(orchestrator, {agent_id: RecordingAgent(log) for agent_id in ("db", "ui", "front", "qa")})
+    waves = plan_execution_waves([
+        _task("qa.e2e", "front.pages"),
+        _task("front.pages", "db.schema", "ui.design"),
+        _task("db.schema"),
+        _task("ui.design"),
+    ])
+    
+    responses = asyncio.run(orchestrator.run_waves(waves))
+    assert sorted(log[:2]) == ["db.schema", "ui.design"]
+    assert log[2:] == ["front.pages", "qa.e2e"]
+    assert all(response.success for response in responses)
+    assert orchestrator.task_queue == []
+
+
+class StubDesigner:
+    def __init__(self):
+        self.calls = []
+    
+    def create_user_personas(self, criteria):
+        self.calls.append(("personas", criteria))
+        return ["produtor"]
+    
+    def define_design_system(self):
+        self.calls.append(("design_system",))
+        return {"colors": {"primary": "#0a0"}}
+
+
+class StubFrontend:
+    def analyze_ui_requirements(self, design_inputs):
+        self.received = design_inputs
+        return {"pages": ["dashboard"]}
+
+
+class StubDatabase:
+    def analyze_schema_requirements(self, requirements):
+        self.received = requirements
+        return "schema"
+
+
+def test_run_graph_resolves_refs_from_previous_waves(orchestrator):
+    designer, frontend, database = StubDesigner(), StubFrontend(), StubDatabase()
+    _inject(orchestrator, {
+        "ui-ux-designer": designer, "frontend-engineer": frontend, "database-engineer": database,
+    })
+    
+    scope = asyncio.run(orchestrator._run_graph("ui_design_to_code"))
+    assert sorted(designer.calls) == [("design_system",), ("personas", {"target": "agricultural users"})]
+    assert frontend.received == {"personas": ["produtor"], "design_system": {"colors": {"primary": "#0a0"}}}
+    assert database.received == {"ui_requirements": {"pages": ["dashboard"]}}
+    assert scope["db_schema"] == "schema"
+
+
+def test_run_graph_resolves_workflow_params(orchestrator):
+    scope = asyncio.run(orchestrator._run_graph("complete_market_analysis", commodity="café"))
+    
+    assert scope["commodity"] == "café"
+    assert scope["market_research"].key_findings == ["café em alta"]
+
+
+def test_compile_workflow_rejects_cyclic_refs():
+    calls = [
+        AgentCall("a", "x", "m", (Ref("b"),)),
+        AgentCall("b", "x", "m", ({"input": Ref("a")},)),
+        AgentCall("c", "x", "m", (Ref("commodity"),)),
+    ]
+    
+    with pytest.raises(CircularDependencyError, match="etapas do workflow"):
+        _compile_workflow(calls)
+
+
+def test_memoized_workflow_result_is_shared_read_only(orchestrator):
+    first = orchestrator.execute_coordinated_workflow("complete_market_analysis")
+    
+    with pytest.raises(TypeError):
+        first["recommendations"] = []
+    with pytest.raises(AttributeError):
+        first["recommendations"].append("alterado")
+    assert orchestrator.execute_coordinated_workflow("complete_market_analysis") is first
+
+
+def test_memoized_project_plan_freezes_caller_overview(orchestrator):
+    overview = {"name": "SPR", "phases": ["mvp"]}
+    plan = orchestrator.create_comprehensive_project_plan({"overview": overview})
+    
+    overview["phases"].append("alterado")
+    assert plan["project_overview"]["phases"] == ("mvp",)
+
+
+def test_memo_eviction_is_thread_safe(orchestrator):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        plans = list(pool.map(
+            lambda i: orchestrator.create_comprehensive_project_plan({"overview": {"name": f"p{i}"}}),
+            range(400)
+        ))
+    
+    assert [plan["project_overview"]["name"] for plan in plans] == [f"p{i}" for i in range(400)]
+    assert len(orchestrator._memo) <= _MEMO_MAXSIZE
+
+
+def test_orchestrators_share_one_io_pool():
+    async def run_on_many():
+        orchestrators = [AgentOrchestrator() for _ in range(20)]
+        return await asyncio.gather(*[
+            o.run_blocking(lambda: threading.current_thread().name) for o in orchestrators
+        ])
+    
+    names = asyncio.run(run_on_many())
+    assert all(name.startswith("agent-io") for name in names)
+    assert sum(t.name.startswith("agent-io") for t in threading.enumerate()) <= 16
+
+
+@pytest.fixture
+def agent_package(tmp_path, monkeypatch):
+    """Diretório temporário no sys.path para módulos de agente gerados no teste"""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield tmp_path
+    for name in ("spr_tmp_agent", "spr_tmp_agent_dep"):
+        sys.modules.pop(name, None)
+        AgentOrchestrator._FAILED_IMPORTS.discard(name)
+        for key in [k for k in AgentOrchestrator._MODULE_CACHE if k[0] == name]:
+            del AgentOrchestrator._MODULE_CACHE[key]
+
+
+def _register_tmp_agent(orchestrator):
+    orchestrator.register_agent("tmp-agent", {
+        "module": "spr_tmp_agent", "class": "TmpAgent", "status": "active", "capabilities": [],
+    })
+
+
+def test_missing_dependency_is_not_cached_as_failed_module(agent_package):
+    (agent_package / "spr_tmp_agent.py").write_text(
+        "import spr_tmp_agent_dep\n"
+        "class TmpAgent:\n"
+        "    def __init__(self, config):\n"
+        "        self.dep = spr_tmp_agent_dep.VALUE\n"
+    )
+    orchestrator = AgentOrchestrator()
+    _register_tmp_agent(orchestrator)
+    
+    assert orchestrator.load_agent("tmp-agent") is None
+    assert "spr_tmp_agent" not in AgentOrchestrator._FAILED_IMPORTS
+    
+    # Dependência instalada depois: o agente passa a carregar no mesmo processo
+    (agent_package / "spr_tmp_agent_dep.py").write_text("VALUE = 42\n")
+    importlib.invalidate_caches()
+    assert orchestrator.load_agent("tmp-agent").dep == 42
+
+
+def test_missing_module_is_cached_until_registered_again(agent_package):
+    orchestrator = AgentOrchestrator()
+    _register_tmp_agent(orchestrator)
+    
+    assert orchestrator.load_agent("tmp-agent") is None
+    assert "spr_tmp_agent" in AgentOrchestrator._FAILED_IMPORTS
+    
+    (agent_package / "spr_tmp_agent.py").write_text(
+        "class TmpAgent:\n"
+        "    def __init__(self, config):\n"
+        "        self.config = config\n"
+    )
+    importlib.invalidate_caches()
+    assert orchestrator.load_agent("tmp-agent") is None
+    
+    _register_tmp_agent(orchestrator)
+    assert orchestrator.load_agent("tmp-agent") is not None
@@ -0,0 +1,79 @@
+"""Testes do AIDataAgent"""
+
+import dataclasses
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from ai_agents.ai_data.ai_data_agent import FACTOR_KEYS, AIDataAgent
+
+
+@pytest.mark.parametrize("method, args", [
+    ("design_ml_pipeline", ("soja",)),
+    ("create_analytics_dashboard", ()),
+    ("setup_mlops_pipeline", ()),
+])
+def test_specs_are_deeply_read_only(method, args, mutable_nodes):
+    assert mutable_nodes(getattr(AIDataAgent(), method)(*args)) == []
+
+
+def test_available_models_are_read_only(mutable_nodes):
+    assert mutable_nodes(AIDataAgent.available_models) == []
+    with pytest.raises(TypeError):
+        AIDataAgent().available_models["trend_classifier"]["accuracy"] = 1.0
+
+
+def test_cached_prediction_models_are_read_only():
+    agent = AIDataAgent()
+    models = agent.create_prediction_models()
+    
+    assert agent.create_prediction_models() is models
+    with pytest.raises(TypeError):
+        models["soja_predictor"] = None
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        models["soja_predictor"].accuracy = 1.0
+    assert models["soja_predictor"].features == ("weather_index", "usd_brl", "supply_demand_ratio")
+
+
+def test_long_horizon_predictions_follow_the_model():
+    batch = AIDataAgent().generate_prediction_batch("soja", horizon_days=3000, seed=7)
+    d = batch.data
+    
+    assert len(batch) == 3000
+    assert np.all(d["ci_lower"] < d["predicted_price"])
+    assert np.all(d["predicted_price"] < d["ci_upper"])
+    assert d["confidence_score"][0] == pytest.approx(0.9)
+    assert np.all(d["confidence_score"][30:] == pytest.approx(0.6))
+    np.testing.assert_allclose(d["ci_upper"] - d["ci_lower"], d["predicted_price"] * (1 - d["confidence_score"]))
+
+
+def test_prediction_batch_round_trips_to_dataclasses():
+    batch = AIDataAgent().generate_prediction_batch("milho", horizon_days=45, seed=11)
+    results = batch.to_dataclasses()
+    d = batch.data
+    
+    assert len(results) == len(batch) == 45
+    for row, result in zip(d, results):
+        assert result.commodity == "milho"
+        assert result.prediction_date == batch.prediction_date
+        assert result.predicted_price == row["predicted_price"]
+        assert result.confidence_score == row["confidence_score"]
+        assert result.confidence_interval == (row["ci_lower"], row["ci_upper"])
+        assert result.target_date == row["target_date"].astype(datetime)
+        assert list(result.factors) == list(FACTOR_KEYS)
+        assert list(result.factors.values()) == pytest.approx(row["factors"].tolist())
+    assert (results[1].target_date - results[0].target_date).days == 1
+
+
+def test_evaluate_model_performance_matches_for_batch_and_dataclasses():
+    agent = AIDataAgent()
+    batch = agent.generate_prediction_batch("boi", horizon_days=60, seed=3)
+    
+    from_batch = agent.evaluate_model_performance(batch)
+    from_list = agent.evaluate_model_performance(batch.to_dataclasses())
+    
+    assert from_batch["risk_assessment"] == from_list["risk_assessment"]
+    assert from_batch["model_metrics"] == pytest.approx(from_list["model_metrics"])
+    assert from_batch["price_analysis"] == pytest.approx(from_list["price_analysis"])
+    assert agent.evaluate_model_performance([]) == {"error": "No predictions to evaluate"}
@@ -0,0 +1,22 @@
+"""Testes do BusinessAgent"""
+
+import pytest
+
+from ai_agents.business.business_agent import BusinessAgent
+
+
+@pytest.mark.parametrize("method", [
+    "analyze_market_opportunity",
+    "design_business_model",
+    "create_go_to_market_strategy",
+    "define_success_metrics",
+    "identify_partnerships",
+])
+def test_specs_are_deeply_read_only(method, mutable_nodes):
+    assert mutable_nodes(getattr(BusinessAgent(), method)()) == []
+
+
+def test_partnership_changes_do_not_leak_between_agents():
+    with pytest.raises(TypeError):
+        BusinessAgent().identify_partnerships()[0]["investment"] = "free"
+    assert BusinessAgent().identify_partnerships()[0]["investment"] == "revenue sharing 20%"
@@ -0,0 +1,28 @@
+"""Testes dos utilitários compartilhados"""
+
+import json
+from types import MappingProxyType
+
+import numpy as np
+import pytest
+
+from ai_agents._common import dumps_bytes, dumps_pretty, freeze, mutable_copy
+
+
+def test_freeze_is_recursive():
+    spec = freeze({"a": {"b": [1, {"c": [2]}]}})
+    
+    assert isinstance(spec, MappingProxyType)
+    assert spec["a"]["b"] == (1, MappingProxyType({"c": (2,)}))
+    with pytest.raises(TypeError):
+        spec["a"]["x"] = 1
+    assert mutable_copy(spec) == {"a": {"b": [1, {"c": [2]}]}}
+
+
+def test_dumps_handles_frozen_specs_and_numpy():
+    payload = freeze({"metrics": [{"value": np.float32(1.5)}], "count": np.int64(3)})
+    expected = {"metrics": [{"value": 1.5}], "count": 3}
+    
+    assert json.loads(dumps_bytes(payload)) == expected
+    assert json.loads(dumps_pretty(payload)) == expected
+    assert b"\n  " in dumps_pretty(payload)
@@ -0,0 +1,117 @@
+"""Testes do DatabaseAgent"""
+
+import re
+import sqlite3
+
+import pytest
+
+from ai_agents.database.database_agent import _SPR_FUNCTIONS, _SPR_VIEWS, DatabaseAgent
+
+
+@pytest.fixture(scope="module")
+def migration():
+    agent = DatabaseAgent()
+    return agent.generate_migration_script(agent.analyze_schema_requirements({}))
+
+
+def test_schema_hashes_by_identity():
+    agent = DatabaseAgent()
+    schema = agent.analyze_schema_requirements({})
+    other = agent.analyze_schema_requirements({"name": "outro"})
+    
+    assert {schema: 1}[schema] == 1
+    assert schema == schema and schema != other
+
+
+@pytest.mark.parametrize("view", [v for v in _SPR_VIEWS if v.get("mlog_sources")], ids=lambda v: v["name"])
+def test_mlog_sources_cover_every_table_read_by_the_view(view):
+    read_tables = set(re.findall(r"\b(?:FROM|JOIN)\s+(\w+)", view["definition"]))
+    assert read_tables <= set(view["mlog_sources"])
+
+
+def test_mlog_watermark_uses_transaction_ids(migration):
+    for table in ("price_data", "predictions", "commodities"):
+        body = re.search(rf"CREATE TABLE mlog\$_{table} \((.*?)\n\);", migration, re.S).group(1)
+        assert "change_xid xid8 NOT NULL DEFAULT pg_current_xact_id()" in body
+        assert "DEFAULT now()" not in body
+    assert "v_xmin := pg_snapshot_xmin(pg_current_snapshot());" in migration
+    assert "WHERE change_xid >= v_last" in migration
+
+
+def test_refresh_functions_are_named_for_delta_gating(migration):
+    refresh_sql = DatabaseAgent().refresh_materialized_views()
+    
+    assert "SELECT refresh_latest_prices_if_changed();" in refresh_sql
+    assert "SELECT refresh_prediction_accuracy_if_changed();" in refresh_sql
+    assert "CREATE OR REPLACE FUNCTION refresh_prediction_accuracy_if_changed()" in migration
+    assert "_incremental" not in migration + refresh_sql
+
+
+def test_optimize_queries_applies_first_matching_rule():
+    queries = [
+        "SELECT * FROM price_data ORDER BY date DESC",
+        "select p.price from predictions p join commodities c on c.id = p.commodity_id",
+        "SELECT * FROM commodities",
+        "SELECT price FROM price_data WHERE commodity_id = $1 ORDER BY date DESC LIMIT 10",
+    ]
+    
+    assert DatabaseAgent().optimize_queries(queries) == {
+        queries[0]: "Adicionar LIMIT para evitar ordenação completa da tabela",
+        queries[1]: "Adicionar condições WHERE antes dos JOINs",
+        queries[2]: "Especificar apenas as colunas necessárias",
+    }
+
+
+def _price_trend_query():
+    """Corpo (RETURN QUERY) de get_price_trend adaptado ao dialeto do SQLite"""
+    definition = next(f["definition"] for f in _SPR_FUNCTIONS if f["name"] == "get_price_trend")
+    body = definition.split("RETURN QUERY", 1)[1].split("END;", 1)[0].strip().rstrip(";")
+    return (body
+            .replace("CURRENT_DATE - p_days", "date(:today, '-' || :days || ' days')")
+            .replace("p_commodity_id", ":commodity_id"))
+
+
+@pytest.fixture
+def price_db():
+    db = sqlite3.connect(":memory:")
+    db.execute("CREATE TABLE price_data (commodity_id text, date text, price real)")
+    yield db
+    db.close()
+
+
+def _trend(db, commodity_id="soja", days=30, today="2024-03-31"):
+    return db.execute(_price_trend_query(), {"commodity_id": commodity_id, "days": days, "today": today}).fetchall()
+
+
+def test_price_trend_compares_latest_with_oldest_price_in_window(price_db):
+    price_db.executemany("INSERT INTO price_data VALUES (?, ?, ?)", [
+        ("soja", "2024-02-15", 50.0),   # antes da janela: ignorado
+        ("soja", "2024-03-05", 100.0),  # preço mais antigo dentro da janela
+        ("soja", "2024-03-20", 90.0),
+        ("soja", "2024-03-30", 110.0),
+        ("milho", "2024-03-30", 999.0),
+    ])
+    
+    assert _trend(price_db) == [("UP", 10.0, 10.0)]
+
+
+def test_price_trend_down_and_stable(price_db):
+    price_db.executemany("INSERT INTO price_data VALUES (?, ?, ?)", [
+        ("soja", "2024-03-10", 80.0), ("soja", "2024-03-30", 60.0),
+        ("boi", "2024-03-30", 275.0),
+    ])
+    
+    assert _trend(price_db) == [("DOWN", -20.0, -25.0)]
+    assert _trend(price_db, "boi") == [("STABLE", 0.0, 0.0)]
+
+
+def test_price_trend_edge_cases(price_db):
+    price_db.executemany("INSERT INTO price_data VALUES (?, ?, ?)", [
+        ("soja", "2024-01-01", 100.0),
+        ("milho", "2024-03-10", 0.0), ("milho", "2024-03-30", 5.0),
+    ])
+    
+    # Sem preços na janela: nenhuma linha (antes: uma linha de NULLs)
+    assert _trend(price_db) == []
+    # Preço passado zero: variação percentual NULL em vez de divisão por zero
+    assert _trend(price_db, "milho") == [("UP", 5.0, None)]
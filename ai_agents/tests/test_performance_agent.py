@@ -0,0 +1,71 @@
+"""Testes de invalidate_many com um cliente redis.asyncio falso em memória"""
+
+import asyncio
+
+from ai_agents.performance.performance_agent import invalidate_many
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.keys = ()
+
+    def unlink(self, *keys):
+        self.keys = keys
+
+    async def execute(self):
+        self.redis.batches.append(self.keys)
+        if len(self.redis.batches) in self.redis.failing_batches:
+            raise ConnectionError("conexão perdida")
+        return [self.redis._remove(key) for key in self.keys]
+
+
+class FakeRedis:
+    def __init__(self, keys, failing_batches=()):
+        self.store = set(keys)
+        self.failing_batches = set(failing_batches)
+        self.batches = []
+        self.single_unlinks = []
+
+    def _remove(self, key):
+        if key in self.store:
+            self.store.remove(key)
+            return 1
+        return 0
+
+    def pipeline(self, transaction=True):
+        assert transaction is False
+        return FakePipeline(self)
+
+    async def unlink(self, key):
+        self.single_unlinks.append(key)
+        return self._remove(key)
+
+
+def test_invalidate_many_sends_one_pipeline_per_chunk():
+    keys = [f"price:{i}" for i in range(7)]
+    redis = FakeRedis(keys[:6])
+
+    removed = asyncio.run(invalidate_many(redis, iter(keys), chunk=3))
+    assert removed == 6
+    assert redis.batches == [tuple(keys[:3]), tuple(keys[3:6]), (keys[6],)]
+    assert redis.single_unlinks == []
+    assert redis.store == set()
+
+
+def test_invalidate_many_falls_back_to_single_unlinks_for_failed_chunk():
+    keys = [f"price:{i}" for i in range(6)]
+    redis = FakeRedis(keys, failing_batches={2})
+
+    removed = asyncio.run(invalidate_many(redis, keys, chunk=2))
+    assert removed == 6
+    assert len(redis.batches) == 3
+    assert redis.single_unlinks == keys[2:4]
+    assert redis.store == set()
+
+
+def test_invalidate_many_without_keys():
+    redis = FakeRedis([])
+
+    assert asyncio.run(invalidate_many(redis, [])) == 0
+    assert redis.batches == []
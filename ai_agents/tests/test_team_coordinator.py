@@ -0,0 +1,124 @@
+"""Testes do TeamCoordinator"""
+
+import asyncio
+import dataclasses
+
+import pytest
+
+from ai_agents.coordinators.team_coordinator import TeamCoordinator, TeamTask
+
+
+def test_team_task_is_hashable_and_immutable():
+    task = TeamTask("data_team", "DS-009", "Backfill", ["data-engineer"], dependencies=["DS-001"])
+    
+    assert task.assigned_agents == ("data-engineer",)
+    assert task.dependencies == ("DS-001",)
+    assert hash(task) == hash(TeamTask("data_team", "DS-009", "Backfill", ("data-engineer",),
+                                       dependencies=("DS-001",)))
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        task.priority = 1
+
+
+def test_team_task_accepts_none_dependencies():
+    assert TeamTask("data_team", "DS-009", "Backfill", (), dependencies=None).dependencies == ()
+
+
+def test_team_status_is_hashable():
+    for status in TeamCoordinator().monitor_team_performance().values():
+        assert isinstance(status.active_agents, tuple)
+        assert isinstance(status.current_tasks, tuple)
+        hash(status)
+
+
+def test_work_plan_changes_do_not_leak_between_coordinators():
+    plan = TeamCoordinator().create_simultaneous_work_plan()
+    task = plan["frontend_team"][0]
+    
+    plan["frontend_team"].append(dataclasses.replace(task, task_id="FE-999"))
+    with pytest.raises(AttributeError):
+        task.assigned_agents.append("intruder")
+    
+    fresh = TeamCoordinator().create_simultaneous_work_plan()
+    assert [t.task_id for t in fresh["frontend_team"]] == ["FE-001", "FE-002", "FE-003"]
+    assert fresh["frontend_team"][0].assigned_agents == ("frontend-engineer", "ui-ux-designer")
+
+
+def _task(team_id, task_id, priority):
+    return TeamTask(team_id, task_id, task_id, (), priority=priority)
+
+
+def test_team_queue_pops_by_priority_then_fifo():
+    coordinator = TeamCoordinator()
+    for task in (_task("data_team", "low", 5), _task("data_team", "high-1", 1),
+                 _task("data_team", "mid", 3), _task("data_team", "high-2", 1)):
+        coordinator.enqueue_task("data_team", task)
+    
+    assert [t.task_id for t in coordinator.get_queued_tasks("data_team")] == ["high-1", "high-2", "mid", "low"]
+
+
+def test_scheduler_drains_all_teams_in_global_priority_order():
+    coordinator = TeamCoordinator()
+    coordinator.enqueue_task("frontend_team", _task("frontend_team", "FE-low", 4))
+    coordinator.enqueue_task("data_team", _task("data_team", "DS-top", 1))
+    coordinator.enqueue_task("frontend_team", _task("frontend_team", "FE-high", 2))
+    coordinator.enqueue_task("strategy_team", _task("strategy_team", "ST-mid", 3))
+    
+    order = [(team_id, task.task_id) for team_id, task in coordinator._iter_by_priority()]
+    assert order == [
+        ("data_team", "DS-top"),
+        ("frontend_team", "FE-high"),
+        ("strategy_team", "ST-mid"),
+        ("frontend_team", "FE-low"),
+    ]
+    assert coordinator.get_queued_tasks("frontend_team") == []
+
+
+def test_status_counts_track_tasks_through_execution():
+    coordinator = TeamCoordinator()
+    # Mais tarefas que a capacidade inicial do array de status (64)
+    plan = {"data_team": [TeamTask("data_team", f"DS-{i:03}", "t", (), priority=1, estimated_time=1)
+                          for i in range(100)]}
+    
+    assert coordinator.get_task_status("DS-000") is None
+    for task in plan["data_team"]:
+        coordinator.enqueue_task("data_team", task)
+    assert coordinator.status_counts() == {"pending": 100, "in_progress": 0, "completed": 0, "failed": 0}
+    
+    coordinator = TeamCoordinator()
+    results = asyncio.run(coordinator.execute_simultaneous_tasks(plan))
+    counts = coordinator.status_counts()
+    
+    assert counts["pending"] == counts["in_progress"] == 0
+    assert counts["completed"] == len(results["completed_tasks"])
+    assert counts["failed"] == len(results["failed_tasks"])
+    assert counts["completed"] + counts["failed"] == 100
+    for done in results["completed_tasks"]:
+        assert coordinator.get_task_status(done["task_id"]) == "completed"
+
+
+def test_execution_counts_tasks_queued_before_the_call():
+    coordinator = TeamCoordinator()
+    plan = {"data_team": [TeamTask("data_team", f"DS-{i}", "t", (), priority=1, estimated_time=1)
+                          for i in range(3)]}
+    extra = TeamTask("strategy_team", "ST-extra", "t", (), priority=2, estimated_time=1)
+    assert coordinator.enqueue_task("data_team", plan["data_team"][0])
+    assert coordinator.enqueue_task("strategy_team", extra)
+    # Já pendente: não entra duas vezes na fila
+    assert not coordinator.enqueue_task("data_team", plan["data_team"][0])
+    
+    results = asyncio.run(coordinator.execute_simultaneous_tasks(plan))
+    stats = results["execution_stats"]
+    executed = [t["task_id"] for t in results["completed_tasks"] + results["failed_tasks"]]
+    
+    assert sorted(executed) == ["DS-0", "DS-1", "DS-2", "ST-extra"]
+    assert stats["total_tasks"] == 4
+    assert stats["completed_count"] + stats["failed_count"] == 4
+    assert stats["success_rate"] == pytest.approx(stats["completed_count"] / 4 * 100)
+    counts = coordinator.status_counts()
+    assert (counts["completed"], counts["failed"]) == (stats["completed_count"], stats["failed_count"])
+
+
+def test_execution_of_empty_plan():
+    stats = asyncio.run(TeamCoordinator().execute_simultaneous_tasks({}))["execution_stats"]
+    
+    assert (stats["total_tasks"], stats["completed_count"], stats["success_rate"]) == (0, 0, 0)